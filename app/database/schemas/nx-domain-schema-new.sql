@@ -3,6 +3,8 @@ CREATE DATABASE IF NOT EXISTS nx_domain_db CHARACTER SET utf8mb4 COLLATE utf8mb4
 USE nx_domain_db;
 
 -- Drop existing tables if they exist (for migration)
+DROP TABLE IF EXISTS to_summary_refresh_state;
+DROP TABLE IF EXISTS to_summary_materialized;
 DROP VIEW IF EXISTS to_summary_view;
 DROP TABLE IF EXISTS imported_it_data;
 DROP TABLE IF EXISTS version_control;
@@ -74,6 +76,7 @@ CREATE TABLE imported_it_data (
     spec_version VARCHAR(50),
     spec_path VARCHAR(500),
     import_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     
     -- Validation constraints
     CONSTRAINT chk_it_business_unit CHECK (business_unit IS NULL OR business_unit = '' OR business_unit IN ('CN', 'PC')),
@@ -199,6 +202,60 @@ WHERE NOT EXISTS (SELECT 1 FROM imported_it_data it WHERE it.project_name = cr.p
 
 ORDER BY project;
 
+-- Materialized TO Summary - same 33 columns as to_summary_view, refreshed incrementally
+-- by tools/maintenance/refresh_to_summary.py so page loads do not re-run the joins
+CREATE TABLE to_summary_materialized (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    task_index VARCHAR(50),
+    project VARCHAR(100) NOT NULL,
+    spip_ip VARCHAR(100),
+    ip VARCHAR(100),
+    ip_postfix VARCHAR(50),
+    ip_subtype VARCHAR(50),
+    alternative_name VARCHAR(100),
+    line_coverage DECIMAL(5,2),
+    fsm_coverage DECIMAL(5,2),
+    interface_toggle_coverage DECIMAL(5,2),
+    toggle_coverage DECIMAL(5,2),
+    coverage_report_path VARCHAR(500),
+    dv_engineer VARCHAR(100),
+    digital_designer VARCHAR(100),
+    business_unit VARCHAR(10),
+    sanity_svn VARCHAR(500),
+    sanity_svn_ver VARCHAR(100),
+    release_svn VARCHAR(500),
+    release_svn_ver VARCHAR(100),
+    git_path VARCHAR(500),
+    git_version VARCHAR(100),
+    golden_checklist VARCHAR(500),
+    golden_checklist_version VARCHAR(100),
+    to_date DATE,
+    rtl_last_update TIMESTAMP NULL,
+    to_report_creation TIMESTAMP NULL,
+    spip_url VARCHAR(500),
+    wiki_url VARCHAR(500),
+    spec_version VARCHAR(50),
+    spec_path VARCHAR(500),
+    analog_designer VARCHAR(100),
+    inherit_from_ip VARCHAR(100),
+    reuse_ip VARCHAR(100),
+    
+    -- Which source tables contributed to the row, used to detect deleted source rows
+    has_it_data TINYINT(1) NOT NULL DEFAULT 0,
+    has_coverage TINYINT(1) NOT NULL DEFAULT 0,
+    has_version_control TINYINT(1) NOT NULL DEFAULT 0,
+    refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Source watermarks of the last refresh (single row, id = 1)
+CREATE TABLE to_summary_refresh_state (
+    id INT PRIMARY KEY,
+    imported_it_data_watermark TIMESTAMP NULL,
+    coverage_reports_watermark TIMESTAMP NULL,
+    version_control_watermark TIMESTAMP NULL,
+    refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 -- Create indexes for better performance
 CREATE INDEX idx_coverage_project ON coverage_reports(project_name);
 CREATE INDEX idx_version_project ON version_control(project_name);
@@ -206,6 +263,10 @@ CREATE INDEX idx_imported_project ON imported_it_data(project_name);
 CREATE INDEX idx_imported_task_index ON imported_it_data(task_index);
 CREATE INDEX idx_coverage_to_date ON coverage_reports(to_date);
 CREATE INDEX idx_coverage_line_coverage ON coverage_reports(line_coverage);
+CREATE INDEX idx_coverage_updated_at ON coverage_reports(updated_at);
+CREATE INDEX idx_version_updated_at ON version_control(updated_at);
+CREATE INDEX idx_imported_updated_at ON imported_it_data(updated_at);
+CREATE INDEX idx_materialized_project ON to_summary_materialized(project);
 
 -- Sample data insertion with validation
 INSERT INTO coverage_reports (
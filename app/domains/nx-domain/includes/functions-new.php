@@ -247,9 +247,34 @@ function validateUrl($url) {
     return filter_var($url, FILTER_VALIDATE_URL) !== false;
 }
 
+function getTOSummaryRows($db) {
+    // to_summary_materialized is kept up to date by tools/maintenance/refresh_to_summary.py;
+    // fall back to the view until the first refresh has run
+    try {
+        $refreshed = $db->query("SELECT COUNT(*) FROM to_summary_refresh_state")->fetchColumn();
+        if ($refreshed > 0) {
+            return $db->query("
+                SELECT task_index, project, spip_ip, ip, ip_postfix, ip_subtype, alternative_name,
+                       line_coverage, fsm_coverage, interface_toggle_coverage, toggle_coverage, coverage_report_path,
+                       dv_engineer, digital_designer, business_unit,
+                       sanity_svn, sanity_svn_ver, release_svn, release_svn_ver, git_path, git_version,
+                       golden_checklist, golden_checklist_version,
+                       to_date, rtl_last_update, to_report_creation,
+                       spip_url, wiki_url, spec_version, spec_path,
+                       analog_designer, inherit_from_ip, reuse_ip
+                FROM to_summary_materialized
+                ORDER BY project
+            ")->fetchAll();
+        }
+    } catch (PDOException $e) {
+        logError("Materialized TO summary unavailable: " . $e->getMessage());
+    }
+    
+    return $db->query("SELECT * FROM to_summary_view ORDER BY project")->fetchAll();
+}
+
 function generateTOSummaryReport($db, $format = 'json') {
-    $stmt = $db->query("SELECT * FROM to_summary_view ORDER BY project");
-    $data = $stmt->fetchAll();
+    $data = getTOSummaryRows($db);
     
     switch ($format) {
         case 'csv':
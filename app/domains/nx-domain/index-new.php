@@ -54,7 +54,7 @@ $version_control = $db->query("SELECT * FROM version_control ORDER BY project_na
 $imported_data = $db->query("SELECT DISTINCT project_name, import_date FROM imported_it_data ORDER BY project_name")->fetchAll();
 
 // Get complete TO summary data with all 33 fields
-$to_summary = $db->query("SELECT * FROM to_summary_view ORDER BY project")->fetchAll();
+$to_summary = getTOSummaryRows($db);
 ?>
 
 <!DOCTYPE html>
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Backup Verification
+Restores the mysqldump backups written by tools/backup/*.sh (.sql, .sql.gz
+or the .tar.gz archives holding them) into local SQLite files, without a
+MySQL server, and reports the rows restored per table and the import speed.
+A backup fails verification when the dump is truncated, a statement cannot
+be restored, SQLite's integrity check fails or a required table is empty.
+
+The dump is streamed: it is decompressed, split and executed statement by
+statement, so memory use does not depend on the size of the backup.
+"""
+
+import argparse
+import codecs
+import gzip
+import json
+import re
+import shutil
+import sqlite3
+import sys
+import tarfile
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(REPO_ROOT / 'tools' / 'testing'))
+
+from sql_tokenizer import iter_statements, leading_words, rewrite_mysql_to_sqlite
+
+DEFAULT_BATCH_ROWS = 100_000
+# Error samples kept per dump; every failure is still counted
+MAX_ERRORS = 20
+SYSTEM_DATABASES = {"mysql", "sys", "information_schema", "performance_schema"}
+# mysqldump writes this as its last line; a dump without it was cut short
+DUMP_COMPLETED_MARKER = "-- Dump completed"
+EDGE_SIZE = 4096
+
+DATABASE_HEADER_RE = re.compile(r"^--\s*Host:.*\bDatabase:\s*(\S+)", re.MULTILINE)
+USE_RE = re.compile(r"\bUSE\s+`?([^`\s;]+)`?", re.IGNORECASE)
+TABLE_NAME_RE = re.compile(r"(?:INSERT(?:\s+OR\s+IGNORE)?|REPLACE)\s+INTO\s+(?:`([^`]+)`|(\w+))"
+                           r"|CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?(?:`([^`]+)`|(\w+))", re.IGNORECASE)
+
+def print_status(message):
+    print(f"\033[0;32m[INFO]\033[0m {message}")
+
+def print_warning(message):
+    print(f"\033[1;33m[WARNING]\033[0m {message}")
+
+def print_error(message):
+    print(f"\033[0;31m[ERROR]\033[0m {message}")
+
+def print_step(message):
+    print(f"\033[0;34m[STEP]\033[0m {message}")
+
+class DumpReader:
+    """Text stream wrapper that remembers the first and last characters read
+
+    The head holds mysqldump's header (with the database name), the tail its
+    completion line.
+    """
+
+    def __init__(self, stream, size=EDGE_SIZE):
+        self.stream = stream
+        self.size = size
+        self.head = ""
+        self.tail = ""
+
+    def read(self, size=-1):
+        data = self.stream.read(size)
+        if data:
+            if len(self.head) < self.size:
+                self.head = (self.head + data)[:self.size]
+            self.tail = (self.tail + data)[-self.size:]
+        return data
+
+def open_text(binary):
+    # A codecs reader, unlike TextIOWrapper, works on non-seekable tar members. Bytes
+    # that are not UTF-8 (binary columns) survive as surrogates and are restored as blobs.
+    return codecs.getreader('utf-8')(binary, errors='surrogateescape')
+
+def dump_name(path):
+    name = Path(path).name
+    for suffix in (".gz", ".sql"):
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+    return name
+
+def iter_dumps(path):
+    """Yield (name, text stream) for every dump in a .sql, .sql.gz or tar archive"""
+    path = str(path)
+    if path.endswith((".tar", ".tar.gz", ".tgz")):
+        # Streaming mode: members are read in order, the archive is never unpacked to disk
+        with tarfile.open(path, "r|*") as archive:
+            for member in archive:
+                if not member.isfile() or not member.name.endswith((".sql", ".sql.gz")):
+                    continue
+                binary = archive.extractfile(member)
+                if member.name.endswith(".gz"):
+                    binary = gzip.GzipFile(fileobj=binary)
+                yield dump_name(member.name), open_text(binary)
+    elif path.endswith(".gz"):
+        with gzip.open(path, 'rb') as binary:
+            yield dump_name(path), open_text(binary)
+    else:
+        with open(path, 'rb') as binary:
+            yield dump_name(path), open_text(binary)
+
+def regexp(pattern, value):
+    """MySQL's REGEXP (case-insensitive for text), used by restored CHECK constraints"""
+    if pattern is None or value is None:
+        return None
+    return re.search(pattern, str(value), re.IGNORECASE) is not None
+
+def open_database(path):
+    """Fresh SQLite file tuned for a bulk load: WAL, no fsync, one open transaction"""
+    path = Path(path)
+    for stale in (path, Path(f"{path}-wal"), Path(f"{path}-shm")):
+        if stale.exists():
+            stale.unlink()
+    conn = sqlite3.connect(str(path), isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.execute("PRAGMA cache_size=-65536")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.create_function("REGEXP", 2, regexp, deterministic=True)
+    conn.execute("BEGIN")
+    return conn
+
+def close_database(conn, report):
+    """Commit, leave a single self-contained file and record table counts and integrity"""
+    conn.execute("COMMIT")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA journal_mode=DELETE")
+    for table, stats in report["tables"].items():
+        try:
+            stats["rows"] = conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0]
+        except sqlite3.Error:
+            stats["rows"] = None
+    report["integrity"] = conn.execute("PRAGMA quick_check").fetchone()[0]
+    conn.close()
+
+def table_name(sql):
+    m = TABLE_NAME_RE.match(sql)
+    return next((name for name in m.groups() if name), None) if m else None
+
+def import_dump(stream, name, output_dir, batch_rows=DEFAULT_BATCH_ROWS):
+    """Restore one dump into <output_dir>/<database>.sqlite files and return its report
+
+    The database is taken from USE statements (--databases/--all-databases
+    dumps), else from the dump header, else from the dump's file name.
+    System databases are skipped.
+    """
+    reader = DumpReader(stream)
+    report = {"dump": name, "complete": False, "statements": 0, "skipped_statements": 0,
+              "failed_statements": 0, "inserted_rows": 0, "seconds": 0.0, "databases": {}, "errors": []}
+    connections = {}
+    database = None
+    conn = None
+    pending_rows = 0
+    started = time.perf_counter()
+
+    def switch(new_database):
+        if new_database in SYSTEM_DATABASES:
+            return None
+        if new_database not in connections:
+            path = Path(output_dir) / f"{new_database}.sqlite"
+            connections[new_database] = open_database(path)
+            report["databases"][new_database] = {"path": str(path), "integrity": None, "tables": {}}
+        return connections[new_database]
+
+    try:
+        for tokens in iter_statements(reader):
+            report["statements"] += 1
+            words = leading_words(tokens, 1)
+            if words == ["USE"]:
+                database = USE_RE.search(" ".join(text for kind, text in tokens if kind != "comment")).group(1)
+                conn = switch(database)
+                continue
+            if database is None:
+                header = DATABASE_HEADER_RE.search(reader.head)
+                database = header.group(1) if header else name
+                conn = switch(database)
+
+            sql = rewrite_mysql_to_sqlite(tokens) if conn is not None else None
+            if sql is None:
+                report["skipped_statements"] += 1
+                continue
+
+            table = table_name(sql)
+            tables = report["databases"][database]["tables"]
+            stats = tables.setdefault(table, {"rows": 0, "inserted_rows": 0, "seconds": 0.0,
+                                              "failed_statements": 0}) if table else None
+            statement_started = time.perf_counter()
+            try:
+                cursor = conn.execute(sql)
+            except (sqlite3.Error, ValueError, UnicodeEncodeError) as e:
+                report["failed_statements"] += 1
+                if stats is not None:
+                    stats["failed_statements"] += 1
+                if len(report["errors"]) < MAX_ERRORS:
+                    report["errors"].append({"database": database, "table": table, "error": str(e),
+                                             "statement": sql[:200]})
+                continue
+
+            if stats is not None and words in (["INSERT"], ["REPLACE"]):
+                rows = max(cursor.rowcount, 0)
+                stats["inserted_rows"] += rows
+                stats["seconds"] += time.perf_counter() - statement_started
+                report["inserted_rows"] += rows
+                pending_rows += rows
+                if pending_rows >= batch_rows:
+                    conn.execute("COMMIT")
+                    conn.execute("BEGIN")
+                    pending_rows = 0
+        report["complete"] = DUMP_COMPLETED_MARKER in reader.tail
+    except (EOFError, OSError, tarfile.TarError) as e:
+        # Truncated or corrupt compressed stream
+        report["errors"].append({"database": database, "table": None, "error": f"{type(e).__name__}: {e}",
+                                 "statement": None})
+    finally:
+        for restored, connection in connections.items():
+            close_database(connection, report["databases"][restored])
+
+    report["seconds"] = round(time.perf_counter() - started, 3)
+    report["rows_per_second"] = round(report["inserted_rows"] / report["seconds"], 1) if report["seconds"] > 0 else None
+    for database_report in report["databases"].values():
+        for stats in database_report["tables"].values():
+            stats["seconds"] = round(stats["seconds"], 3)
+            stats["rows_per_second"] = (round(stats["inserted_rows"] / stats["seconds"], 1)
+                                        if stats["seconds"] > 0 else None)
+    return report
+
+def verify_backup(path, output_dir, batch_rows=DEFAULT_BATCH_ROWS):
+    """Restore every dump in a backup file; returns the list of dump reports"""
+    reports = []
+    try:
+        for name, stream in iter_dumps(path):
+            print_step(f"Restoring {name}")
+            reports.append(import_dump(stream, name, output_dir, batch_rows))
+    except (EOFError, OSError, tarfile.TarError) as e:
+        reports.append({"dump": Path(path).name, "complete": False, "statements": 0, "skipped_statements": 0,
+                        "failed_statements": 0, "inserted_rows": 0, "seconds": 0.0, "rows_per_second": None,
+                        "databases": {}, "errors": [{"database": None, "table": None,
+                                                     "error": f"{type(e).__name__}: {e}", "statement": None}]})
+    return reports
+
+def find_problems(reports, required_tables=(), allow_incomplete=False):
+    """Reasons the backup fails verification (empty when it passes)"""
+    problems = []
+    if not reports:
+        problems.append("no .sql dumps found")
+    for report in reports:
+        dump = report["dump"]
+        if not report["complete"] and not allow_incomplete:
+            problems.append(f"{dump}: no '{DUMP_COMPLETED_MARKER}' line, the dump is truncated")
+        if report["failed_statements"]:
+            problems.append(f"{dump}: {report['failed_statements']} statements could not be restored")
+        for error in report["errors"]:
+            if error["statement"] is None:
+                problems.append(f"{dump}: {error['error']}")
+        for database, database_report in report["databases"].items():
+            if database_report["integrity"] not in (None, "ok"):
+                problems.append(f"{dump}: {database} integrity check: {database_report['integrity']}")
+
+    restored = {}
+    for report in reports:
+        for database_report in report["databases"].values():
+            for table, stats in database_report["tables"].items():
+                restored[table] = restored.get(table, 0) + (stats["rows"] or 0)
+    for table in required_tables:
+        if table not in restored:
+            problems.append(f"required table {table} is missing")
+        elif not restored[table]:
+            problems.append(f"required table {table} is empty")
+    return problems
+
+def print_report(reports):
+    print()
+    print(f"{'database':<24} {'table':<32} {'rows':>12} {'seconds':>9} {'rows/s':>12}")
+    for report in reports:
+        for database, database_report in report["databases"].items():
+            for table, stats in sorted(database_report["tables"].items()):
+                rows = "-" if stats["rows"] is None else f"{stats['rows']:,}"
+                rate = f"{stats['rows_per_second']:,.0f}" if stats["rows_per_second"] else "-"
+                print(f"{database:<24} {table:<32} {rows:>12} {stats['seconds']:>9.3f} {rate:>12}")
+    print()
+    for report in reports:
+        rate = f"{report['rows_per_second']:,.0f} rows/s" if report["rows_per_second"] else "-"
+        print_status(f"{report['dump']}: {report['inserted_rows']:,} rows from {report['statements']:,} statements "
+                     f"in {report['seconds']:.2f}s ({rate}), {report['skipped_statements']:,} skipped, "
+                     f"{report['failed_statements']:,} failed")
+        for error in report["errors"]:
+            location = ".".join(part for part in (error["database"], error["table"]) if part)
+            print_warning(f"{location or report['dump']}: {error['error']}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verify mysqldump backups by restoring them into SQLite")
+    parser.add_argument("backups", nargs="+", help="Backup files: .sql, .sql.gz, .tar.gz or .tgz")
+    parser.add_argument("--output-dir", help="Keep the restored <database>.sqlite files here "
+                                             "(default: a temporary directory that is removed afterwards)")
+    parser.add_argument("--batch-rows", type=int, default=DEFAULT_BATCH_ROWS,
+                        help=f"Rows per transaction (default: {DEFAULT_BATCH_ROWS:,})")
+    parser.add_argument("--require-table", action="append", default=[], metavar="TABLE",
+                        help="Fail unless this table was restored with at least one row (repeatable)")
+    parser.add_argument("--allow-incomplete", action="store_true",
+                        help="Do not require mysqldump's 'Dump completed' line (hand-written SQL files)")
+    parser.add_argument("--json", help="Write the report as JSON to this path")
+    args = parser.parse_args(argv)
+    if args.batch_rows < 1:
+        parser.error("--batch-rows must be at least 1")
+
+    print("=" * 60)
+    print("Backup Verification")
+    print("=" * 60)
+
+    output_dir = Path(args.output_dir) if args.output_dir else Path(tempfile.mkdtemp(prefix="verify_backup_"))
+    output_dir.mkdir(parents=True, exist_ok=True)
+    try:
+        reports = []
+        for path in args.backups:
+            reports.extend(verify_backup(path, output_dir, args.batch_rows))
+    finally:
+        if not args.output_dir:
+            shutil.rmtree(output_dir, ignore_errors=True)
+
+    print_report(reports)
+    problems = find_problems(reports, args.require_table, args.allow_incomplete)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({"backups": args.backups, "dumps": reports, "problems": problems}, f, indent=2)
+            f.write("\n")
+        print_status(f"Report written to {args.json}")
+
+    for problem in problems:
+        print_error(f"❌ {problem}")
+    if problems:
+        sys.exit(1)
+    print_status("✅ Backup restored and verified")
+
+if __name__ == "__main__":
+    main()
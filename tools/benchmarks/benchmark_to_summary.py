@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+TO Summary Generator Benchmark
+Times the four stages of generate_to_summary_from_domains.py separately
+(load_domain_data, create_to_summary_records, save_to_summary_json,
+generate_field_mapping_csv; the JSON stage writes no mapping rows, so the
+CSV is only timed once) on synthetic data of several sizes, appends
+the results to a JSON history file and fails when a stage regressed
+against a stored baseline.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager, redirect_stdout
+from pathlib import Path
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+REPO_ROOT = BENCHMARKS_DIR.parent.parent
+sys.path.insert(0, str(REPO_ROOT / "tools" / "data-generation"))
+
+import generate_to_summary_from_domains as generator
+from generate_synthetic_domain_data import generate_synthetic_domain_data
+
+DEFAULT_SCALES = (1_000, 10_000, 100_000)
+DEFAULT_DATA_DIR = BENCHMARKS_DIR / ".data"
+DEFAULT_HISTORY_PATH = BENCHMARKS_DIR / "benchmark_history.json"
+DEFAULT_BASELINE_PATH = BENCHMARKS_DIR / "baseline.json"
+DEFAULT_THRESHOLD = 0.20
+# Stages faster than this in the baseline are too noisy to judge
+DEFAULT_MIN_SECONDS = 0.1
+
+STAGES = ("load_domain_data", "create_to_summary_records", "save_to_summary_json", "generate_field_mapping_csv")
+
+def print_status(message):
+    print(f"\033[0;32m[INFO]\033[0m {message}")
+
+def print_warning(message):
+    print(f"\033[1;33m[WARNING]\033[0m {message}")
+
+def print_error(message):
+    print(f"\033[0;31m[ERROR]\033[0m {message}")
+
+def print_step(message):
+    print(f"\033[0;34m[STEP]\033[0m {message}")
+
+@contextmanager
+def working_directory(path):
+    """The generator reads and writes paths relative to the current directory"""
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+def prepare_dataset(data_dir, projects, seed):
+    """Synthetic domain data for one scale, generated once and reused by later runs"""
+    dataset_dir = Path(data_dir) / f"projects-{projects}-seed-{seed}"
+    source_paths = (generator.IT_ALLPROJECT_PATH, generator.IT_DV_TASKS_PATH, generator.IT_SUPPLEMENTAL_PATH,
+                    generator.NX_EXAMPLES_PATH, generator.NX_SUPPLEMENTAL_PATH)
+    if not all((dataset_dir / path).exists() for path in source_paths):
+        print_status(f"Generating synthetic data for {projects:,} projects in {dataset_dir}")
+        generate_synthetic_domain_data(dataset_dir, projects=projects, seed=seed)
+    return dataset_dir
+
+def measure(stage, repeat, trace_memory=True):
+    """Run stage() repeat times for the median wall time, then once under tracemalloc for peak memory
+
+    Returns (last result, median seconds, peak bytes or None). The traced run
+    is several times slower and is not timed. The stages' own status lines
+    are discarded so printing does not dominate small runs.
+    """
+    timings = []
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = stage()
+            timings.append(time.perf_counter() - started)
+
+        peak = None
+        if trace_memory:
+            tracemalloc.start()
+            try:
+                stage()
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+    return result, statistics.median(timings), peak
+
+def stage_result(seconds, peak, records):
+    return {
+        "seconds": round(seconds, 4),
+        "peak_mb": None if peak is None else round(peak / (1024 * 1024), 2),
+        "records": records,
+        "records_per_second": round(records / seconds, 1) if seconds > 0 else None,
+    }
+
+def benchmark_scale(dataset_dir, repeat, trace_memory=True):
+    """Time each pipeline stage on one dataset, feeding each stage the previous stage's output"""
+    results = {}
+    with working_directory(dataset_dir):
+        domain_data, seconds, peak = measure(generator.load_domain_data, repeat, trace_memory)
+        results["load_domain_data"] = stage_result(seconds, peak, sum(len(data) for data in domain_data))
+
+        (records, mapping_rows), seconds, peak = measure(
+            lambda: generator.create_to_summary_records(*domain_data), repeat, trace_memory)
+        results["create_to_summary_records"] = stage_result(seconds, peak, len(records))
+
+        # No mapping rows here: the CSV is timed in its own stage, so this one only writes its header
+        _, seconds, peak = measure(
+            lambda: generator.write_to_summary_output(((record, ()) for record in records), "json"), repeat, trace_memory)
+        results["save_to_summary_json"] = stage_result(seconds, peak, len(records))
+
+        _, seconds, peak = measure(
+            lambda: generator.generate_field_mapping_csv(mapping_rows), repeat, trace_memory)
+        results["generate_field_mapping_csv"] = stage_result(seconds, peak, len(records))
+    return results
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_benchmarks(scales, seed=0, repeat=3, data_dir=DEFAULT_DATA_DIR, trace_memory=True):
+    """Benchmark every scale and return one history entry"""
+    run = {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "machine": platform.node(),
+        "seed": seed,
+        "repeat": repeat,
+        "scales": {},
+    }
+    for projects in scales:
+        dataset_dir = prepare_dataset(data_dir, projects, seed)
+        print_step(f"Benchmarking {projects:,} projects")
+        run["scales"][str(projects)] = benchmark_scale(dataset_dir, repeat, trace_memory)
+    return run
+
+def compare_to_baseline(run, baseline, threshold=DEFAULT_THRESHOLD, min_seconds=DEFAULT_MIN_SECONDS):
+    """Stages slower, or with a higher memory peak, than the baseline by more than threshold
+
+    Returns [{'scale', 'stage', 'metric', 'baseline', 'current', 'change'}, ...].
+    Scales or stages missing from either run are not compared.
+    """
+    regressions = []
+    for scale, stages in run["scales"].items():
+        for stage, current in stages.items():
+            reference = baseline.get("scales", {}).get(scale, {}).get(stage)
+            if reference is None:
+                continue
+            for metric in ("seconds", "peak_mb"):
+                if metric == "seconds" and reference[metric] < min_seconds:
+                    continue
+                if current[metric] is None or not reference.get(metric):
+                    continue
+                change = current[metric] / reference[metric] - 1
+                if change > threshold:
+                    regressions.append({"scale": scale, "stage": stage, "metric": metric,
+                                        "baseline": reference[metric], "current": current[metric],
+                                        "change": round(change, 3)})
+    return regressions
+
+def load_json(path, default):
+    path = Path(path)
+    if not path.exists():
+        return default
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def write_json(path, data):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+
+def append_history(path, run):
+    """Add a run to the history file (a JSON list, oldest first)"""
+    history = load_json(path, [])
+    history.append(run)
+    write_json(path, history)
+    return len(history)
+
+def print_report(run, baseline):
+    print()
+    print(f"{'projects':>10}  {'stage':<28} {'seconds':>9} {'peak MB':>9} {'records/s':>12} {'vs baseline':>12}")
+    for scale, stages in run["scales"].items():
+        for stage, result in stages.items():
+            reference = (baseline or {}).get("scales", {}).get(scale, {}).get(stage)
+            change = f"{result['seconds'] / reference['seconds'] - 1:+.1%}" if reference and reference["seconds"] > 0 else "-"
+            rate = f"{result['records_per_second']:,.0f}" if result["records_per_second"] else "-"
+            peak = "-" if result["peak_mb"] is None else f"{result['peak_mb']:.1f}"
+            print(f"{int(scale):>10,}  {stage:<28} {result['seconds']:>9.3f} {peak:>9} {rate:>12} {change:>12}")
+    print()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the TO summary generator stages")
+    parser.add_argument("--scales", type=int, nargs="+", default=list(DEFAULT_SCALES),
+                        help="Project counts to benchmark (default: 1000 10000 100000)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic data (default: 0)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per stage; the median is reported (default: 3)")
+    parser.add_argument("--data-dir", default=str(DEFAULT_DATA_DIR),
+                        help="Where generated datasets are kept between runs")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="Skip the tracemalloc pass (much faster at large scales; no memory figures or checks)")
+    parser.add_argument("--history", default=str(DEFAULT_HISTORY_PATH), help="JSON history file to append to")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE_PATH), help="Baseline run to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the new baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown or memory growth per stage (default: 0.20 = 20%%)")
+    parser.add_argument("--min-seconds", type=float, default=DEFAULT_MIN_SECONDS,
+                        help="Skip the time check for stages faster than this in the baseline (default: 0.1)")
+    args = parser.parse_args(argv)
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    print("=" * 60)
+    print("TO Summary Generator Benchmark")
+    print("=" * 60)
+
+    baseline = load_json(args.baseline, None)
+    run = run_benchmarks(args.scales, args.seed, args.repeat, args.data_dir, not args.no_memory)
+    print_report(run, baseline)
+    print_status(f"Run {append_history(args.history, run)} appended to {args.history}")
+
+    if args.save_baseline:
+        write_json(args.baseline, run)
+        print_status(f"Baseline saved to {args.baseline}")
+        return
+
+    if baseline is None:
+        print_warning(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+        return
+
+    regressions = compare_to_baseline(run, baseline, args.threshold, args.min_seconds)
+    for item in regressions:
+        print_error(f"❌ {item['stage']} at {int(item['scale']):,} projects: {item['metric']} "
+                    f"{item['baseline']} -> {item['current']} ({item['change']:+.1%})")
+    if regressions:
+        sys.exit(1)
+    print_status(f"✅ No stage regressed by more than {args.threshold:.0%} against baseline {baseline.get('commit')}")
+
+if __name__ == "__main__":
+    main()
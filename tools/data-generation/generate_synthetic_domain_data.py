@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""產生任意規模的IT Domain / NX Domain合成資料，供效能測試使用
+輸出的目錄結構與檔案格式和 IT_Domain/ideal_IT_Domain_Data、NX_Domain/ideal_NX_Domain_Data 相同，
+在輸出目錄中即可直接以 load_domain_data() 載入。
+"""
+
+import argparse
+import datetime
+import json
+import math
+import random
+from pathlib import Path
+
+from generate_to_summary_from_domains import (
+    IT_ALLPROJECT_PATH,
+    IT_ALLPROJECT_SHEET,
+    IT_DV_TASKS_PATH,
+    IT_DV_TASKS_SHEET,
+    IT_SUPPLEMENTAL_PATH,
+    NX_EXAMPLES_PATH,
+    NX_SUPPLEMENTAL_PATH,
+    OUTPUT_BUFFER_SIZE,
+)
+
+DEFAULT_OUTPUT_DIR = Path("synthetic_domain_data")
+DEFAULT_PROJECTS = 1000
+
+NAN = float("nan")
+TIMESTAMP_START = datetime.datetime(2020, 1, 1)
+TIMESTAMP_RANGE_SECONDS = 6 * 365 * 24 * 3600
+
+IP_NAMES = ("AFE", "pcie", "usb", "sata", "ddr", "hdmi", "mipi", "wifi", "bt", "eth", "audio", "adc")
+IP_POSTFIXES = ("", "2x1", "support 4/4", "gen2", "lite")
+SPIP_IP_NAMES = ("WiFi RF Transceiver", "USB_PCIE_SATA", "DDR_PHY", "HDMI_TX", "MIPI_DPHY", "Audio_Codec")
+DV_ENGINEERS = ("LI", "CH", "WU", "LIN", "CHEN", "HUANG", "TSAI", "YANG")
+DIGITAL_DESIGNERS = ("Jimmy", "Ramon", "Alice", "Kevin", "Grace", "Leo")
+ANALOG_DESIGNERS = ("Peter", "Tom", "Iris", "Sam")
+ASSIGNEES = ("李昱廷", "鄒芷涵", "王小明", "陳美玲", "林志豪")
+TASK_STATUSES = ("done", "in progress", "not started", "hold")
+SUBTASK_STATUSES = ("SANITY DONE", "In Progress Design", "DONE", "Open")
+
+# 各來源項目的存在旗標
+IN_DV_TASKS = 1
+IN_ALLPROJECT = 2
+NX_MISSING = 4
+
+def project_name(i):
+    """第 i 個項目的名稱，如 RL1000、RLE1001"""
+    return f"{'RLE' if i % 3 == 0 else 'RL'}{1000 + i}"
+
+def maybe(rng, value, rate, hole=NAN):
+    """以 rate 的機率以空值 (NaN 或 "NaT") 取代 value"""
+    return hole if rng.random() < rate else value
+
+def timestamp(rng):
+    """2020至2025年間的隨機時間，格式與Excel轉出的JSON相同"""
+    moment = TIMESTAMP_START + datetime.timedelta(seconds=rng.randrange(TIMESTAMP_RANGE_SECONDS))
+    return moment.strftime("%Y-%m-%d %H:%M:%S")
+
+def build_project_flags(projects, seed, nx_missing_rate):
+    """決定每個項目出現在哪些來源，每個項目一個位元組
+
+    約9成項目在dv_tasks；不在dv_tasks的項目一定在allproject (只有allproject資料的項目)。
+    """
+
+    rng = random.Random(f"{seed}:flags")
+    flags = bytearray(projects)
+    for i in range(projects):
+        flag = 0
+        if rng.random() < 0.9:
+            flag |= IN_DV_TASKS
+            if rng.random() < 0.85:
+                flag |= IN_ALLPROJECT
+        else:
+            flag |= IN_ALLPROJECT
+        if rng.random() < nx_missing_rate:
+            flag |= NX_MISSING
+        flags[i] = flag
+    return flags
+
+def project_order(flags):
+    """load_domain_data 之後的項目順序：dv_tasks 的項目在前，只在 allproject 的項目在後"""
+    yield from (i for i, flag in enumerate(flags) if flag & IN_DV_TASKS)
+    yield from (i for i, flag in enumerate(flags) if not flag & IN_DV_TASKS)
+
+def dv_task_data(rng, index, i, nan_rate):
+    """單筆dv_tasks資料，欄位與 dv_tasks.xlsx 相同"""
+    ip = rng.choice(IP_NAMES)
+    name = project_name(i)
+    progress = rng.choice((0.0, 0.25, 0.5, 0.75, 1.0))
+    return {
+        "Index": index,
+        "IP": maybe(rng, ip, nan_rate),
+        "Project": name,
+        "IP Postfix": maybe(rng, rng.choice(IP_POSTFIXES), nan_rate),
+        "Alternative Name": maybe(rng, f"{ip}_{name}_alt", 0.8),
+        "DV": maybe(rng, rng.choice(DV_ENGINEERS), nan_rate),
+        "DD": maybe(rng, rng.choice(DIGITAL_DESIGNERS), nan_rate),
+        "BU": maybe(rng, rng.choice(("CN", "PC")), nan_rate),
+        "High Priority": maybe(rng, "Y", 0.9),
+        "DV Release flow done": rng.choice((0.0, 1.0)),
+        "RTL Ready": maybe(rng, timestamp(rng), 0.7, "NaT"),
+        "TO Date": maybe(rng, timestamp(rng)[:10] + " 00:00:00", nan_rate, "NaT"),
+        "Days to TO": float(rng.randrange(-400, 400)),
+        "Status": rng.choice(TASK_STATUSES),
+        "Progress": progress,
+        "Assign Date": maybe(rng, timestamp(rng), 0.5, "NaT"),
+        "Finish Date": maybe(rng, timestamp(rng), nan_rate, "NaT"),
+        "Man-Month Per Project": 1.0,
+        "Load Multiplier": 1.0,
+        "Load Portion": 0.25,
+        "Man-Month Per Person": 0.25,
+        "Load Total": 0.25,
+        "Load Completed": 0.25 * progress,
+        "Load Remain": 0.25 * (1 - progress),
+        "Next 3 Month Remain Loading": 0.0,
+        "Man-Month Total": 0.25,
+        "Man-Month Completed": 0.25 * progress,
+        "SPIP": maybe(rng, f"https://jira.rd.realtek.com/browse/{name}-{rng.randrange(1, 200)}", nan_rate),
+        "WIKI": maybe(rng, f"https://wiki.realtek.com/display/RDCDIGITAL/{ip}_{name}", nan_rate),
+        "Comment": NAN,
+        "sanity SVN": NAN,
+        "release SVN": NAN,
+        "Testcase Total": NAN,
+        "Testcase Passed": NAN,
+        "Testcase Wreal": NAN,
+        "Line": NAN,
+        "FSM": NAN,
+        "Interface Toggle": NAN,
+        "Toggle": NAN,
+        "Coverage Report Path": NAN,
+    }
+
+def iter_dv_tasks(flags, seed, duplicate_rate, nan_rate):
+    """dv_tasks記錄；以 duplicate_rate 的機率重複出現先前的項目 (載入時以第一筆為準)"""
+
+    rng = random.Random(f"{seed}:dv_tasks")
+    index = 1
+    for i, flag in enumerate(flags):
+        if not flag & IN_DV_TASKS:
+            continue
+        yield {"source": "dv_tasks.xlsx", "sheet": IT_DV_TASKS_SHEET, "data": dv_task_data(rng, index, i, nan_rate)}
+        index += 1
+        if rng.random() < duplicate_rate:
+            # 重複先前任一個已寫出的項目 (最差情況為目前的項目)
+            duplicate = rng.randrange(i + 1)
+            while not flags[duplicate] & IN_DV_TASKS:
+                duplicate += 1
+            yield {"source": "dv_tasks.xlsx", "sheet": IT_DV_TASKS_SHEET,
+                   "data": dv_task_data(rng, index, duplicate, nan_rate)}
+            index += 1
+
+def allproject_ip(rng, nan_rate):
+    """allproject的IP欄位：多數為 "IP: 名稱" 形式，另有無冒號、只有 "IP" 與空值"""
+    roll = rng.random()
+    if roll < nan_rate:
+        return NAN
+    if roll < 0.75:
+        return f"IP: {rng.choice(SPIP_IP_NAMES)}"
+    if roll < 0.95:
+        return rng.choice(SPIP_IP_NAMES)
+    return "IP"
+
+def iter_allproject(flags, seed, nan_rate):
+    """allproject subtask記錄，每個項目1到3筆"""
+
+    rng = random.Random(f"{seed}:allproject")
+    for i, flag in enumerate(flags):
+        if not flag & IN_ALLPROJECT:
+            continue
+        name = project_name(i)
+        for _ in range(rng.choice((1, 1, 1, 2, 3))):
+            yield {
+                "source": "allproject-2025-06-23-09-32-12.xlsx",
+                "sheet": IT_ALLPROJECT_SHEET,
+                "data": {
+                    "Project": name,
+                    "Subtask Link": f"{name}-{rng.randrange(1, 2000)}",
+                    "Summary": maybe(rng, f"[AUTO] {rng.choice(DV_ENGINEERS).lower()} DV design sub-task", nan_rate),
+                    "Product": maybe(rng, rng.choice(IP_NAMES), nan_rate),
+                    "Assignee": rng.choice(ASSIGNEES),
+                    "Emp_id": f"R{rng.randrange(1000, 9999)}",
+                    "IP": allproject_ip(rng, nan_rate),
+                    "Subtask Status": rng.choice(SUBTASK_STATUSES),
+                    "Update Time": timestamp(rng)[:10],
+                    "Week": f"2025 W{rng.randrange(1, 53):02d}",
+                    "Weight": rng.choice((0.2, 0.5, 0.8, 1.0)),
+                    "Progress update": maybe(rng, f"[2025/06/16]\n{name}\n- regression\n  + sanity", nan_rate),
+                },
+            }
+
+def iter_it_supplemental(flags, seed, nan_rate):
+    """IT Domain補充資料，依載入後的項目順序逐筆對應"""
+
+    rng = random.Random(f"{seed}:it_supplemental")
+    for i in project_order(flags):
+        name = project_name(i)
+        subtype = rng.choice(("default", "gen2x1"))
+        yield {
+            "source": "it-domain-to-be-added.json",
+            "data": {
+                "IP Subtype": subtype,
+                "IP Postfix": "2x1" if subtype == "gen2x1" else "",
+                "DD": rng.choice(DIGITAL_DESIGNERS),
+                "BU": rng.choice(("CN", "PC")),
+                "AD": maybe(rng, rng.choice(ANALOG_DESIGNERS), nan_rate, ""),
+                "spec version": f"v{rng.randrange(1, 4)}.{rng.randrange(10)}",
+                "spec path": f"/project/spec/{name}_spec.pdf",
+                "Inherit from IP": maybe(rng, project_name(rng.randrange(len(flags))), 0.5, ""),
+                "re-use IP": rng.choice(("Y", "N")),
+            },
+        }
+
+def iter_nx_examples(flags, seed):
+    """NX Domain原始資料：tape out lookup 與 report hist 兩種記錄
+
+    NX_MISSING 的項目沒有對應資料；report hist 的IP有時帶後綴 (如 RL1234_2x1)，同樣對應不到項目。
+    """
+
+    rng = random.Random(f"{seed}:nx_examples")
+    for i, flag in enumerate(flags):
+        if flag & NX_MISSING or rng.random() < 0.3:
+            continue
+        yield {
+            "source": "MySQL_rdc_dv_tape_out_lookup.csv",
+            "data": {
+                "IP": project_name(i),
+                "TIMESTAMP": timestamp(rng),
+                "TPO_DATE": timestamp(rng)[:10],
+                "REG_FLAG": rng.choice(("N", "Y")),
+            },
+        }
+    for i, flag in enumerate(flags):
+        if flag & NX_MISSING:
+            continue
+        for _ in range(rng.choice((1, 1, 2))):
+            updated = timestamp(rng).replace("-", "/")
+            yield {
+                "source": "MySQL_rdc_dv_report_hist.csv",
+                "data": {
+                    "UPD_DATE": updated[:16],
+                    "DATE": updated[:10],
+                    "PROJECT": rng.choice(IP_NAMES).lower(),
+                    "IP": project_name(i) if rng.random() < 0.8 else f"{project_name(i)}_2x1",
+                    "DV_TYPE": rng.choice(("FULL", "SANITY")),
+                    "PASSED": f"{rng.randrange(60, 90)}/90",
+                    "COVERAGE": f"{rng.uniform(50, 100):.2f}/{rng.uniform(0, 50):.2f}",
+                    "FOLDER_PATH": "/project/Digital_HS/xxx",
+                    "UNCOVERED": NAN,
+                    "RTL_UPDATE_DATE": NAN,
+                    "RELEASE_TO_BU_DATE": NAN,
+                    "TAPEOUT_DATE": NAN,
+                    "VALID": 1,
+                    "PROJECT_REPOS": "ssh://rdgerrit.xxx",
+                    "REGRESSION_MAKEFILE": NAN,
+                    "SVN_REV": rng.randrange(1000, 30000),
+                    "SVN_PATH": "http://dtdinfo/svn/RD/xxx",
+                    "RTL_SRC_PATH": NAN,
+                    "RTL_SRC_FLIST": NAN,
+                    "RTL_SRC_TB": NAN,
+                    "DEST_SVN": NAN,
+                    "COMMENT": NAN,
+                },
+            }
+
+def iter_nx_supplemental(flags, seed, nan_rate):
+    """NX Domain補充資料，依載入後的項目順序逐筆對應"""
+
+    rng = random.Random(f"{seed}:nx_supplemental")
+    for i in project_order(flags):
+        name = project_name(i)
+        svn = f"http://dtdinfo/svn/RD/{name}"
+        yield {
+            "source": "nx-domain-to-be-added.json",
+            "data": {
+                "Line Coverage": f"{rng.uniform(40, 100):.1f}",
+                "FSM Coverage": f"{rng.uniform(40, 100):.1f}",
+                "Interface Toggle Coverage": f"{rng.uniform(40, 100):.1f}",
+                "Toggle Coverage": f"{rng.uniform(40, 100):.1f}",
+                "Coverage Report Path": f"/project/coverage/{name}_coverage.html",
+                "sanity SVN": f"{svn}/sanity",
+                "sanity SVN ver": str(rng.randrange(1000, 30000)),
+                "release SVN": svn,
+                "release SVN ver": str(rng.randrange(1000, 30000)),
+                "git path": f"ssh://git.xxx/{name}.git",
+                "git version": f"{rng.getrandbits(160):040x}",
+                "golden checklist": f"/project/golden/{name}_checklist.xlsx",
+                "golden checklist version": f"{rng.randrange(1, 4)}.{rng.randrange(10)}",
+                "RTL last update timestamp": maybe(rng, timestamp(rng)[:16] + ":00", nan_rate, ""),
+                "TO report creation timestamp": maybe(rng, timestamp(rng)[:16] + ":00", nan_rate, ""),
+                "TO Date": timestamp(rng)[:10] + " 00:00:00",
+            },
+        }
+
+def write_json_array(path, records):
+    """逐筆寫出JSON陣列 (每行一筆記錄，NaN 原樣輸出)，返回寫出的筆數"""
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    count = 0
+    with open(path, 'w', encoding='utf-8', buffering=OUTPUT_BUFFER_SIZE) as f:
+        f.write("[")
+        for record in records:
+            f.write(",\n  " if count else "\n  ")
+            f.write(json.dumps(record, ensure_ascii=False))
+            count += 1
+        f.write("\n]\n" if count else "]\n")
+    return count
+
+def generate_synthetic_domain_data(output_dir=DEFAULT_OUTPUT_DIR, projects=DEFAULT_PROJECTS, seed=0,
+                                   duplicate_rate=0.05, nan_rate=0.1, nx_missing_rate=0.2):
+    """在 output_dir 產生五個Domain資料檔，返回 {檔案路徑: 記錄筆數}
+
+    相同的參數與 seed 一定產生相同內容。除了每個項目一個位元組的旗標外，記錄都是邊產生邊寫出。
+    """
+
+    output_dir = Path(output_dir)
+    flags = build_project_flags(projects, seed, nx_missing_rate)
+    outputs = (
+        (IT_ALLPROJECT_PATH, iter_allproject(flags, seed, nan_rate)),
+        (IT_DV_TASKS_PATH, iter_dv_tasks(flags, seed, duplicate_rate, nan_rate)),
+        (IT_SUPPLEMENTAL_PATH, iter_it_supplemental(flags, seed, nan_rate)),
+        (NX_EXAMPLES_PATH, iter_nx_examples(flags, seed)),
+        (NX_SUPPLEMENTAL_PATH, iter_nx_supplemental(flags, seed, nan_rate)),
+    )
+    return {path: write_json_array(output_dir / path, records) for path, records in outputs}
+
+def parse_args(argv=None):
+    """解析命令列參數"""
+    parser = argparse.ArgumentParser(description="產生任意規模的IT Domain / NX Domain合成資料")
+    parser.add_argument("--output-dir", default=str(DEFAULT_OUTPUT_DIR),
+                        help=f"輸出目錄，其下建立與原始資料相同的目錄結構 (預設: {DEFAULT_OUTPUT_DIR})")
+    parser.add_argument("--projects", type=int, default=DEFAULT_PROJECTS, help=f"項目數 (預設: {DEFAULT_PROJECTS})")
+    parser.add_argument("--seed", type=int, default=0, help="亂數種子，相同種子產生相同資料 (預設: 0)")
+    parser.add_argument("--duplicate-rate", type=float, default=0.05, help="dv_tasks重複項目的比例 (預設: 0.05)")
+    parser.add_argument("--nan-rate", type=float, default=0.1, help="欄位為 NaN/NaT 空值的比例 (預設: 0.1)")
+    parser.add_argument("--nx-missing-rate", type=float, default=0.2,
+                        help="沒有NX Domain原始資料的項目比例 (預設: 0.2)")
+    args = parser.parse_args(argv)
+    if args.projects < 0:
+        parser.error("--projects 不可為負數")
+    for name in ("duplicate_rate", "nan_rate", "nx_missing_rate"):
+        value = getattr(args, name)
+        if math.isnan(value) or not 0 <= value <= 1:
+            parser.error(f"--{name.replace('_', '-')} 必須介於0與1之間")
+    return args
+
+def main(argv=None):
+    """主函數"""
+    args = parse_args(argv)
+
+    print(f"=== 產生合成Domain資料: {args.projects} 個項目 (seed={args.seed}) ===")
+    counts = generate_synthetic_domain_data(args.output_dir, args.projects, args.seed,
+                                            args.duplicate_rate, args.nan_rate, args.nx_missing_rate)
+    for path, count in counts.items():
+        print(f"  {Path(args.output_dir) / path}: {count} 筆")
+    print(f"在 {args.output_dir} 目錄中執行 generate_to_summary_from_domains.py 即可使用這些資料")
+
+if __name__ == "__main__":
+    main()
@@ -1,465 +1,893 @@
 #!/usr/bin/env python3
-""從IT Domain和NX Domain的資料整合產生TO summary JSON
+"""從IT Domain和NX Domain的資料整合產生TO summary JSON
 包含原始數據的對應資料
 """
 
+import argparse
+import cProfile
+import csv
+import datetime
+import gzip
+import hashlib
 import json
+import os
+import pickle
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 
-def load_domain_data():
-    """載入IT Domain和NX Domain的資料"""
+# 執行統計 (--metrics)：各階段累計耗時 (秒) 與事件計數
+STAGE_TIMINGS = {}
+METRIC_COUNTERS = Counter()
+
+@contextmanager
+def stage_timer(name):
+    """將 with 區塊的耗時累加到 STAGE_TIMINGS[name]"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_TIMINGS[name] = STAGE_TIMINGS.get(name, 0.0) + time.perf_counter() - started
+
+def reset_metrics():
+    """清除先前的耗時與計數"""
+    STAGE_TIMINGS.clear()
+    METRIC_COUNTERS.clear()
+
+def metrics_report(**fields):
+    """以可轉為JSON的字典返回目前的耗時與計數，fields 為額外附加的欄位"""
+    return {
+        **fields,
+        "stages": {name: round(seconds, 4) for name, seconds in STAGE_TIMINGS.items()},
+        "counters": dict(sorted(METRIC_COUNTERS.items())),
+    }
+
+def blank_if_empty(value):
+    """空值 (None、空字串等) 一律轉為空字串"""
+    if not value:
+        METRIC_COUNTERS["blank_normalizations"] += 1
+        return ""
+    return value
+
+def split_spip_ip_name(value):
+    """從allproject的IP欄位 (如 "IP: USB_PCIE_SATA") 取出IP名稱"""
+    if not value or value == 'IP':
+        return ""
+    if isinstance(value, str) and ":" in value:
+        return value.split(":")[0].strip()
+    return value
+
+# TO summary 33個標準欄位的解析規則：欄位 → 依優先順序排列的 (來源, 原始欄位, 轉換函數)
+# 第一個有資料的來源即為該欄位的來源（原始欄位不存在時值為空字串），所有來源都沒有資料時為空字串。
+# 同一份規則同時決定 TO summary 的值與欄位對應表中的來源，兩者不會不一致。
+FIELD_RESOLUTION_RULES = {
+    "Index": [("dv_tasks", "Index", str)],
+    "Project": [("dv_tasks", "Project", None), ("allproject", "Project", None), ("computed", "Project", None)],
+    "SPIP_IP": [("allproject", "IP", None)],
+    "IP": [("dv_tasks", "IP", blank_if_empty), ("allproject", "IP", split_spip_ip_name)],
+    "IP Postfix": [("it_supplemental", "IP Postfix", None)],
+    "IP Subtype": [("it_supplemental", "IP Subtype", None)],
+    "Alternative Name": [("dv_tasks", "Alternative Name", blank_if_empty), ("allproject", "Summary", blank_if_empty)],
+    "Line Coverage": [("nx_supplemental", "Line Coverage", None)],
+    "FSM Coverage": [("nx_supplemental", "FSM Coverage", None)],
+    "Interface Toggle Coverage": [("nx_supplemental", "Interface Toggle Coverage", None)],
+    "Toggle Coverage": [("nx_supplemental", "Toggle Coverage", None)],
+    "Coverage Report Path": [("nx_supplemental", "Coverage Report Path", None)],
+    "DV": [("dv_tasks", "DV", None)],
+    "DD": [("dv_tasks", "DD", None)],
+    "BU": [("dv_tasks", "BU", blank_if_empty)],
+    "sanity SVN": [("nx_supplemental", "sanity SVN", None)],
+    "sanity SVN ver": [("nx_supplemental", "sanity SVN ver", None)],
+    "release SVN": [("nx_supplemental", "release SVN", None)],
+    "release SVN ver": [("nx_supplemental", "release SVN ver", None)],
+    "git path": [("nx_supplemental", "git path", None)],
+    "git version": [("nx_supplemental", "git version", None)],
+    "golden checklist": [("nx_supplemental", "golden checklist", None)],
+    "golden checklist version": [("nx_supplemental", "golden checklist version", None)],
+    "TO Date": [("nx_supplemental", "TO Date", None)],
+    "SPIP url": [("dv_tasks", "SPIP", None)],
+    "Wiki url": [("dv_tasks", "WIKI", None)],
+    "spec version": [("it_supplemental", "spec version", None)],
+    "spec path": [("it_supplemental", "spec path", None)],
+    "RTL last update timestamp": [("nx_supplemental", "RTL last update timestamp", None)],
+    "TO report creation timestamp": [("nx_supplemental", "TO report creation timestamp", None)],
+    "AD": [("it_supplemental", "AD", None)],
+    "Inherit from IP": [("it_supplemental", "Inherit from IP", None)],
+    "re-use IP": [("it_supplemental", "re-use IP", None)],
+}
+
+# TO summary的33個標準欄位
+TO_SUMMARY_FIELDS = list(FIELD_RESOLUTION_RULES)
+
+# 解析規則中的來源在每個項目來源組中的位置
+RULE_SOURCES = ("dv_tasks", "allproject", "it_supplemental", "nx_supplemental", "computed")
+
+def rule_source_fields(source):
+    """列出解析規則從某個來源使用的原始欄位"""
+    return tuple(dict.fromkeys(
+        key for rules in FIELD_RESOLUTION_RULES.values() for rule_source, key, _ in rules if rule_source == source
+    ))
+
+# 各來源實際被TO summary使用的欄位（NX原始資料只用於項目對應）
+IT_DV_TASKS_FIELDS = rule_source_fields("dv_tasks")
+IT_ALLPROJECT_FIELDS = rule_source_fields("allproject")
+NX_EXAMPLES_FIELDS = ("PROJECT", "IP")
+
+# 欄位對應表中沒有來源時使用的預設值
+DEFAULT_PROVENANCE = ("預設值/計算值", "N/A", "N/A")
+
+# IT Domain原始資料的來源(xlsx)對應到實際讀取的JSON檔名
+IT_ORIGINAL_SOURCE_FILES = {
+    "dv_tasks.xlsx": "it_domain_dv_tasks.json",
+    "allproject-2025-06-23-09-32-12.xlsx": "it_domain_allproject.json",
+}
+
+IT_ALLPROJECT_PATH = Path("IT_Domain/ideal_IT_Domain_Data/it_domain_allproject.json")
+IT_DV_TASKS_PATH = Path("IT_Domain/ideal_IT_Domain_Data/it_domain_dv_tasks.json")
+IT_SUPPLEMENTAL_PATH = Path("IT_Domain/ideal_IT_Domain_Data/it-domain-to-be-added.json")
+NX_EXAMPLES_PATH = Path("NX_Domain/ideal_NX_Domain_Data/nx_domain_examples.json")
+NX_SUPPLEMENTAL_PATH = Path("NX_Domain/ideal_NX_Domain_Data/nx-domain-to-be-added.json")
+
+# 直接讀取原始活頁簿時使用的工作表 (與轉換後JSON的 sheet 欄位相同)
+IT_ALLPROJECT_SHEET = "subtask"
+IT_DV_TASKS_SHEET = "DV_Tasks"
+XLSX_SUFFIXES = (".xlsx", ".xlsm")
+
+TO_SUMMARY_JSON_PATH = Path("to_summary_examples.json")
+TO_SUMMARY_JSONL_PATH = Path("to_summary_examples.jsonl")
+OUTPUT_FORMATS = ("json", "jsonl")
+
+# 記錄中內嵌的原始/補充資料：embed 完整內嵌、reference 以 {"source", "row"} 參照來源檔中的位置、omit 不輸出
+EMBEDDED_SOURCE_FIELDS = ("it_domain_original", "it_domain_supplemental", "nx_domain_original", "nx_domain_supplemental")
+ORIGINALS_MODES = ("embed", "reference", "omit")
+FIELD_MAPPING_CSV_PATH = Path("to_summary_field_mapping.csv")
+FIELD_MAPPING_CSV_HEADER = ("Project", "TO_Summary_Field", "TO_Summary_Value", "Source_File", "Original_Field", "Original_Value")
+OUTPUT_BUFFER_SIZE = 1 << 20
+# 增量模式記錄每個項目來源指紋的狀態檔
+INCREMENTAL_STATE_PATH = Path("to_summary_state.json")
+INCREMENTAL_STATE_VERSION = 2
+
+# 已解析並建立索引的Domain資料快取
+DOMAIN_CACHE_DIR = Path(".to_summary_cache")
+DOMAIN_CACHE_VERSION = 2
+DOMAIN_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+def iter_json_array(f, chunk_size=1 << 16):
+    """逐筆解析JSON陣列中的元素，每次只讀取 chunk_size 個字元"""
+    
+    decoder = json.JSONDecoder()
+    buf = ""
+    pos = 0
+    eof = False
+    
+    def fill():
+        nonlocal buf, pos, eof
+        chunk = f.read(chunk_size)
+        buf = buf[pos:] + chunk
+        pos = 0
+        eof = not chunk
+        return not eof
+    
+    def skip_whitespace():
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n":
+                pos += 1
+            if pos < len(buf) or not fill():
+                return
+    
+    skip_whitespace()
+    if pos >= len(buf) or buf[pos] != "[":
+        raise ValueError("JSON檔案的最外層必須是陣列")
+    pos += 1
+    
+    first = True
+    while True:
+        skip_whitespace()
+        if pos >= len(buf):
+            raise ValueError("JSON陣列未正確結束")
+        if buf[pos] == "]":
+            return
+        if not first:
+            if buf[pos] != ",":
+                raise ValueError(f"JSON陣列元素之間缺少逗號: {buf[pos:pos + 20]!r}")
+            pos += 1
+            skip_whitespace()
+        first = False
+        
+        while True:
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                # 元素尚未完整讀入，繼續讀取
+                if fill():
+                    continue
+                raise
+            # 數值可能剛好在緩衝區結尾被截斷，確認後面還有內容
+            if end == len(buf) and not eof and fill():
+                continue
+            break
+        pos = end
+        yield value
+
+def xlsx_cell_value(value):
+    """將儲存格的值轉為與轉換後JSON相同的表示 (空白→NaN，日期→字串)"""
+    if value is None:
+        return float("nan")
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return str(value)
+    return value
+
+def iter_xlsx_records(path, sheet, fields=None):
+    """以openpyxl唯讀模式逐列讀取活頁簿工作表的記錄
+
+    第一列為欄位名稱；每列產生與轉換後JSON相同格式的記錄 {"source", "sheet", "data"}。
+    fields 不為 None 時只取出這些欄位，且只解析到最後一個需要的欄為止；整列空白的資料列會略過。
+    """
+    
+    from openpyxl import load_workbook
+    
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet]
+        rows = worksheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        
+        # 欄位名稱 → 欄號，重複的欄位名稱以第一欄為準
+        columns = {}
+        for column, name in enumerate(header):
+            if name is not None and str(name) not in columns:
+                columns[str(name)] = column
+        if fields is not None:
+            keep = set(fields)
+            columns = {name: column for name, column in columns.items() if name in keep}
+        if not columns:
+            return
+        
+        max_col = max(columns.values()) + 1
+        source = Path(path).name
+        for row in worksheet.iter_rows(min_row=2, max_col=max_col, values_only=True):
+            if all(value is None for value in row):
+                continue
+            row = tuple(row) + (None,) * (max_col - len(row))
+            yield {
+                "source": source,
+                "sheet": sheet,
+                "data": {name: xlsx_cell_value(row[column]) for name, column in columns.items()},
+            }
+    finally:
+        workbook.close()
+
+def iter_domain_records(path, fields=None, sheet=None):
+    """逐筆讀取Domain資料檔案的記錄
+
+    fields 不為 None 時，data 只保留這些欄位，其餘未使用的欄位在讀取時即丟棄。
+    .xlsx 檔案直接讀取 sheet 工作表，不需要先轉換為JSON。
+    """
+    
+    path = Path(path)
+    if not path.exists():
+        return
+    
+    if path.suffix.lower() in XLSX_SUFFIXES:
+        yield from iter_xlsx_records(path, sheet, fields)
+        return
+    
+    keep = None if fields is None else set(fields)
+    
+    with open(path, 'r', encoding='utf-8') as f:
+        for item in iter_json_array(f):
+            if keep is not None and isinstance(item.get('data'), dict):
+                item['data'] = {key: value for key, value in item['data'].items() if key in keep}
+            yield item
+
+def load_domain_data(slim=False, it_allproject_path=IT_ALLPROJECT_PATH, it_dv_tasks_path=IT_DV_TASKS_PATH):
+    """載入IT Domain和NX Domain的資料
+
+    slim=True 時只保留TO summary實際使用的欄位，以降低大型匯出檔的記憶體用量。
+    IT Domain原始資料可直接指定 allproject / dv_tasks 的 .xlsx 活頁簿，省去轉換成JSON的步驟。
+    """
     
     # 載入IT Domain原始資料
-    it_allproject_path = Path("IT_Domain/ideal_IT_Domain_Data/it_domain_allproject.json")
-    it_allproject_data = []
-    if it_allproject_path.exists():
-        with open(it_allproject_path, 'r', encoding='utf-8') as f:
-            it_allproject_data = json.load(f)
-    
-    it_dv_tasks_path = Path("IT_Domain/ideal_IT_Domain_Data/it_domain_dv_tasks.json")
-    it_dv_tasks_data = []
-    if it_dv_tasks_path.exists():
-        with open(it_dv_tasks_path, 'r', encoding='utf-8') as f:
-            it_dv_tasks_data = json.load(f)
+    it_allproject_data = list(iter_domain_records(it_allproject_path, IT_ALLPROJECT_FIELDS if slim else None, IT_ALLPROJECT_SHEET))
+    it_dv_tasks_data = list(iter_domain_records(it_dv_tasks_path, IT_DV_TASKS_FIELDS if slim else None, IT_DV_TASKS_SHEET))
     
     # 載入IT Domain補充資料
-    it_supplemental_path = Path("IT_Domain/ideal_IT_Domain_Data/it-domain-to-be-added.json")
-    it_supplemental_data = []
-    if it_supplemental_path.exists():
-        with open(it_supplemental_path, 'r', encoding='utf-8') as f:
-            it_supplemental_data = json.load(f)
+    it_supplemental_data = list(iter_domain_records(IT_SUPPLEMENTAL_PATH))
     
     # 載入NX Domain原始資料
-    nx_examples_path = Path("NX_Domain/ideal_NX_Domain_Data/nx_domain_examples.json")
-    nx_examples_data = []
-    if nx_examples_path.exists():
-        with open(nx_examples_path, 'r', encoding='utf-8') as f:
-            nx_examples_data = json.load(f)
+    nx_examples_data = list(iter_domain_records(NX_EXAMPLES_PATH, NX_EXAMPLES_FIELDS if slim else None))
     
     # 載入NX Domain補充資料
-    nx_supplemental_path = Path("NX_Domain/ideal_NX_Domain_Data/nx-domain-to-be-added.json")
-    nx_supplemental_data = []
-    if nx_supplemental_path.exists():
-        with open(nx_supplemental_path, 'r', encoding='utf-8') as f:
-            nx_supplemental_data = json.load(f)
+    nx_supplemental_data = list(iter_domain_records(NX_SUPPLEMENTAL_PATH))
     
     return it_allproject_data, it_dv_tasks_data, it_supplemental_data, nx_examples_data, nx_supplemental_data
 
-def find_matching_project_data(project_name, it_allproject_data, it_dv_tasks_data):
-    """在IT Domain原始資料中尋找對應的項目資料 - 優先返回dv_tasks資料"""
-    
-    # 優先在dv_tasks資料中尋找
-    for item in it_dv_tasks_data:
-        if item['data'].get('Project') == project_name:
-            return item
-    
-    # 如果沒有找到dv_tasks資料，再在allproject資料中尋找
-    for item in it_allproject_data:
-        if item['data'].get('Project') == project_name:
-            return item
-    
-    return None
+def file_content_hash(path, chunk_size=1 << 20):
+    """檔案內容的sha256，檔案無法讀取時返回None"""
+    
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+def domain_cache_key(source_paths, slim):
+    """以來源檔案的路徑與內容雜湊計算快取鍵 (sha256)，任一檔案內容變動都會得到新的鍵
+
+    不使用修改時間與大小：內容不同但兩者相同的檔案 (例如還原備份) 也不會讀到舊的快取。
+    slim 模式另外納入依 FIELD_RESOLUTION_RULES 保留的欄位，規則改用新欄位時不會沿用缺少該欄位的快取。
+    """
+    
+    sources = [[str(Path(path).resolve()), file_content_hash(path)] for path in source_paths]
+    slim_fields = [sorted(IT_ALLPROJECT_FIELDS), sorted(IT_DV_TASKS_FIELDS), sorted(NX_EXAMPLES_FIELDS)] if slim else None
+    payload = json.dumps([DOMAIN_CACHE_VERSION, slim, slim_fields, sources], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def load_domain_cache(cache_dir, key):
+    """讀取快取的 (Domain資料, 索引)，沒有快取或無法讀取時返回None"""
+    
+    cache_path = Path(cache_dir) / f"{key}.pickle"
+    try:
+        with open(cache_path, 'rb') as f:
+            cached = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+        return None
+    
+    # 更新修改時間，淘汰時視為最近使用
+    os.utime(cache_path)
+    return cached
 
-def find_matching_nx_data(project_name, nx_examples_data):
+def save_domain_cache(cache_dir, key, cached, max_bytes=DOMAIN_CACHE_MAX_BYTES):
+    """寫入快取檔案，並淘汰最久未使用的快取使總大小不超過 max_bytes"""
+    
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    cache_path = cache_dir / f"{key}.pickle"
+    tmp_path = cache_path.with_suffix(".tmp")
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(cached, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, cache_path)
+    
+    entries = sorted(
+        ((entry.stat().st_mtime_ns, entry.stat().st_size, entry) for entry in cache_dir.glob("*.pickle")),
+        reverse=True,
+    )
+    total = 0
+    evicted = 0
+    for _, size, entry in entries:
+        total += size
+        if total > max_bytes and entry != cache_path:
+            entry.unlink(missing_ok=True)
+            evicted += 1
+    return evicted
+
+def load_domain_data_cached(cache_dir, slim=False, it_allproject_path=IT_ALLPROJECT_PATH, it_dv_tasks_path=IT_DV_TASKS_PATH, max_bytes=DOMAIN_CACHE_MAX_BYTES):
+    """透過磁碟快取載入Domain資料與項目索引，返回 (Domain資料, 索引, 是否命中)
+
+    來源檔案沒有變動時直接讀取上次解析並建立索引的結果，省去JSON/XLSX解析與索引建立。
+    """
+    
+    source_paths = [it_allproject_path, it_dv_tasks_path, IT_SUPPLEMENTAL_PATH, NX_EXAMPLES_PATH, NX_SUPPLEMENTAL_PATH]
+    key = domain_cache_key(source_paths, slim)
+    
+    cached = load_domain_cache(cache_dir, key)
+    if cached is not None:
+        print(f"Domain資料快取命中: {key[:12]}")
+        return cached["domain_data"], cached["domain_index"], True
+    
+    print(f"Domain資料快取未命中: {key[:12]}")
+    domain_data = load_domain_data(slim=slim, it_allproject_path=it_allproject_path, it_dv_tasks_path=it_dv_tasks_path)
+    it_allproject_data, it_dv_tasks_data, _, nx_examples_data, _ = domain_data
+    domain_index = build_domain_index(it_allproject_data, it_dv_tasks_data, nx_examples_data)
+    
+    evicted = save_domain_cache(cache_dir, key, {"domain_data": domain_data, "domain_index": domain_index}, max_bytes)
+    if evicted:
+        print(f"已淘汰 {evicted} 個舊的Domain資料快取")
+    return domain_data, domain_index, False
+
+def build_domain_index(it_allproject_data, it_dv_tasks_data, nx_examples_data):
+    """一次掃描建立以項目名稱為鍵的索引，供所有查詢共用
+
+    每個鍵只保留第一筆出現的資料，與原本線性搜尋「找到即返回」的行為一致。
+    """
+    
+    def index_by(items, keys):
+        index = {}
+        for item in items:
+            data = item['data']
+            for key in keys:
+                value = data.get(key)
+                # NaN 不等於自身，線性比對永遠找不到，因此不放入索引
+                if value != value:
+                    METRIC_COUNTERS["nan_index_keys_skipped"] += 1
+                    continue
+                try:
+                    index.setdefault(value, item)
+                except TypeError:
+                    continue
+        return index
+    
+    # 項目清單：dv_tasks 優先，allproject 補充，保持首次出現的順序
+    projects = {}
+    for items in (it_dv_tasks_data, it_allproject_data):
+        for item in items:
+            project_name = item['data'].get('Project')
+            if project_name and project_name not in projects:
+                projects[project_name] = None
+    
+    return {
+        "projects": list(projects),
+        "dv_tasks": index_by(it_dv_tasks_data, ('Project',)),
+        "allproject": index_by(it_allproject_data, ('Project',)),
+        # NX 資料以 PROJECT 或 IP 任一欄位對應項目名稱
+        "nx": index_by(nx_examples_data, ('PROJECT', 'IP')),
+    }
+
+def find_matching_nx_data(project_name, domain_index):
     """在NX Domain原始資料中尋找對應的項目資料"""
     
-    for item in nx_examples_data:
-        data = item['data']
-        if data.get('PROJECT') == project_name or data.get('IP') == project_name:
-            return item
-    
-    return None
+    return domain_index["nx"].get(project_name)
 
-def create_to_summary_records(it_allproject_data, it_dv_tasks_data, it_supplemental_data, nx_examples_data, nx_supplemental_data):
-    """創建TO summary記錄"""
+def compile_field_rule(rules):
+    """將單一欄位的解析規則編譯成存取函數 items → (值, (來源檔案, 原始欄位, 原始值))"""
+    
+    steps = tuple((RULE_SOURCES.index(source), key, transform) for source, key, transform in rules)
+    
+    def resolve(items):
+        for position, key, transform in steps:
+            item = items[position]
+            if item is None or not item['data']:
+                continue
+            data = item['data']
+            value = data.get(key, "")
+            if transform is not None:
+                value = transform(value)
+            
+            source = item['source']
+            if source is None or key not in data:
+                return value, DEFAULT_PROVENANCE
+            # 根據實際檔案類型顯示正確的檔案名稱
+            source_file = IT_ORIGINAL_SOURCE_FILES.get(source, source.split("/")[-1])
+            return value, (source_file, key, str(data[key]))
+        
+        return "", DEFAULT_PROVENANCE
     
-    to_summary_records = []
+    return resolve
+
+# 啟動時編譯一次，每筆記錄直接呼叫
+FIELD_RESOLVERS = [(field, compile_field_rule(rules)) for field, rules in FIELD_RESOLUTION_RULES.items()]
+
+def build_to_summary_record(i, project_name, domain_index, it_supplemental_data, nx_supplemental_data):
+    """創建單一項目的TO summary記錄（i 為項目順序，補充資料依此順序對應）
+
+    返回 (記錄, 欄位對應資料列)，資料列在解析欄位時一併記錄每個欄位的來源。
+    """
+    
+    # 尋找IT Domain原始資料 - 優先使用dv_tasks資料
+    dv_task_item = domain_index["dv_tasks"].get(project_name)
+    allproject_item = domain_index["allproject"].get(project_name)
+    it_original = dv_task_item if dv_task_item is not None else allproject_item
+    
+    # 尋找NX Domain原始資料
+    nx_original = find_matching_nx_data(project_name, domain_index)
+    
+    METRIC_COUNTERS["dv_tasks_index_hits" if dv_task_item is not None else "dv_tasks_index_misses"] += 1
+    METRIC_COUNTERS["allproject_index_hits" if allproject_item is not None else "allproject_index_misses"] += 1
+    METRIC_COUNTERS["nx_index_hits" if nx_original is not None else "nx_index_misses"] += 1
+    if dv_task_item is None and allproject_item is not None:
+        METRIC_COUNTERS["fallback_to_allproject"] += 1
+    
+    # 獲取補充資料
+    it_supplemental = it_supplemental_data[i] if i < len(it_supplemental_data) else None
+    nx_supplemental = nx_supplemental_data[i] if i < len(nx_supplemental_data) else None
+    
+    # 依 RULE_SOURCES 的順序排列；找不到原始資料時以項目名稱作為計算值
+    items = (dv_task_item, allproject_item, it_supplemental, nx_supplemental,
+             {"source": None, "data": {"Project": project_name}})
+    
+    to_record = {}
+    provenances = []
+    for field, resolve in FIELD_RESOLVERS:
+        to_record[field], provenance = resolve(items)
+        provenances.append(provenance)
+    
+    # 記錄每個欄位的來源，欄位對應表直接輸出即可
+    project = to_record["Project"]
+    mapping_rows = [
+        [project, field, to_record[field], *provenance]
+        for field, provenance in zip(TO_SUMMARY_FIELDS, provenances)
+    ]
     
-    # 從原始資料中獲取實際的項目名稱
-    projects = []
+    record = {
+        "example_id": f"TO_Summary_Example_{i+1}",
+        "project": project,
+        "ip": to_record["IP"],
+        "it_domain_original": it_original,
+        "it_domain_supplemental": it_supplemental,
+        "nx_domain_original": nx_original,
+        "nx_domain_supplemental": nx_supplemental,
+        "to_summary": to_record
+    }
+    return record, mapping_rows
+
+# 子程序共用的項目索引與補充資料，由 init_record_worker 在每個子程序啟動時設定一次
+WORKER_CONTEXT = None
+
+def init_record_worker(domain_index, it_supplemental_data, nx_supplemental_data):
+    """子程序初始化：保存建立記錄所需的資料"""
+    global WORKER_CONTEXT
+    WORKER_CONTEXT = (domain_index, it_supplemental_data, nx_supplemental_data)
+
+def build_record_shard(shard):
+    """在子程序中建立一段連續項目的記錄，返回 (記錄列表, 這段記錄的事件計數)"""
+    domain_index, it_supplemental_data, nx_supplemental_data = WORKER_CONTEXT
+    METRIC_COUNTERS.clear()
+    results = [
+        build_to_summary_record(i, project_name, domain_index, it_supplemental_data, nx_supplemental_data)
+        for i, project_name in shard
+    ]
+    return results, dict(METRIC_COUNTERS)
+
+def iter_to_summary_records(positions, domain_index, it_supplemental_data, nx_supplemental_data, workers=1):
+    """依輸入順序逐筆產生指定項目 [(順序, 項目名稱), ...] 的 (記錄, 欄位對應資料列)
+
+    workers 大於1時將項目切成連續的分段交給多個子程序處理，結果依原本順序產生。
+    """
+    
+    positions = list(positions)
+    if workers <= 1 or len(positions) < 2:
+        for i, project_name in positions:
+            yield build_to_summary_record(i, project_name, domain_index, it_supplemental_data, nx_supplemental_data)
+        return
+    
+    # 每個子程序分到數個分段，避免單一分段較慢時其他子程序閒置
+    shard_size = max(1, -(-len(positions) // (workers * 4)))
+    shards = [positions[start:start + shard_size] for start in range(0, len(positions), shard_size)]
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_record_worker,
+                             initargs=(domain_index, it_supplemental_data, nx_supplemental_data)) as executor:
+        # map 依提交順序返回結果，合併後的順序與單程序相同；子程序的計數併入主程序
+        for shard_results, shard_counters in executor.map(build_record_shard, shards):
+            METRIC_COUNTERS.update(shard_counters)
+            yield from shard_results
+
+def build_to_summary_records(positions, domain_index, it_supplemental_data, nx_supplemental_data, workers=1):
+    """建立指定項目 [(順序, 項目名稱), ...] 的記錄，返回與輸入順序相同的 [(記錄, 欄位對應資料列), ...]"""
+    return list(iter_to_summary_records(positions, domain_index, it_supplemental_data, nx_supplemental_data, workers))
+
+def create_to_summary_records(it_allproject_data, it_dv_tasks_data, it_supplemental_data, nx_examples_data, nx_supplemental_data, domain_index=None, workers=1):
+    """創建TO summary記錄，返回 (記錄列表, 各記錄的欄位對應資料列)"""
     
-    # 優先從IT Domain dv_tasks資料獲取項目名稱（這是主要的DV任務資料）
-    for item in it_dv_tasks_data:
-        project_name = item['data'].get('Project')
-        if project_name and project_name not in projects:
-            projects.append(project_name)
+    if domain_index is None:
+        domain_index = build_domain_index(it_allproject_data, it_dv_tasks_data, nx_examples_data)
     
-    # 從IT Domain allproject資料獲取項目名稱（作為補充）
-    for item in it_allproject_data:
-        project_name = item['data'].get('Project')
-        if project_name and project_name not in projects:
-            projects.append(project_name)
+    # 從原始資料中獲取實際的項目名稱（dv_tasks 優先，allproject 補充）
+    projects = domain_index["projects"]
     
     print(f"找到的項目: {projects}")
     
-    for i, project_name in enumerate(projects):
-        
-        # 尋找IT Domain原始資料 - 優先使用dv_tasks資料
-        it_original = find_matching_project_data(project_name, it_allproject_data, it_dv_tasks_data)
-        
-        # 尋找NX Domain原始資料
-        nx_original = find_matching_nx_data(project_name, nx_examples_data)
-        
-        # 獲取補充資料
-        it_supplemental = it_supplemental_data[i] if i < len(it_supplemental_data) else None
-        nx_supplemental = nx_supplemental_data[i] if i < len(nx_supplemental_data) else None
-        
-        # 整合項目信息
-        project_info = {
-            "Project": project_name,
-            "IP": "",
-            "IP Postfix": "",
-            "Alternative Name": ""
-        }
-        
-        # 優先從IT Domain dv_tasks資料獲取基本信息
-        dv_task_data = None
-        allproject_data = None
-        
-        # 尋找dv_tasks資料
-        for item in it_dv_tasks_data:
-            if item['data'].get('Project') == project_name:
-                dv_task_data = item['data']
-                break
-        
-        # 尋找allproject資料
-        for item in it_allproject_data:
-            if item['data'].get('Project') == project_name:
-                allproject_data = item['data']
-                break
-        
-        # 優先使用dv_tasks資料，如果沒有則使用allproject資料
-        if dv_task_data:
-            project_info["Project"] = dv_task_data.get('Project', project_name)
-            project_info["IP"] = dv_task_data.get('IP', '')
-            project_info["IP Postfix"] = dv_task_data.get('IP Postfix', "") if dv_task_data else (it_supplemental["data"].get("IP Postfix", "") if it_supplemental else "")
-            project_info["Alternative Name"] = dv_task_data.get('Alternative Name', '')
-        elif allproject_data:
-            project_info["Project"] = allproject_data.get('Project', project_name)
-            
-            # 處理IP欄位
-            ip_value = allproject_data.get('IP', '')
-            if ip_value and ip_value != 'IP':
-                if ":" in ip_value:
-                    parts = ip_value.split(":")
-                    if len(parts) >= 2:
-                        project_info["IP"] = parts[0].strip()
-                        project_info["IP Postfix"] = parts[1].strip()
-                else:
-                    project_info["IP"] = ip_value
-            
-            project_info["Alternative Name"] = allproject_data.get('Summary', '')
-        
-        # 如果沒有找到原始資料，使用空值
-        if not project_info["IP"]:
-            project_info["IP"] = ""
-        if not project_info["IP Postfix"]:
-            project_info["IP Postfix"] = ""
-        if not project_info["Alternative Name"]:
-            project_info["Alternative Name"] = ""
-        
-        # 整合DV任務資訊
-        dv_info = {
-            "DV": "",
-            "TO Date": "",
-            "Status": "",
-            "Progress": "",
-            "SPIP": "",
-            "WIKI": "",
-            "BU": ""
-        }
-        
-        if dv_task_data:
-            dv_info["DV"] = dv_task_data.get('DV', '')
-            dv_info["TO Date"] = dv_task_data.get('TO Date', '')
-            dv_info["Status"] = dv_task_data.get('Status', '')
-            dv_info["Progress"] = dv_task_data.get('Progress', '')
-            dv_info["SPIP"] = dv_task_data.get('SPIP', '')
-            dv_info["WIKI"] = dv_task_data.get('WIKI', '')
-            dv_info["BU"] = dv_task_data.get('BU', '')
-        
-        # 整合NX Domain基本技術信息
-        nx_basic_info = {
-            "Line Coverage": "",
-            "FSM Coverage": "",
-            "Interface Toggle Coverage": "",
-            "Toggle Coverage": ""
-        }
-        
-        if nx_original:
-            data = nx_original['data']
-            nx_basic_info["Line Coverage"] = data.get('COVERAGE', '')
-        
-        # 如果沒有找到原始資料，使用空值
-        if not nx_basic_info["Line Coverage"]:
-            nx_basic_info["Line Coverage"] = ""
-        
-        # 整合所有資料創建TO summary記錄
-        to_record = {
-            "Index": str(dv_task_data.get('Index', "")) if dv_task_data else "",
-            "Project": project_info["Project"],
-            "SPIP_IP": allproject_data.get('IP', "") if allproject_data else "",
-            "IP": project_info["IP"],
-            "IP Postfix": it_supplemental["data"].get("IP Postfix", "") if it_supplemental else "",
-            "IP Subtype": it_supplemental["data"].get("IP Subtype", "") if it_supplemental else "",
-            "Alternative Name": project_info["Alternative Name"],
-            "Line Coverage": nx_supplemental["data"].get("Line Coverage", "") if nx_supplemental else "",
-            "FSM Coverage": nx_supplemental["data"].get("FSM Coverage", "") if nx_supplemental else "",
-            "Interface Toggle Coverage": nx_supplemental["data"].get("Interface Toggle Coverage", "") if nx_supplemental else "",
-            "Toggle Coverage": nx_supplemental["data"].get("Toggle Coverage", "") if nx_supplemental else "",
-            "Coverage Report Path": nx_supplemental["data"].get("Coverage Report Path", "") if nx_supplemental else "",
-            "DV": dv_info["DV"],
-            "DD": dv_task_data.get('DD', "") if dv_task_data else "",
-            "BU": dv_info["BU"] if dv_info["BU"] else "",
-            "sanity SVN": nx_supplemental["data"].get("sanity SVN", "") if nx_supplemental else "",
-            "sanity SVN ver": nx_supplemental["data"].get("sanity SVN ver", "") if nx_supplemental else "",
-            "release SVN": nx_supplemental["data"].get("release SVN", "") if nx_supplemental else "",
-            "release SVN ver": nx_supplemental["data"].get("release SVN ver", "") if nx_supplemental else "",
-            "git path": nx_supplemental["data"].get("git path", "") if nx_supplemental else "",
-            "git version": nx_supplemental["data"].get("git version", "") if nx_supplemental else "",
-            "golden checklist": nx_supplemental["data"].get("golden checklist", "") if nx_supplemental else "",
-            "golden checklist version": nx_supplemental["data"].get("golden checklist version", "") if nx_supplemental else "",
-            "TO Date": nx_supplemental["data"].get("TO Date", "") if nx_supplemental else "",
-            "SPIP url": dv_info["SPIP"],
-            "Wiki url": dv_info["WIKI"],
-            "spec version": it_supplemental["data"].get("spec version", "") if it_supplemental else "",
-            "spec path": it_supplemental["data"].get("spec path", "") if it_supplemental else "",
-            "RTL last update timestamp": nx_supplemental["data"].get("RTL last update timestamp", "") if nx_supplemental else "",
-            "TO report creation timestamp": nx_supplemental["data"].get("TO report creation timestamp", "") if nx_supplemental else "",
-            "AD": it_supplemental["data"].get("AD", "") if it_supplemental else "",
-            "Inherit from IP": it_supplemental["data"].get("Inherit from IP", "") if it_supplemental else "",
-            "re-use IP": it_supplemental["data"].get("re-use IP", "") if it_supplemental else ""
-        }
-        
-        to_summary_records.append({
-            "example_id": f"TO_Summary_Example_{i+1}",
-            "project": project_info["Project"],
-            "ip": project_info["IP"],
-            "it_domain_original": it_original,
-            "it_domain_supplemental": it_supplemental,
-            "nx_domain_original": nx_original,
-            "nx_domain_supplemental": nx_supplemental,
-            "to_summary": to_record
-        })
+    results = build_to_summary_records(enumerate(projects), domain_index, it_supplemental_data, nx_supplemental_data, workers)
+    to_summary_records = [record for record, _ in results]
+    mapping_rows = [rows for _, rows in results]
     
-    return to_summary_records
+    return to_summary_records, mapping_rows
+
+def make_record_shaper(originals, domain_data, domain_index):
+    """依 originals 模式建立調整記錄內嵌資料的函數 shape(i, 項目名稱, 記錄) → 記錄
 
-def save_to_summary_json(to_summary_records):
-    """保存TO summary記錄到JSON檔案"""
+    reference 模式以主程序中的項目索引找出來源記錄，轉為其在來源檔中的位置 (從0起算)，
+    因此子程序建立的記錄也能正確參照。
+    """
+    
+    if originals == "embed":
+        return lambda i, project_name, record: record
+    
+    if originals == "omit":
+        def shape(i, project_name, record):
+            return {key: value for key, value in record.items() if key not in EMBEDDED_SOURCE_FIELDS}
+        return shape
+    
+    it_allproject_data, it_dv_tasks_data, it_supplemental_data, nx_examples_data, nx_supplemental_data = domain_data
+    source_rows = {}
+    for items in (it_allproject_data, it_dv_tasks_data, nx_examples_data):
+        for row, item in enumerate(items):
+            source_rows[id(item)] = row
+    
+    def reference(item, row):
+        return None if item is None else {"source": item['source'], "row": row}
+    
+    def shape(i, project_name, record):
+        dv_task_item = domain_index["dv_tasks"].get(project_name)
+        it_original = dv_task_item if dv_task_item is not None else domain_index["allproject"].get(project_name)
+        nx_original = domain_index["nx"].get(project_name)
+        references = {
+            "it_domain_original": reference(it_original, source_rows.get(id(it_original))),
+            "it_domain_supplemental": reference(record["it_domain_supplemental"], i),
+            "nx_domain_original": reference(nx_original, source_rows.get(id(nx_original))),
+            "nx_domain_supplemental": reference(record["nx_domain_supplemental"], i),
+        }
+        return {key: references.get(key, value) for key, value in record.items()}
+    return shape
+
+def to_summary_output_path(output_format="json"):
+    """TO summary記錄的輸出路徑"""
+    return TO_SUMMARY_JSONL_PATH if output_format == "jsonl" else TO_SUMMARY_JSON_PATH
+
+def load_to_summary_output(output_format="json"):
+    """讀取上次輸出的TO summary記錄"""
     
-    output_path = Path("to_summary_examples.json")
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(to_summary_records, f, ensure_ascii=False, indent=2)
+    with open(to_summary_output_path(output_format), 'r', encoding='utf-8') as f:
+        if output_format == "jsonl":
+            return [json.loads(line) for line in f if line.strip()]
+        return json.load(f)
+
+def open_field_mapping_csv(compress=False):
+    """開啟欄位對應表並寫入標題列，返回 (檔案, csv.writer, 路徑)"""
+    
+    csv_path = field_mapping_csv_path(compress)
+    if compress:
+        csvfile = gzip.open(csv_path, 'wt', encoding='utf-8', newline='')
+    else:
+        csvfile = open(csv_path, 'w', encoding='utf-8', newline='', buffering=OUTPUT_BUFFER_SIZE)
+    writer = csv.writer(csvfile, lineterminator='\n')
+    writer.writerow(FIELD_MAPPING_CSV_HEADER)
+    return csvfile, writer, csv_path
+
+def write_to_summary_output(results, output_format="json", compress_mapping=False):
+    """逐筆寫出 (記錄, 欄位對應資料列)，同時產生TO summary檔案與欄位對應表，返回記錄數
+
+    results 可為產生器，記錄寫出後即可釋放，不需要在記憶體中保留整份輸出。
+    json 格式的內容與 json.dump(記錄列表, indent=2) 相同；jsonl 格式每行一筆記錄。
+    """
+    
+    output_path = to_summary_output_path(output_format)
+    count = 0
+    csvfile, writer, csv_path = open_field_mapping_csv(compress_mapping)
+    with open(output_path, 'w', encoding='utf-8', buffering=OUTPUT_BUFFER_SIZE) as f, csvfile:
+        if output_format == "jsonl":
+            for record, rows in results:
+                f.write(json.dumps(record, ensure_ascii=False))
+                f.write("\n")
+                writer.writerows(rows)
+                count += 1
+        else:
+            for record, rows in results:
+                # 陣列元素縮排2格，字串中的換行已轉義，可直接取代換行加上縮排
+                f.write("[\n  " if count == 0 else ",\n  ")
+                f.write(json.dumps(record, ensure_ascii=False, indent=2).replace("\n", "\n  "))
+                writer.writerows(rows)
+                count += 1
+            f.write("\n]" if count else "[]")
     
     print(f"文件: {output_path}")
-    
-    # 生成欄位對應表
-    generate_field_mapping_csv(to_summary_records)
-
-def generate_field_mapping_csv(to_summary_records):
-    """生成CSV格式的欄位對應表，來源邏輯與summary一致"""
-    
-    # 載入 allproject 資料用於 SPIP_IP 來源判斷
-    it_allproject_path = Path("IT_Domain/ideal_IT_Domain_Data/it_domain_allproject.json")
-    it_allproject_data = []
-    if it_allproject_path.exists():
-        with open(it_allproject_path, 'r', encoding='utf-8') as f:
-            it_allproject_data = json.load(f)
-    
-    # 定義TO summary的33個標準欄位
-    to_summary_fields = [
-        "Index", "Project", "SPIP_IP", "IP", "IP Postfix", "IP Subtype", "Alternative Name",
-        "Line Coverage", "FSM Coverage", "Interface Toggle Coverage", "Toggle Coverage", 
-        "Coverage Report Path", "DV", "DD", "BU", "sanity SVN", "sanity SVN ver",
-        "release SVN", "release SVN ver", "git path", "git version", "golden checklist",
-        "golden checklist version", "TO Date", "SPIP url", "Wiki url", "spec version",
-        "spec path", "RTL last update timestamp", "TO report creation timestamp",
-        "AD", "Inherit from IP", "re-use IP"
+    print(f"欄位對應表: {csv_path}")
+    return count
+
+def save_to_summary_json(to_summary_records, mapping_rows, compress_mapping=False):
+    """保存TO summary記錄到JSON檔案，並生成欄位對應表"""
+    write_to_summary_output(zip(to_summary_records, mapping_rows), "json", compress_mapping)
+
+def field_mapping_csv_path(compress=False):
+    """欄位對應表的輸出路徑，壓縮時加上 .gz"""
+    if compress:
+        return FIELD_MAPPING_CSV_PATH.with_name(FIELD_MAPPING_CSV_PATH.name + ".gz")
+    return FIELD_MAPPING_CSV_PATH
+
+def generate_field_mapping_csv(mapping_rows, compress=False):
+    """以串流方式寫出CSV格式的欄位對應表
+
+    mapping_rows 為建立記錄時一併產生的欄位來源資料列（每筆記錄一組），可為任意可迭代物件，
+    資料列經由 csv.writer 逐列寫入緩衝檔案，不會在記憶體中組合整個檔案。
+    含逗號、引號或換行的值以雙引號包圍並將引號加倍 (RFC 4180)，None 寫為空字串。
+    compress=True 時輸出 gzip 壓縮的 .csv.gz。
+    """
+    
+    csvfile, writer, csv_path = open_field_mapping_csv(compress)
+    with csvfile:
+        for rows in mapping_rows:
+            writer.writerows(rows)
+    print(f"欄位對應表: {csv_path}")
+
+def compute_project_fingerprint(i, project_name, domain_index, it_supplemental_data, nx_supplemental_data):
+    """計算單一項目所有來源記錄的內容雜湊
+
+    補充資料依項目順序對應，因此順序 i 也納入指紋；項目增減造成的位移會讓後續項目重新計算。
+    """
+    
+    sources = [
+        i,
+        project_name,
+        domain_index["dv_tasks"].get(project_name),
+        domain_index["allproject"].get(project_name),
+        domain_index["nx"].get(project_name),
+        it_supplemental_data[i] if i < len(it_supplemental_data) else None,
+        nx_supplemental_data[i] if i < len(nx_supplemental_data) else None,
+    ]
+    payload = json.dumps(sources, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def load_incremental_state(state_path, options):
+    """載入上次執行的增量狀態，格式或選項不符時返回None"""
+    
+    state_path = Path(state_path)
+    if not state_path.exists():
+        return None
+    
+    try:
+        with open(state_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    
+    if state.get("version") != INCREMENTAL_STATE_VERSION or state.get("options") != options:
+        return None
+    return state
+
+def regenerate_to_summary_incrementally(it_supplemental_data, nx_supplemental_data, domain_index, options, state_path=INCREMENTAL_STATE_PATH, workers=1, shape_record=None):
+    """只重新計算來源資料有變動（或新增）的項目，並更新輸出檔案
+
+    沒有狀態檔或上次的輸出不一致時，等同完整重建並寫入新的狀態檔。
+    shape_record 用於調整記錄 (見 make_record_shaper)。沿用的記錄也會重新套用，
+    因為來源檔中其他列的增刪會改變 reference 模式的列位置，而不會改變該項目的指紋。
+    """
+    
+    projects = domain_index["projects"]
+    fingerprints = [
+        compute_project_fingerprint(i, project_name, domain_index, it_supplemental_data, nx_supplemental_data)
+        for i, project_name in enumerate(projects)
     ]
     
-    csv_content = []
-    # CSV 標題行
-    csv_content.append("Project,TO_Summary_Field,TO_Summary_Value,Source_File,Original_Field,Original_Value")
+    state = load_incremental_state(state_path, options)
+    previous_records = []
+    output_format = options.get("output_format", "json")
+    if (state is not None and to_summary_output_path(output_format).exists()
+            and field_mapping_csv_path(options.get("gzip_mapping", False)).exists()):
+        previous_records = load_to_summary_output(output_format)
+        if len(previous_records) != len(state["projects"]):
+            state = None
+    else:
+        state = None
+    
+    if state is None:
+        print("沒有可用的增量狀態，將完整重建")
+        previous = []
+    else:
+        previous = state["projects"]
+    
+    # 找出指紋有變動或新增的項目，只重新計算這些項目
+    changed = [
+        (i, project_name)
+        for i, (project_name, fingerprint) in enumerate(zip(projects, fingerprints))
+        if i >= len(previous) or previous[i]["fingerprint"] != fingerprint
+    ]
+    rebuilt_results = dict(zip(
+        (i for i, _ in changed),
+        build_to_summary_records(changed, domain_index, it_supplemental_data, nx_supplemental_data, workers)
+    ))
+    rebuilt = len(changed)
     
-    for record in to_summary_records:
-        project_name = record['project']
-        to_summary = record['to_summary']
-        it_original = record['it_domain_original']
-        it_supplemental = record['it_domain_supplemental']
-        nx_original = record['nx_domain_original']
-        nx_supplemental = record['nx_domain_supplemental']
-        dv_task_data = it_original['data'] if it_original and it_original['source'] == 'dv_tasks.xlsx' else None
-        
-        for field in to_summary_fields:
-            to_value = to_summary.get(field, "")
-            source_file = ""
-            original_field = ""
-            original_value = ""
-
-            # 來源邏輯與 summary 產生時一致
-            if field == "Index":
-                if dv_task_data and "Index" in dv_task_data:
-                    source_file = "it_domain_dv_tasks.json"
-                    original_field = "Index"
-                    original_value = str(dv_task_data.get("Index", ""))
-                else:
-                    source_file = "預設值/計算值"
-                    original_field = "N/A"
-                    original_value = "N/A"
-            elif field == "SPIP_IP":
-                # 專門從 allproject 資料中取得 SPIP_IP
-                allproject_item = None
-                for item in it_allproject_data:
-                    if item['data'].get('Project') == project_name:
-                        allproject_item = item
-                        break
-                
-                if allproject_item and "IP" in allproject_item['data']:
-                    source_file = "it_domain_allproject.json"
-                    original_field = "IP"
-                    original_value = str(allproject_item['data'].get("IP", ""))
-                else:
-                    source_file = "預設值/計算值"
-                    original_field = "N/A"
-                    original_value = "N/A"
-            elif field == "DD":
-                if dv_task_data and "DD" in dv_task_data and dv_task_data.get("DD", ""):
-                    source_file = "it_domain_dv_tasks.json"
-                    original_field = "DD"
-                    original_value = str(dv_task_data.get("DD", ""))
-                else:
-                    source_file = "預設值/計算值"
-                    original_field = "N/A"
-                    original_value = "N/A"
-            elif field == "BU":
-                if dv_task_data and "BU" in dv_task_data and dv_task_data.get("BU"):
-                    source_file = "it_domain_dv_tasks.json"
-                    original_field = "BU"
-                    original_value = str(dv_task_data.get("BU", ""))
-                else:
-                    source_file = "預設值/計算值"
-                    original_field = "N/A"
-                    original_value = "N/A"
-            elif field == "IP Postfix":
-                if it_supplemental and "IP Postfix" in it_supplemental["data"]:
-                    source_file = it_supplemental["source"].split("/")[-1]
-                    original_field = "IP Postfix"
-                    original_value = str(it_supplemental["data"].get("IP Postfix", ""))
-                else:
-                    source_file = "預設值/計算值"
-                    original_field = "N/A"
-                    original_value = "N/A"
-            elif field == "Coverage Report Path":
-                if nx_supplemental and "Coverage Report Path" in nx_supplemental["data"]:
-                    source_file = nx_supplemental["source"].split("/")[-1]
-                    original_field = "Coverage Report Path"
-                    original_value = str(nx_supplemental["data"].get("Coverage Report Path", ""))
-                else:
-                    source_file = "預設值/計算值"
-                    original_field = "N/A"
-                    original_value = "N/A"
-            elif field in ["sanity SVN", "sanity SVN ver", "release SVN", "release SVN ver", "git path", "git version", "golden checklist", "golden checklist version", "RTL last update timestamp", "TO report creation timestamp"]:
-                if nx_supplemental and field in nx_supplemental["data"]:
-                    source_file = nx_supplemental["source"].split("/")[-1]
-                    original_field = field
-                    original_value = str(nx_supplemental["data"].get(field, ""))
-                else:
-                    source_file = "預設值/計算值"
-                    original_field = "N/A"
-                    original_value = "N/A"
-            elif field == "TO Date":
-                if nx_supplemental and "TO Date" in nx_supplemental["data"]:
-                    source_file = nx_supplemental["source"].split("/")[-1]
-                    original_field = "TO Date"
-                    original_value = str(nx_supplemental["data"].get("TO Date", ""))
-                else:
-                    source_file = "預設值/計算值"
-                    original_field = "N/A"
-                    original_value = "N/A"
-            else:
-                # 其餘欄位維持原本優先順序
-                if it_original and field in it_original['data']:
-                    # 根據實際檔案類型顯示正確的檔案名稱
-                    if it_original['source'] == 'dv_tasks.xlsx':
-                        source_file = "it_domain_dv_tasks.json"
-                    elif it_original['source'] == 'allproject-2025-06-23-09-32-12.xlsx':
-                        source_file = "it_domain_allproject.json"
-                    else:
-                        source_file = it_original['source'].split("/")[-1]
-                    original_field = field
-                    original_value = str(it_original['data'].get(field, ""))
-                elif it_supplemental and field in it_supplemental['data']:
-                    source_file = it_supplemental["source"].split("/")[-1]
-                    original_field = field
-                    original_value = str(it_supplemental['data'].get(field, ""))
-                elif nx_original and field in nx_original['data']:
-                    source_file = nx_original['source'].split("/")[-1]
-                    original_field = field
-                    original_value = str(nx_original['data'].get(field, ""))
-                elif nx_supplemental and field in nx_supplemental['data']:
-                    source_file = nx_supplemental['source'].split("/")[-1]
-                    original_field = field
-                    original_value = str(nx_supplemental['data'].get(field, ""))
-                else:
-                    # 特殊處理某些欄位
-                    if field == "SPIP url" and it_original and "SPIP" in it_original['data']:
-                        if it_original['source'] == 'dv_tasks.xlsx':
-                            source_file = "it_domain_dv_tasks.json"
-                        else:
-                            source_file = it_original['source'].split("/")[-1]
-                        original_field = "SPIP"
-                        original_value = str(it_original['data'].get("SPIP", ""))
-                    elif field == "Wiki url" and it_original and "WIKI" in it_original['data']:
-                        if it_original['source'] == 'dv_tasks.xlsx':
-                            source_file = "it_domain_dv_tasks.json"
-                        else:
-                            source_file = it_original['source'].split("/")[-1]
-                        original_field = "WIKI"
-                        original_value = str(it_original['data'].get("WIKI", ""))
-                    elif field == "DV" and it_original and "DV" in it_original['data']:
-                        if it_original['source'] == 'dv_tasks.xlsx':
-                            source_file = "it_domain_dv_tasks.json"
-                        else:
-                            source_file = it_original['source'].split("/")[-1]
-                        original_field = "DV"
-                        original_value = str(it_original['data'].get("DV", ""))
-                    elif field == "BU" and it_original and "BU" in it_original['data']:
-                        if it_original['source'] == 'dv_tasks.xlsx':
-                            source_file = "it_domain_dv_tasks.json"
-                        else:
-                            source_file = it_original['source'].split("/")[-1]
-                        original_field = "BU"
-                        original_value = str(it_original['data'].get("BU", ""))
-                    else:
-                        source_file = "預設值/計算值"
-                        original_field = "N/A"
-                        original_value = "N/A"
-            
-            # 處理 CSV 中的特殊字符
-            def escape_csv_value(value):
-                if value is None:
-                    return ""
-                value_str = str(value)
-                if ',' in value_str or '"' in value_str or '\n' in value_str:
-                    # 如果包含逗號、引號或換行符，用雙引號包圍並轉義內部引號
-                    return '"' + value_str.replace('"', '""') + '"'
-                return value_str
-            
-            csv_line = f"{escape_csv_value(project_name)},{escape_csv_value(field)},{escape_csv_value(to_value)},{escape_csv_value(source_file)},{escape_csv_value(original_field)},{escape_csv_value(original_value)}"
-            csv_content.append(csv_line)
+    to_summary_records = []
+    mapping_rows = []
+    for i in range(len(projects)):
+        if i in rebuilt_results:
+            record, rows = rebuilt_results[i]
+        else:
+            record, rows = previous_records[i], previous[i]["mapping_rows"]
+        if shape_record is not None:
+            record = shape_record(i, projects[i], record)
+        to_summary_records.append(record)
+        mapping_rows.append(rows)
+    
+    previous_names = {str(entry["project"]) for entry in previous}
+    current_names = {str(project_name) for project_name in projects}
+    added = len(current_names - previous_names)
+    removed = len(previous_names - current_names)
+    print(f"增量更新: 重新計算 {rebuilt} 筆 (新增 {added} 筆, 移除 {removed} 筆), 沿用 {len(projects) - rebuilt} 筆")
+    
+    # 沒有重新計算時，reference 模式的列位置仍可能因其他列的增刪而改變
+    if rebuilt == 0 and to_summary_records == previous_records:
+        print("來源資料沒有變動，輸出檔案維持不變")
+        return to_summary_records
+    
+    write_to_summary_output(zip(to_summary_records, mapping_rows), output_format, options.get("gzip_mapping", False))
+    
+    state = {
+        "version": INCREMENTAL_STATE_VERSION,
+        "options": options,
+        "projects": [
+            {"project": project_name, "fingerprint": fingerprint, "mapping_rows": rows}
+            for project_name, fingerprint, rows in zip(projects, fingerprints, mapping_rows)
+        ],
+    }
+    with open(state_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False)
+    print(f"增量狀態: {state_path}")
     
-    # 保存 CSV 檔案
-    csv_path = Path("to_summary_field_mapping.csv")
-    with open(csv_path, 'w', encoding='utf-8') as csvfile:
-        csvfile.write('\n'.join(csv_content))
-    print(f"欄位對應表: {csv_path}")
+    return to_summary_records
+
+def parse_args(argv=None):
+    """解析命令列參數"""
+    parser = argparse.ArgumentParser(description="從IT Domain和NX Domain的資料整合產生TO summary")
+    parser.add_argument("--slim", action="store_true",
+                        help="只載入TO summary實際使用的欄位（輸出中內嵌的原始資料也只包含這些欄位）")
+    parser.add_argument("--incremental", action="store_true",
+                        help="依來源記錄指紋只重新計算有變動的項目，並就地更新輸出檔案")
+    parser.add_argument("--state-file", default=str(INCREMENTAL_STATE_PATH),
+                        help=f"增量模式的狀態檔路徑 (預設: {INCREMENTAL_STATE_PATH})")
+    parser.add_argument("--workers", type=int, default=1,
+                        help=f"建立記錄使用的子程序數量，0 表示使用全部CPU (本機: {os.cpu_count()})")
+    parser.add_argument("--allproject", default=str(IT_ALLPROJECT_PATH),
+                        help=f"IT Domain allproject資料，可為轉換後的JSON或原始 .xlsx (工作表 {IT_ALLPROJECT_SHEET}) (預設: {IT_ALLPROJECT_PATH})")
+    parser.add_argument("--dv-tasks", default=str(IT_DV_TASKS_PATH),
+                        help=f"IT Domain dv_tasks資料，可為轉換後的JSON或原始 .xlsx (工作表 {IT_DV_TASKS_SHEET}) (預設: {IT_DV_TASKS_PATH})")
+    parser.add_argument("--output-format", choices=OUTPUT_FORMATS, default="json",
+                        help=f"TO summary輸出格式：json 為 {TO_SUMMARY_JSON_PATH}；jsonl 為 {TO_SUMMARY_JSONL_PATH}，每行一筆記錄，邊產生邊寫出")
+    parser.add_argument("--originals", choices=ORIGINALS_MODES, default="embed",
+                        help="記錄中的原始/補充資料：embed 完整內嵌；reference 只保留來源檔名與列號；omit 只輸出 to_summary")
+    parser.add_argument("--gzip-mapping", action="store_true",
+                        help=f"欄位對應表以gzip壓縮輸出 ({field_mapping_csv_path(True)})")
+    parser.add_argument("--cache", action="store_true",
+                        help="將解析並建立索引後的Domain資料快取於磁碟，來源檔案沒有變動時直接讀取")
+    parser.add_argument("--cache-dir", default=str(DOMAIN_CACHE_DIR),
+                        help=f"Domain資料快取目錄 (預設: {DOMAIN_CACHE_DIR})")
+    parser.add_argument("--cache-max-mb", type=float, default=DOMAIN_CACHE_MAX_BYTES / (1024 * 1024),
+                        help="快取目錄的大小上限 (MB)，超過時淘汰最久未使用的快取")
+    parser.add_argument("--metrics", metavar="PATH",
+                        help="將各階段耗時與計數 (索引命中/未命中、空值正規化、改用allproject等) 以JSON寫入 PATH，- 為標準輸出")
+    parser.add_argument("--profile", metavar="PATH",
+                        help="以cProfile剖析整個執行過程並將pstats檔寫入 PATH (--workers 的子程序不在剖析範圍內)")
+    return parser.parse_args(argv)
 
-def main():
+def write_metrics(path, report):
+    """將執行統計寫成JSON，path 為 - 時輸出到標準輸出 (單行)"""
+    if path == "-":
+        print(json.dumps(report, ensure_ascii=False))
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"執行統計: {path}")
+
+def main(argv=None):
     """主函數"""
+    args = parse_args(argv)
+    if not args.profile:
+        run(args)
+        return
+    
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        run(args)
+    finally:
+        profiler.disable()
+        profiler.dump_stats(args.profile)
+        print(f"效能剖析: {args.profile} (可用 python -m pstats、snakeviz 或 flameprof 檢視)")
+
+def run(args):
+    """依命令列參數產生TO summary"""
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+    reset_metrics()
+    
     print("=== 從IT Domain和NX Domain產生TO Summary ===")
     
     # 載入資料
-    it_allproject_data, it_dv_tasks_data, it_supplemental_data, nx_examples_data, nx_supplemental_data = load_domain_data()
+    with stage_timer("load"):
+        if args.cache:
+            domain_data, domain_index, _ = load_domain_data_cached(
+                args.cache_dir, slim=args.slim, it_allproject_path=args.allproject, it_dv_tasks_path=args.dv_tasks,
+                max_bytes=int(args.cache_max_mb * 1024 * 1024))
+        else:
+            domain_data = load_domain_data(slim=args.slim, it_allproject_path=args.allproject, it_dv_tasks_path=args.dv_tasks)
+            domain_index = None
+    it_allproject_data, it_dv_tasks_data, it_supplemental_data, nx_examples_data, nx_supplemental_data = domain_data
     
     print(f"載入IT Domain allproject資料: {len(it_allproject_data)} 筆")
     print(f"載入IT Domain dv_tasks資料: {len(it_dv_tasks_data)} 筆")
@@ -467,14 +895,47 @@ def main():
     print(f"載入NX Domain原始資料: {len(nx_examples_data)} 筆")
     print(f"載入NX Domain補充資料: {len(nx_supplemental_data)} 筆")
     
-    # 創建TO summary記錄
-    to_summary_records = create_to_summary_records(it_allproject_data, it_dv_tasks_data, it_supplemental_data, nx_examples_data, nx_supplemental_data)
-    
-    # 保存結果
-    save_to_summary_json(to_summary_records)
+    # 建立項目索引（只掃描一次原始資料）
+    if domain_index is None:
+        with stage_timer("index"):
+            domain_index = build_domain_index(it_allproject_data, it_dv_tasks_data, nx_examples_data)
+    
+    shape_record = make_record_shaper(args.originals, domain_data, domain_index)
+    projects = domain_index["projects"]
+    
+    if args.incremental:
+        # 只重新計算來源有變動的項目
+        options = {"slim": args.slim, "gzip_mapping": args.gzip_mapping,
+                   "output_format": args.output_format, "originals": args.originals}
+        with stage_timer("build_and_write"):
+            to_summary_records = regenerate_to_summary_incrementally(
+                it_supplemental_data, nx_supplemental_data, domain_index, options, args.state_file, workers, shape_record)
+        record_count = len(to_summary_records)
+    else:
+        # 創建TO summary記錄
+        print(f"找到的項目: {projects}")
+        results = iter_to_summary_records(enumerate(projects), domain_index, it_supplemental_data, nx_supplemental_data, workers)
+        results = (
+            (shape_record(i, project_name, record), rows)
+            for (i, project_name), (record, rows) in zip(enumerate(projects), results)
+        )
+        
+        if args.output_format == "jsonl":
+            # 邊產生邊寫出，不保留整份輸出
+            to_summary_records = []
+            with stage_timer("build_and_write"):
+                record_count = write_to_summary_output(results, "jsonl", args.gzip_mapping)
+        else:
+            with stage_timer("build"):
+                results = list(results)
+            to_summary_records = [record for record, _ in results]
+            
+            # 保存結果
+            with stage_timer("write"):
+                record_count = write_to_summary_output(results, "json", args.gzip_mapping)
     
     print(f"\n=== 完成 ===")
-    print(f"已產生 {len(to_summary_records)} 筆TO Summary記錄")
+    print(f"已產生 {record_count} 筆TO Summary記錄")
     
     # 顯示記錄摘要
     for i, record in enumerate(to_summary_records):
@@ -492,10 +953,15 @@ def main():
         print(f"  Git Version: {to_summary.get('git version', 'N/A')} (來自NX Domain)")
         
         # 顯示原始資料來源
-        if record['it_domain_original']:
+        if record.get('it_domain_original'):
             print(f"  IT Domain原始資料: {record['it_domain_original']['source']}")
-        if record['nx_domain_original']:
+        if record.get('nx_domain_original'):
             print(f"  NX Domain原始資料: {record['nx_domain_original']['source']}")
+    
+    if args.metrics:
+        write_metrics(args.metrics, metrics_report(
+            records=record_count, projects=len(projects), workers=workers,
+            incremental=args.incremental, output_format=args.output_format))
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""將產生的TO summary記錄批次寫入 nx_domain_db 的資料表
+coverage_reports / version_control / imported_it_data (見 app/database/schemas/nx-domain-schema-new.sql)
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+from pathlib import Path
+
+from generate_to_summary_from_domains import TO_SUMMARY_JSON_PATH, iter_json_array
+
+# 與 refresh_to_summary.py / export_to_summary.py 共用連線設定
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "maintenance"))
+from refresh_to_summary import connect
+
+# 資料表欄位 → (TO summary欄位, 值的型別)
+COVERAGE_REPORTS_COLUMNS = {
+    "line_coverage": ("Line Coverage", "decimal"),
+    "fsm_coverage": ("FSM Coverage", "decimal"),
+    "interface_toggle_coverage": ("Interface Toggle Coverage", "decimal"),
+    "toggle_coverage": ("Toggle Coverage", "decimal"),
+    "coverage_report_path": ("Coverage Report Path", "text"),
+    "to_date": ("TO Date", "date"),
+    "rtl_last_update": ("RTL last update timestamp", "timestamp"),
+    "to_report_creation": ("TO report creation timestamp", "timestamp"),
+}
+
+VERSION_CONTROL_COLUMNS = {
+    "sanity_svn": ("sanity SVN", "text"),
+    "sanity_svn_ver": ("sanity SVN ver", "text"),
+    "release_svn": ("release SVN", "text"),
+    "release_svn_ver": ("release SVN ver", "text"),
+    "git_path": ("git path", "text"),
+    "git_version": ("git version", "text"),
+    "golden_checklist": ("golden checklist", "text"),
+    "golden_checklist_version": ("golden checklist version", "text"),
+}
+
+IMPORTED_IT_DATA_COLUMNS = {
+    "task_index": ("Index", "text"),
+    "spip_ip": ("SPIP_IP", "text"),
+    "ip": ("IP", "text"),
+    "ip_postfix": ("IP Postfix", "text"),
+    "ip_subtype": ("IP Subtype", "text"),
+    "alternative_name": ("Alternative Name", "text"),
+    "dv_engineer": ("DV", "text"),
+    "digital_designer": ("DD", "text"),
+    "business_unit": ("BU", "text"),
+    "analog_designer": ("AD", "text"),
+    "inherit_from_ip": ("Inherit from IP", "text"),
+    "reuse_ip": ("re-use IP", "text"),
+    "spip_url": ("SPIP url", "text"),
+    "wiki_url": ("Wiki url", "text"),
+    "spec_version": ("spec version", "text"),
+    "spec_path": ("spec path", "text"),
+}
+
+# coverage_reports / version_control 以唯一的 project_name 做 upsert；
+# imported_it_data 的 project_name 沒有唯一鍵，改為在同一交易中先刪除該批項目的舊資料再寫入
+TABLES = {
+    "coverage_reports": COVERAGE_REPORTS_COLUMNS,
+    "version_control": VERSION_CONTROL_COLUMNS,
+    "imported_it_data": IMPORTED_IT_DATA_COLUMNS,
+}
+UPSERT_TABLES = ("coverage_reports", "version_control")
+
+DIALECTS = {
+    "sqlite": {
+        "placeholder": "?",
+        "upsert": "ON CONFLICT(project_name) DO UPDATE SET {assignments}, updated_at = CURRENT_TIMESTAMP",
+        "assignment": "{column} = excluded.{column}",
+    },
+    "mysql": {
+        # updated_at 由 ON UPDATE CURRENT_TIMESTAMP 自動更新
+        "placeholder": "%s",
+        "upsert": "ON DUPLICATE KEY UPDATE {assignments}",
+        "assignment": "{column} = VALUES({column})",
+    },
+}
+
+DEFAULT_BATCH_SIZE = 500
+
+def is_missing(value):
+    """None、NaN、NaT 與空字串視為沒有值"""
+    return value is None or value == "" or value == "NaT" or (isinstance(value, float) and math.isnan(value))
+
+def convert_value(value, kind):
+    """將TO summary的值轉為資料表欄位的值，無法轉換時為NULL"""
+
+    if kind == "text":
+        if value is None or value == "NaT" or (isinstance(value, float) and math.isnan(value)):
+            return None
+        return str(value)
+
+    if is_missing(value):
+        return None
+    if kind == "decimal":
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            return None
+        return None if math.isnan(number) else number
+
+    value = str(value)
+    if kind == "date":
+        return value[:10]
+    return value[:19]
+
+def record_table_rows(record):
+    """單筆記錄在各資料表的資料列 (project_name, 欄位值...)；NX資料表沒有任何值時不寫入"""
+
+    to_summary = record["to_summary"]
+    project_name = to_summary.get("Project") or record.get("project")
+    if is_missing(project_name):
+        return None
+
+    rows = {}
+    for table, columns in TABLES.items():
+        values = tuple(convert_value(to_summary.get(field), kind) for field, kind in columns.values())
+        if table in UPSERT_TABLES and all(value is None or value == "" for value in values):
+            continue
+        rows[table] = (str(project_name),) + values
+    return rows
+
+def build_statements(dialect):
+    """各資料表的寫入SQL"""
+
+    spec = DIALECTS[dialect]
+    statements = {}
+    for table, columns in TABLES.items():
+        names = ["project_name", *columns]
+        placeholders = ", ".join([spec["placeholder"]] * len(names))
+        sql = f"INSERT INTO {table} ({', '.join(names)}) VALUES ({placeholders})"
+        if table in UPSERT_TABLES:
+            assignments = ", ".join(spec["assignment"].format(column=column) for column in columns)
+            sql += " " + spec["upsert"].format(assignments=assignments)
+        statements[table] = sql
+    return statements
+
+def write_batch(conn, statements, dialect, batch):
+    """在單一交易中寫入一批記錄的資料列"""
+
+    placeholder = DIALECTS[dialect]["placeholder"]
+    cursor = conn.cursor()
+    try:
+        it_rows = [rows["imported_it_data"] for rows in batch]
+        projects = [row[0] for row in it_rows]
+        cursor.execute(
+            f"DELETE FROM imported_it_data WHERE project_name IN ({', '.join([placeholder] * len(projects))})",
+            projects,
+        )
+        for table in TABLES:
+            table_rows = [rows[table] for rows in batch if table in rows]
+            if table_rows:
+                cursor.executemany(statements[table], table_rows)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+def load_to_summary_records(conn, records, dialect="sqlite", batch_size=DEFAULT_BATCH_SIZE):
+    """將TO summary記錄分批寫入資料庫，每批一個交易，返回統計資料
+
+    某一批違反資料表限制 (如 CHECK) 時回滾該批，再逐筆寫入以找出有問題的記錄，其餘記錄照常寫入。
+    """
+
+    statements = build_statements(dialect)
+    stats = {"records": 0, "skipped": 0, "rejected": 0, "batches": 0, "errors": [],
+             "rows": {table: 0 for table in TABLES}}
+    started = time.perf_counter()
+
+    def flush(batch):
+        try:
+            write_batch(conn, statements, dialect, batch)
+            written = batch
+        except Exception as e:
+            if len(batch) == 1:
+                stats["rejected"] += 1
+                stats["errors"].append(f"{batch[0]['imported_it_data'][0]}: {e}")
+                return
+            written = []
+            for rows in batch:
+                try:
+                    write_batch(conn, statements, dialect, [rows])
+                    written.append(rows)
+                except Exception as row_error:
+                    stats["rejected"] += 1
+                    stats["errors"].append(f"{rows['imported_it_data'][0]}: {row_error}")
+        if written:
+            stats["batches"] += 1
+        stats["records"] += len(written)
+        for rows in written:
+            for table in rows:
+                stats["rows"][table] += 1
+
+    batch = []
+    for record in records:
+        rows = record_table_rows(record)
+        if rows is None:
+            stats["skipped"] += 1
+            continue
+        batch.append(rows)
+        if len(batch) >= batch_size:
+            flush(batch)
+            batch = []
+    if batch:
+        flush(batch)
+
+    stats["elapsed"] = time.perf_counter() - started
+    stats["records_per_second"] = stats["records"] / stats["elapsed"] if stats["elapsed"] > 0 else 0.0
+    return stats
+
+def iter_output_records(path):
+    """逐筆讀取產生器輸出的TO summary記錄 (.json 陣列或 .jsonl)"""
+
+    path = Path(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.suffix == ".jsonl":
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from iter_json_array(f)
+
+def print_report(stats):
+    """顯示寫入統計"""
+    print(f"寫入記錄: {stats['records']} 筆 ({stats['batches']} 批)")
+    for table, count in stats["rows"].items():
+        print(f"  {table}: {count} 筆")
+    if stats["skipped"]:
+        print(f"略過沒有項目名稱的記錄: {stats['skipped']} 筆")
+    if stats["rejected"]:
+        print(f"違反資料表限制而未寫入: {stats['rejected']} 筆")
+        for error in stats["errors"][:10]:
+            print(f"  {error}")
+    print(f"耗時: {stats['elapsed']:.2f} 秒, {stats['records_per_second']:.0f} 筆/秒")
+
+def parse_args(argv=None):
+    """解析命令列參數"""
+    parser = argparse.ArgumentParser(description="將TO summary記錄批次寫入 nx_domain_db")
+    parser.add_argument("input", nargs="?", default=str(TO_SUMMARY_JSON_PATH),
+                        help=f"TO summary記錄檔 (.json 或 .jsonl，預設: {TO_SUMMARY_JSON_PATH})")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--sqlite", help="寫入已建立 nx_domain_db 資料表的SQLite資料庫檔案")
+    target.add_argument("--mysql", action="store_true",
+                        help="寫入MySQL (連線設定取自 DB_HOST/DB_NAME/DB_USER/DB_PASS 環境變數，需要 pymysql)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"每個交易寫入的記錄數 (預設: {DEFAULT_BATCH_SIZE})")
+    args = parser.parse_args(argv)
+    if args.batch_size < 1:
+        parser.error("--batch-size 必須大於0")
+    return args
+
+def main(argv=None):
+    """主函數"""
+    args = parse_args(argv)
+
+    print("=== 寫入TO Summary記錄到 nx_domain_db ===")
+    conn = connect(args)
+    try:
+        stats = load_to_summary_records(conn, iter_output_records(args.input),
+                                        "mysql" if args.mysql else "sqlite", args.batch_size)
+    finally:
+        conn.close()
+    print_report(stats)
+
+if __name__ == "__main__":
+    main()
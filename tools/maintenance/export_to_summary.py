@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+TO Summary Export Service
+Streams the TO summary as CSV, JSON Lines or XML without loading it whole,
+and serves a cursor-paged JSON API for the dashboard.
+
+Rows are read in pages ordered by project (keyset pagination: each page
+starts after the last project of the previous one), so memory per request
+is bounded by the page size however many projects there are. Like
+getTOSummaryRows() in app/domains/nx-domain/includes/functions-new.php,
+to_summary_materialized is read once it has been refreshed, otherwise
+to_summary_view.
+
+Endpoints:
+    GET /export?format=csv|jsonl|xml[&page_size=N]   chunked download
+    GET /api/to-summary[?cursor=...][&limit=N]        {"rows", "next_cursor", "source"}
+"""
+
+import argparse
+import base64
+import binascii
+import csv
+import io
+import json
+import sys
+from datetime import date, datetime
+from decimal import Decimal
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from xml.sax.saxutils import escape as xml_escape
+
+from refresh_to_summary import SUMMARY_COLUMNS, connect
+
+DEFAULT_PAGE_SIZE = 1000
+DEFAULT_API_LIMIT = 100
+MAX_PAGE_SIZE = 5000
+
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=UTF-8",
+    "jsonl": "application/x-ndjson",
+    "xml": "application/xml",
+}
+
+SOURCES = {
+    "materialized": f"SELECT {', '.join(SUMMARY_COLUMNS)} FROM to_summary_materialized",
+    "view": f"SELECT {', '.join(SUMMARY_COLUMNS)} FROM to_summary_view",
+}
+
+def print_status(message):
+    print(f"\033[0;32m[INFO]\033[0m {message}")
+
+def print_warning(message):
+    print(f"\033[1;33m[WARNING]\033[0m {message}")
+
+def print_error(message):
+    print(f"\033[0;31m[ERROR]\033[0m {message}")
+
+def print_step(message):
+    print(f"\033[0;34m[STEP]\033[0m {message}")
+
+def summary_source(cursor):
+    """'materialized' once the refresh job has run, else 'view'"""
+    cursor.execute("SELECT COUNT(*) FROM to_summary_refresh_state")
+    return "materialized" if cursor.fetchone()[0] else "view"
+
+def begin_snapshot(conn, dialect):
+    """Start a read transaction so every page of one export sees the same data"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute("START TRANSACTION WITH CONSISTENT SNAPSHOT" if dialect == "mysql" else "BEGIN")
+    finally:
+        cursor.close()
+
+def fetch_page(conn, source, placeholder, after=None, limit=DEFAULT_PAGE_SIZE):
+    """Rows of the projects after `after`, and the cursor for the next page (None at the end)
+
+    A project can have several rows (imported_it_data.project_name is not
+    unique), so a page never ends in the middle of a project: when the limit
+    cuts one, the rest of its rows are fetched too.
+    """
+    select = SOURCES[source]
+    where, params = (f" WHERE project > {placeholder}", [after]) if after is not None else ("", [])
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"{select}{where} ORDER BY project LIMIT {limit + 1}", params)
+        rows = [dict(zip(SUMMARY_COLUMNS, row)) for row in cursor.fetchall()]
+        if len(rows) <= limit:
+            return rows, None
+
+        rows.pop()
+        last = rows[-1]["project"]
+        while rows and rows[-1]["project"] == last:
+            rows.pop()
+        cursor.execute(f"{select} WHERE project = {placeholder}", [last])
+        rows.extend(dict(zip(SUMMARY_COLUMNS, row)) for row in cursor.fetchall())
+        return rows, last
+    finally:
+        cursor.close()
+
+def iter_pages(conn, dialect="sqlite", page_size=DEFAULT_PAGE_SIZE):
+    """Every TO summary row, one page at a time, from a single read snapshot"""
+    placeholder = "%s" if dialect == "mysql" else "?"
+    begin_snapshot(conn, dialect)
+    try:
+        cursor = conn.cursor()
+        try:
+            source = summary_source(cursor)
+        finally:
+            cursor.close()
+        after = None
+        while True:
+            rows, after = fetch_page(conn, source, placeholder, after, page_size)
+            if rows:
+                yield rows
+            if after is None:
+                return
+    finally:
+        conn.rollback()
+
+def text(value):
+    """Values as PHP prints them: NULL as '', dates as 'YYYY-MM-DD HH:MM:SS'"""
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    return str(value)
+
+def json_value(value):
+    if isinstance(value, (date, Decimal)):
+        return text(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+def encode_csv(rows, first):
+    output = io.StringIO()
+    writer = csv.writer(output, lineterminator="\n")
+    if first:
+        writer.writerow(SUMMARY_COLUMNS)
+    writer.writerows([text(row[column]) for column in SUMMARY_COLUMNS] for row in rows)
+    return output.getvalue()
+
+def encode_jsonl(rows, first):
+    return "".join(json.dumps(row, default=json_value) + "\n" for row in rows)
+
+def encode_xml(rows, first):
+    projects = "".join(
+        "<project>" + "".join(f"<{key}>{xml_escape(text(value))}</{key}>" for key, value in row.items()) + "</project>"
+        for row in rows
+    )
+    return ('<?xml version="1.0"?>\n<to_summary_report>' if first else "") + projects
+
+ENCODERS = {"csv": encode_csv, "jsonl": encode_jsonl, "xml": encode_xml}
+
+def iter_export(conn, export_format, dialect="sqlite", page_size=DEFAULT_PAGE_SIZE):
+    """The export as a sequence of strings, one per page
+
+    CSV without rows is empty and has no header, as generateCSVReport() returns ''.
+    """
+    encode = ENCODERS[export_format]
+    first = True
+    for rows in iter_pages(conn, dialect, page_size):
+        yield encode(rows, first)
+        first = False
+    if export_format == "xml":
+        yield ('<?xml version="1.0"?>\n<to_summary_report>' if first else "") + "</to_summary_report>\n"
+
+def encode_cursor(project):
+    return base64.urlsafe_b64encode(json.dumps({"after": project}).encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(token):
+    """The project a cursor points after; ValueError for a malformed cursor"""
+    try:
+        data = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(data, dict) or not isinstance(data.get("after"), str):
+        raise ValueError("Invalid cursor")
+    return data["after"]
+
+def api_page(conn, dialect="sqlite", cursor=None, limit=DEFAULT_API_LIMIT):
+    """One page of the dashboard API: {'rows', 'next_cursor', 'source'}"""
+    placeholder = "%s" if dialect == "mysql" else "?"
+    after = decode_cursor(cursor) if cursor else None
+    db_cursor = conn.cursor()
+    try:
+        source = summary_source(db_cursor)
+    finally:
+        db_cursor.close()
+    rows, last = fetch_page(conn, source, placeholder, after, limit)
+    conn.rollback()
+    return {"rows": rows, "next_cursor": encode_cursor(last) if last is not None else None, "source": source}
+
+def int_param(query, name, default):
+    """A positive integer query parameter, capped at MAX_PAGE_SIZE"""
+    value = query.get(name, [str(default)])[0]
+    if not value.isdigit() or int(value) == 0:
+        raise ValueError(f"{name} must be a positive integer")
+    return min(int(value), MAX_PAGE_SIZE)
+
+class ExportHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "TOSummaryExport/1.0"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        try:
+            if url.path == "/export":
+                export_format = query.get("format", ["csv"])[0]
+                if export_format not in EXPORT_FORMATS:
+                    raise ValueError(f"Unsupported format: {export_format}")
+                self.stream_export(export_format, int_param(query, "page_size", DEFAULT_PAGE_SIZE))
+            elif url.path == "/api/to-summary":
+                limit = int_param(query, "limit", DEFAULT_API_LIMIT)
+                conn = self.server.connect()
+                try:
+                    page = api_page(conn, self.server.dialect, query.get("cursor", [None])[0], limit)
+                finally:
+                    conn.close()
+                self.send_json(HTTPStatus.OK, {"success": True, **page})
+            else:
+                self.send_json(HTTPStatus.NOT_FOUND, {"success": False, "error": "Not found"})
+        except ValueError as e:
+            self.send_json(HTTPStatus.BAD_REQUEST, {"success": False, "error": str(e)})
+
+    def send_json(self, status, data):
+        body = json.dumps(data, default=json_value).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def stream_export(self, export_format, page_size):
+        conn = self.server.connect()
+        try:
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-Type", EXPORT_FORMATS[export_format])
+            self.send_header("Content-Disposition", f'attachment; filename="to_summary.{export_format}"')
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            try:
+                for chunk in iter_export(conn, export_format, self.server.dialect, page_size):
+                    data = chunk.encode("utf-8")
+                    if data:
+                        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+                self.wfile.write(b"0\r\n\r\n")
+            except (BrokenPipeError, ConnectionResetError):
+                self.close_connection = True
+            except Exception as e:
+                # Headers are gone; cutting the stream without the last chunk tells the client it failed
+                self.log_error("Export failed: %s", e)
+                self.close_connection = True
+        finally:
+            conn.close()
+
+class ExportServer(ThreadingHTTPServer):
+    """One thread and one database connection per request"""
+    daemon_threads = True
+
+    def __init__(self, address, connect_args, dialect):
+        super().__init__(address, ExportHandler)
+        self.connect_args = connect_args
+        self.dialect = dialect
+
+    def connect(self):
+        return connect(self.connect_args)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream the TO summary export and serve the paged dashboard API")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--sqlite", help="SQLite copy of nx_domain_db")
+    target.add_argument("--mysql", action="store_true",
+                        help="MySQL nx_domain_db (DB_HOST/DB_NAME/DB_USER/DB_PASS, requires pymysql)")
+    parser.add_argument("--output", help="Write one export to this file ('-' for stdout) instead of serving")
+    parser.add_argument("--format", choices=sorted(EXPORT_FORMATS), default="csv", help="Format for --output")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE,
+                        help=f"Rows read per query (default: {DEFAULT_PAGE_SIZE})")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=8082, help="Port to listen on")
+    args = parser.parse_args(argv)
+    if args.page_size < 1:
+        parser.error("--page-size must be at least 1")
+    dialect = "mysql" if args.mysql else "sqlite"
+
+    if args.output:
+        if args.output != "-":
+            print_step(f"Exporting the TO summary as {args.format}")
+        conn = connect(args)
+        output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+        try:
+            for chunk in iter_export(conn, args.format, dialect, args.page_size):
+                output.write(chunk)
+        except Exception as e:
+            print_error(f"Export failed: {e}")
+            sys.exit(1)
+        finally:
+            conn.close()
+            if output is not sys.stdout:
+                output.close()
+        if args.output != "-":
+            print_status(f"✅ Wrote {args.output}")
+        return
+
+    server = ExportServer((args.host, args.port), args, dialect)
+    print_status(f"Serving /export and /api/to-summary on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+TO Summary Refresh Job
+Keeps to_summary_materialized in sync with to_summary_view
+(app/database/schemas/nx-domain-schema-new.sql).
+
+Only projects whose source rows changed since the last refresh are
+recomputed, found by the updated_at column of each source table. Projects
+whose source rows were deleted are found through the has_* flags stored
+with each materialized row: imported_it_data.project_name is not unique,
+so its rows are counted per project, which also catches a project losing
+only some of its rows.
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+
+# The 33 to_summary_view columns, in view order
+SUMMARY_COLUMNS = (
+    "task_index", "project", "spip_ip", "ip", "ip_postfix", "ip_subtype", "alternative_name",
+    "line_coverage", "fsm_coverage", "interface_toggle_coverage", "toggle_coverage", "coverage_report_path",
+    "dv_engineer", "digital_designer", "business_unit",
+    "sanity_svn", "sanity_svn_ver", "release_svn", "release_svn_ver", "git_path", "git_version",
+    "golden_checklist", "golden_checklist_version",
+    "to_date", "rtl_last_update", "to_report_creation",
+    "spip_url", "wiki_url", "spec_version", "spec_path",
+    "analog_designer", "inherit_from_ip", "reuse_ip",
+)
+FLAG_COLUMNS = ("has_it_data", "has_coverage", "has_version_control")
+
+# Same two branches as to_summary_view, reading the base tables directly so the
+# project filter is applied before the joins instead of on the whole view
+SUMMARY_SELECT_SQL = """
+SELECT
+    it.task_index, it.project_name, it.spip_ip, it.ip, it.ip_postfix, it.ip_subtype, it.alternative_name,
+    cr.line_coverage, cr.fsm_coverage, cr.interface_toggle_coverage, cr.toggle_coverage, cr.coverage_report_path,
+    it.dv_engineer, it.digital_designer, it.business_unit,
+    vc.sanity_svn, vc.sanity_svn_ver, vc.release_svn, vc.release_svn_ver, vc.git_path, vc.git_version,
+    vc.golden_checklist, vc.golden_checklist_version,
+    cr.to_date, cr.rtl_last_update, cr.to_report_creation,
+    it.spip_url, it.wiki_url, it.spec_version, it.spec_path,
+    it.analog_designer, it.inherit_from_ip, it.reuse_ip,
+    1, CASE WHEN cr.id IS NULL THEN 0 ELSE 1 END, CASE WHEN vc.id IS NULL THEN 0 ELSE 1 END
+FROM imported_it_data it
+LEFT JOIN coverage_reports cr ON it.project_name = cr.project_name
+LEFT JOIN version_control vc ON it.project_name = vc.project_name
+{it_filter}
+UNION ALL
+SELECT
+    NULL, cr.project_name, NULL, NULL, NULL, NULL, NULL,
+    cr.line_coverage, cr.fsm_coverage, cr.interface_toggle_coverage, cr.toggle_coverage, cr.coverage_report_path,
+    NULL, NULL, NULL,
+    vc.sanity_svn, vc.sanity_svn_ver, vc.release_svn, vc.release_svn_ver, vc.git_path, vc.git_version,
+    vc.golden_checklist, vc.golden_checklist_version,
+    cr.to_date, cr.rtl_last_update, cr.to_report_creation,
+    NULL, NULL, NULL, NULL,
+    NULL, NULL, NULL,
+    0, 1, CASE WHEN vc.id IS NULL THEN 0 ELSE 1 END
+FROM coverage_reports cr
+LEFT JOIN version_control vc ON cr.project_name = vc.project_name
+WHERE NOT EXISTS (SELECT 1 FROM imported_it_data it WHERE it.project_name = cr.project_name)
+{coverage_filter}
+"""
+
+INSERT_SQL = (
+    f"INSERT INTO to_summary_materialized ({', '.join(SUMMARY_COLUMNS + FLAG_COLUMNS)}) "
+    + SUMMARY_SELECT_SQL
+)
+
+# Source table -> change timestamp column
+WATERMARK_COLUMNS = {
+    "imported_it_data": "updated_at",
+    "coverage_reports": "updated_at",
+    "version_control": "updated_at",
+}
+
+# Projects whose recorded source rows no longer all exist. coverage_reports and
+# version_control are unique per project, so each imported_it_data row of a
+# project gives exactly one materialized row with has_it_data = 1.
+STALE_PROJECTS_SQL = """
+SELECT m.project FROM to_summary_materialized m
+GROUP BY m.project
+HAVING SUM(m.has_it_data) <> (SELECT COUNT(*) FROM imported_it_data it WHERE it.project_name = m.project)
+   OR (MAX(m.has_coverage) = 1 AND NOT EXISTS (SELECT 1 FROM coverage_reports cr WHERE cr.project_name = m.project))
+   OR (MAX(m.has_version_control) = 1 AND NOT EXISTS (SELECT 1 FROM version_control vc WHERE vc.project_name = m.project))
+"""
+
+DEFAULT_BATCH_SIZE = 500
+
+def print_status(message):
+    print(f"\033[0;32m[INFO]\033[0m {message}")
+
+def print_warning(message):
+    print(f"\033[1;33m[WARNING]\033[0m {message}")
+
+def print_error(message):
+    print(f"\033[0;31m[ERROR]\033[0m {message}")
+
+def print_step(message):
+    print(f"\033[0;34m[STEP]\033[0m {message}")
+
+def read_watermarks(cursor):
+    """Latest change timestamp of each source table, plus the database clock they were read at"""
+    watermarks = {}
+    for table, column in WATERMARK_COLUMNS.items():
+        cursor.execute(f"SELECT MAX({column}) FROM {table}")
+        watermarks[table] = cursor.fetchone()[0]
+    cursor.execute("SELECT CURRENT_TIMESTAMP")
+    watermarks["refreshed_at"] = cursor.fetchone()[0]
+    return watermarks
+
+def read_refresh_state(cursor):
+    """Watermarks stored by the previous refresh, or None if never refreshed"""
+    cursor.execute(
+        "SELECT imported_it_data_watermark, coverage_reports_watermark, version_control_watermark, refreshed_at "
+        "FROM to_summary_refresh_state WHERE id = 1"
+    )
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    return dict(zip((*WATERMARK_COLUMNS, "refreshed_at"), row))
+
+def write_refresh_state(cursor, watermarks, placeholder):
+    cursor.execute("DELETE FROM to_summary_refresh_state WHERE id = 1")
+    cursor.execute(
+        "INSERT INTO to_summary_refresh_state "
+        "(id, imported_it_data_watermark, coverage_reports_watermark, version_control_watermark, refreshed_at) "
+        f"VALUES (1, {placeholder}, {placeholder}, {placeholder}, {placeholder})",
+        [watermarks[table] for table in (*WATERMARK_COLUMNS, "refreshed_at")],
+    )
+
+def changed_projects(cursor, previous, placeholder):
+    """Projects with source rows changed after the previous watermarks
+
+    Timestamps have one-second resolution. When a watermark fell in the same
+    second the previous refresh ran, more rows may have arrived in that second
+    after it was read, so rows from the watermark second are included again.
+    """
+    projects = set()
+    for table, column in WATERMARK_COLUMNS.items():
+        watermark = previous[table]
+        if watermark is None:
+            cursor.execute(f"SELECT DISTINCT project_name FROM {table}")
+        else:
+            operator = ">=" if watermark >= previous["refreshed_at"] else ">"
+            cursor.execute(f"SELECT DISTINCT project_name FROM {table} WHERE {column} {operator} {placeholder}", [watermark])
+        projects.update(row[0] for row in cursor.fetchall())
+    return projects
+
+def refresh_projects(conn, projects, placeholder, batch_size=DEFAULT_BATCH_SIZE):
+    """Recompute the materialized rows of the given projects, one transaction per batch"""
+    projects = sorted(projects)
+    cursor = conn.cursor()
+    try:
+        for start in range(0, len(projects), batch_size):
+            batch = projects[start:start + batch_size]
+            in_list = ", ".join([placeholder] * len(batch))
+            cursor.execute(f"DELETE FROM to_summary_materialized WHERE project IN ({in_list})", batch)
+            cursor.execute(
+                INSERT_SQL.format(
+                    it_filter=f"WHERE it.project_name IN ({in_list})",
+                    coverage_filter=f"AND cr.project_name IN ({in_list})",
+                ),
+                batch + batch,
+            )
+            conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+def refresh_to_summary(conn, dialect="sqlite", full=False, batch_size=DEFAULT_BATCH_SIZE):
+    """Bring to_summary_materialized up to date and return refresh statistics
+
+    Without a previous refresh (or with full=True) the table is rebuilt from scratch.
+    """
+    placeholder = "%s" if dialect == "mysql" else "?"
+    started = time.perf_counter()
+    cursor = conn.cursor()
+    try:
+        watermarks = read_watermarks(cursor)
+        previous = None if full else read_refresh_state(cursor)
+
+        if previous is None:
+            cursor.execute("DELETE FROM to_summary_materialized")
+            cursor.execute(INSERT_SQL.format(it_filter="", coverage_filter=""))
+            write_refresh_state(cursor, watermarks, placeholder)
+            conn.commit()
+            cursor.execute("SELECT COUNT(DISTINCT project) FROM to_summary_materialized")
+            return {"mode": "full", "projects": cursor.fetchone()[0], "elapsed": time.perf_counter() - started}
+
+        projects = changed_projects(cursor, previous, placeholder)
+        cursor.execute(STALE_PROJECTS_SQL)
+        stale = {row[0] for row in cursor.fetchall()}
+    finally:
+        cursor.close()
+
+    refresh_projects(conn, projects | stale, placeholder, batch_size)
+
+    cursor = conn.cursor()
+    try:
+        write_refresh_state(cursor, watermarks, placeholder)
+        conn.commit()
+    finally:
+        cursor.close()
+    return {"mode": "incremental", "projects": len(projects | stale), "stale": len(stale - projects),
+            "elapsed": time.perf_counter() - started}
+
+def connect(args):
+    """Connect to SQLite or MySQL according to the command line"""
+    if args.mysql:
+        # Same environment variables as app/domains/nx-domain/config/database.php
+        import pymysql
+        return pymysql.connect(
+            host=os.environ.get("DB_HOST", "nx-domain-db"),
+            database=os.environ.get("DB_NAME", "nx_domain_db"),
+            user=os.environ.get("DB_USER", "nx_user"),
+            password=os.environ.get("DB_PASS", "nx_password"),
+            charset="utf8mb4",
+            autocommit=False,
+        )
+    return sqlite3.connect(args.sqlite)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Refresh the materialized TO summary table")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--sqlite", help="SQLite copy of nx_domain_db")
+    target.add_argument("--mysql", action="store_true",
+                        help="MySQL nx_domain_db (DB_HOST/DB_NAME/DB_USER/DB_PASS, requires pymysql)")
+    parser.add_argument("--full", action="store_true", help="Rebuild the whole table instead of changed projects only")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"Projects recomputed per transaction (default: {DEFAULT_BATCH_SIZE})")
+    args = parser.parse_args(argv)
+
+    print_step("Refreshing to_summary_materialized")
+    conn = connect(args)
+    try:
+        stats = refresh_to_summary(conn, "mysql" if args.mysql else "sqlite", args.full, args.batch_size)
+    except Exception as e:
+        print_error(f"Refresh failed: {e}")
+        sys.exit(1)
+    finally:
+        conn.close()
+
+    if stats["mode"] == "full":
+        print_status(f"✅ Full rebuild: {stats['projects']} projects in {stats['elapsed']:.2f}s")
+    else:
+        print_status(f"✅ Incremental refresh: {stats['projects']} projects recomputed "
+                     f"({stats['stale']} with deleted source rows) in {stats['elapsed']:.2f}s")
+
+if __name__ == "__main__":
+    main()
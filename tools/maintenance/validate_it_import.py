@@ -0,0 +1,516 @@
+#!/usr/bin/env python3
+"""
+IT Import Pre-Validator
+Checks an IT domain CSV export against the rules of the NX tables it is
+imported into before importITData() (app/domains/nx-domain/includes/
+functions-new.php) sees it, and splits it into a clean file and a rejects
+file listing the reasons of every rejected row.
+
+The rules are built from app/database/schemas/nx-domain-schema-new.sql:
+the CHECK constraints of imported_it_data, coverage_reports and
+version_control, VARCHAR lengths and numeric columns, plus the checks
+importITData() does itself (project name present, URLs, and business unit
+and reuse IP values compared exactly, as in_array() does). A rule applies
+when the CSV has its columns.
+
+Rules work on whole columns. Each column is factorized once, every rule is
+evaluated on its distinct values only and the results are spread back to
+the rows with the factorization codes, so enum-like columns cost one hash
+pass however many rows there are.
+"""
+
+import argparse
+import operator
+import re
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(REPO_ROOT / 'tools' / 'testing'))
+
+from schema_model import load_schema
+from sql_tokenizer import SKIPPED_KINDS, iter_tokens, mysql_string_value, refine_tokens
+
+NX_SCHEMA = REPO_ROOT / 'app' / 'database' / 'schemas' / 'nx-domain-schema-new.sql'
+IMPORT_TABLES = ("imported_it_data", "coverage_reports", "version_control")
+
+# importITData() skips rows without a project and URLs FILTER_VALIDATE_URL refuses
+REQUIRED_COLUMNS = ("project_name",)
+URL_COLUMNS = ("spip_url", "wiki_url")
+URL_RE = re.compile(r"[a-z][a-z0-9+.-]*://[^\s/?#@]+(?:[/?#]\S*)?", re.IGNORECASE)
+# importITData() accepts these values with a case-sensitive in_array(), unlike the CHECKs' collation;
+# values PHP's empty() is true for ('' and '0') skip the check
+IMPORTER_VALUES = {"business_unit": ("CN", "PC"), "reuse_ip": ("Y", "N")}
+PHP_EMPTY = ("", "0")
+
+NUMERIC_TYPES = {"INT", "INTEGER", "SMALLINT", "TINYINT", "MEDIUMINT", "BIGINT", "DECIMAL", "NUMERIC", "FLOAT",
+                 "DOUBLE", "REAL"}
+# Rows looked at to decide whether factorizing a column pays off
+FACTORIZE_SAMPLE = 1000
+
+COMPARISONS = {"=": operator.eq, "<>": operator.ne, "!=": operator.ne, "<": operator.lt, "<=": operator.le,
+               ">": operator.gt, ">=": operator.ge}
+
+def print_status(message):
+    print(f"\033[0;32m[INFO]\033[0m {message}")
+
+def print_warning(message):
+    print(f"\033[1;33m[WARNING]\033[0m {message}")
+
+def print_error(message):
+    print(f"\033[0;31m[ERROR]\033[0m {message}")
+
+def print_step(message):
+    print(f"\033[0;34m[STEP]\033[0m {message}")
+
+@dataclass
+class Rule:
+    """A check on whole columns: fails(columns) is a boolean array, True for rows that break it"""
+    name: str
+    columns: list
+    description: str
+    fails: object = field(repr=False)
+
+class Columns:
+    """The CSV columns, each factorized once into codes and distinct values
+
+    Columns whose first rows are mostly distinct (project names, URLs) are
+    not factorized: their values are used as they are, with codes None.
+    Derived per-value arrays (collation keys, numbers) are cached as well,
+    since several rules read the same column.
+    """
+
+    def __init__(self, frame):
+        self.frame = frame
+        self.rows = len(frame)
+        self.cache = {}
+
+    def __contains__(self, name):
+        return name in self.frame.columns
+
+    def factorized(self, name):
+        """(codes, distinct values as an object array of str)"""
+        if name not in self.cache:
+            column = self.frame[name]
+            sample = column.iloc[:FACTORIZE_SAMPLE]
+            if sample.nunique() > len(sample) // 2:
+                self.cache[name] = (None, column.to_numpy(dtype=object))
+            else:
+                codes, uniques = pd.factorize(column)
+                self.cache[name] = (codes, np.asarray(uniques, dtype=object))
+        return self.cache[name]
+
+    def per_value(self, name, key, function):
+        """function(distinct values) -> array, cached under key"""
+        cache_key = (name, key)
+        if cache_key not in self.cache:
+            self.cache[cache_key] = function(self.factorized(name)[1])
+        return self.cache[cache_key]
+
+    def spread(self, name, per_value):
+        """A per-value array as a per-row array"""
+        codes = self.factorized(name)[0]
+        return per_value if codes is None else per_value.take(codes)
+
+def collate(values):
+    """utf8mb4_unicode_ci comparison keys: case-insensitive, trailing spaces ignored"""
+    return np.array([value.rstrip(" ").casefold() for value in values], dtype=object)
+
+def to_numbers(values):
+    return pd.to_numeric(pd.Series(values, dtype=object), errors="coerce").to_numpy(dtype=float)
+
+def char_lengths(values):
+    return np.fromiter(map(len, values), dtype=float, count=len(values))
+
+def like_matcher(pattern):
+    """A function telling whether a value matches a MySQL LIKE pattern (\\ escapes % and _)
+
+    'prefix%' patterns, the common case in the CHECKs, compare the prefix
+    directly instead of running a regular expression.
+    """
+    literals, wildcards = [], []
+    for m in re.finditer(r"\\(.)|(%)|(_)|(.)", pattern, re.DOTALL):
+        escaped, percent, underscore, literal = m.groups()
+        wildcards.append(".*" if percent else "." if underscore else None)
+        literals.append(escaped or literal or "")
+    if wildcards and wildcards[-1] == ".*" and not any(wildcards[:-1]):
+        prefix = "".join(literals).lower()
+        return lambda value: value[:len(prefix)].lower() == prefix
+    regex = re.compile("".join(wildcard or re.escape(literal) for wildcard, literal in zip(wildcards, literals)),
+                       re.IGNORECASE | re.DOTALL)
+    return lambda value: regex.fullmatch(value) is not None
+
+class Truth:
+    """SQL three-valued logic per row: true, false, or neither (NULL)"""
+
+    def __init__(self, true, false):
+        self.true = true
+        self.false = false
+
+    def __and__(self, other):
+        return Truth(self.true & other.true, self.false | other.false)
+
+    def __or__(self, other):
+        return Truth(self.true | other.true, self.false & other.false)
+
+    def __invert__(self):
+        return Truth(self.false, self.true)
+
+class Operand:
+    """A column (values per distinct CSV value, spread to rows by column) or a literal (column None)
+
+    kind is 'text' or 'number'; null marks SQL NULLs ('' in a numeric column).
+    """
+
+    def __init__(self, values, null, kind, column=None):
+        self.values = values
+        self.null = null
+        self.kind = kind
+        self.column = column
+
+    def as_kind(self, kind, columns):
+        if kind == self.kind:
+            if kind == "text" and self.column is not None:
+                return columns.per_value(self.column, "collate", collate)
+            return self.values.rstrip(" ").casefold() if kind == "text" else self.values
+        if self.column is None:
+            try:
+                return float(self.values)
+            except ValueError:
+                return np.nan
+        return columns.per_value(self.column, "number", to_numbers)
+
+def column_operand(columns, name, numeric):
+    """A CSV column as the database would store it: '' is NULL for numeric columns"""
+    if numeric:
+        values = columns.per_value(name, "number", to_numbers)
+        return Operand(values, np.isnan(values), "number", name)
+    values = columns.factorized(name)[1]
+    return Operand(values, np.zeros(len(values), dtype=bool), "text", name)
+
+def truth(columns, operand_column, true, false):
+    """Per-value results as row results (literal-only results are broadcast)"""
+    if operand_column is None:
+        return Truth(np.full(columns.rows, bool(true)), np.full(columns.rows, bool(false)))
+    return Truth(columns.spread(operand_column, true), columns.spread(operand_column, false))
+
+def compare(columns, left, right, op):
+    kind = "number" if "number" in (left.kind, right.kind) else "text"
+    lhs, rhs = left.as_kind(kind, columns), right.as_kind(kind, columns)
+    # Text that is not a number compares as unknown rather than as MySQL's 0
+    left_null = np.logical_or(left.null, np.isnan(lhs)) if kind == "number" else left.null
+    right_null = np.logical_or(right.null, np.isnan(rhs)) if kind == "number" else right.null
+    if left.column is not None and right.column is not None and left.column != right.column:
+        # Two different columns: compare row by row
+        lhs, rhs = columns.spread(left.column, lhs), columns.spread(right.column, rhs)
+        left_null, right_null = columns.spread(left.column, left_null), columns.spread(right.column, right_null)
+        column = None
+    else:
+        column = left.column if left.column is not None else right.column
+    known = ~np.logical_or(left_null, right_null)
+    result = np.asarray(op(lhs, rhs), dtype=bool)
+    if column is None and np.ndim(result):
+        return Truth(result & known, ~result & known)
+    return truth(columns, column, result & known, ~result & known)
+
+def like(columns, operand, matches):
+    if operand.column is None:
+        matched = matches(str(operand.values))
+        return truth(columns, None, matched, not matched)
+    text = columns.factorized(operand.column)[1]
+    matched = np.fromiter(map(matches, text), dtype=bool, count=len(text))
+    known = ~operand.null
+    return truth(columns, operand.column, matched & known, ~matched & known)
+
+def is_null(columns, operand, negate):
+    null = operand.null
+    return truth(columns, operand.column, ~null if negate else null, null if negate else ~null)
+
+def char_length(columns, operand):
+    if operand.column is None:
+        return Operand(float(len(str(operand.values))), False, "number")
+    lengths = columns.per_value(operand.column, "length", char_lengths)
+    return Operand(lengths, operand.null, "number", operand.column)
+
+def _is_number(text):
+    return re.fullmatch(r"\d+(?:\.\d+)?", text) is not None
+
+def _reduce(terms, columns, combine):
+    result = terms[0](columns)
+    for term in terms[1:]:
+        result = combine(result, term(columns))
+    return result
+
+class CheckCompiler:
+    """Turns the text of a CHECK constraint into a function of Columns returning a Truth
+
+    Supports OR/AND/NOT, parentheses, IS [NOT] NULL, comparisons, [NOT] IN,
+    [NOT] LIKE and CHAR_LENGTH(); anything else raises ValueError.
+    """
+
+    def __init__(self, expression, column_types):
+        tokens = [(kind, text) for kind, text in refine_tokens(iter_tokens(expression)) if kind not in SKIPPED_KINDS]
+        self.tokens = self.merge_tokens(tokens)
+        self.column_types = column_types
+        self.columns = []
+        self.pos = 0
+
+    @staticmethod
+    def merge_tokens(tokens):
+        """Join two-character operators and decimal numbers split by the tokenizer"""
+        merged = []
+        for kind, text in tokens:
+            if kind == "punct" and merged and merged[-1][0] == "punct" and merged[-1][1] + text in COMPARISONS:
+                merged[-1] = ("punct", merged[-1][1] + text)
+            elif kind == "word" and text.isdigit() and len(merged) > 1 and merged[-1] == ("punct", ".") \
+                    and merged[-2][1].isdigit():
+                merged[-2:] = [("word", f"{merged[-2][1]}.{text}")]
+            else:
+                merged.append((kind, text))
+        return merged
+
+    def compile(self):
+        """(function, referenced columns)"""
+        term = self.parse_or()
+        if self.pos != len(self.tokens):
+            raise ValueError(f"Unexpected {self.peek()!r}")
+        return term, list(dict.fromkeys(self.columns))
+
+    def peek(self):
+        return self.tokens[self.pos][1] if self.pos < len(self.tokens) else None
+
+    def next(self):
+        token = self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+        self.pos += 1
+        return token
+
+    def accept(self, word):
+        if self.peek() is not None and self.peek().upper() == word:
+            self.pos += 1
+            return True
+        return False
+
+    def expect(self, word):
+        if not self.accept(word):
+            raise ValueError(f"Expected {word}, found {self.peek()!r}")
+
+    def parse_or(self):
+        terms = [self.parse_and()]
+        while self.accept("OR"):
+            terms.append(self.parse_and())
+        return terms[0] if len(terms) == 1 else lambda columns: _reduce(terms, columns, Truth.__or__)
+
+    def parse_and(self):
+        terms = [self.parse_not()]
+        while self.accept("AND"):
+            terms.append(self.parse_not())
+        return terms[0] if len(terms) == 1 else lambda columns: _reduce(terms, columns, Truth.__and__)
+
+    def parse_not(self):
+        if self.accept("NOT"):
+            term = self.parse_not()
+            return lambda columns: ~term(columns)
+        if self.accept("("):
+            term = self.parse_or()
+            self.expect(")")
+            return term
+        return self.parse_predicate()
+
+    def parse_predicate(self):
+        left = self.parse_operand()
+        if self.accept("IS"):
+            negate = self.accept("NOT")
+            self.expect("NULL")
+            return lambda columns: is_null(columns, left(columns), negate)
+
+        negate = self.accept("NOT")
+        if self.accept("IN"):
+            self.expect("(")
+            items = [self.parse_operand()]
+            while self.accept(","):
+                items.append(self.parse_operand())
+            self.expect(")")
+            comparisons = [lambda columns, item=item: compare(columns, left(columns), item(columns), operator.eq)
+                           for item in items]
+            term = lambda columns: _reduce(comparisons, columns, Truth.__or__)
+        elif self.accept("LIKE"):
+            kind, pattern = self.next()
+            if kind != "string":
+                raise ValueError("LIKE needs a string pattern")
+            matches = like_matcher(mysql_string_value(pattern))
+            term = lambda columns: like(columns, left(columns), matches)
+        elif not negate and self.peek() in COMPARISONS:
+            op = COMPARISONS[self.next()[1]]
+            right = self.parse_operand()
+            term = lambda columns: compare(columns, left(columns), right(columns), op)
+        else:
+            raise ValueError(f"Unsupported predicate at {self.peek()!r}")
+        return (lambda columns: ~term(columns)) if negate else term
+
+    def parse_operand(self):
+        kind, text = self.next()
+        if kind == "string":
+            value = mysql_string_value(text)
+            return lambda columns: Operand(value, False, "text")
+        if kind == "punct" and text == "-" and self.peek() is not None and _is_number(self.peek()):
+            value = -float(self.next()[1])
+            return lambda columns: Operand(value, False, "number")
+        if kind == "word" and _is_number(text):
+            value = float(text)
+            return lambda columns: Operand(value, False, "number")
+        if kind == "word" and text.upper() in ("CHAR_LENGTH", "CHARACTER_LENGTH") and self.peek() == "(":
+            self.pos += 1
+            argument = self.parse_operand()
+            self.expect(")")
+            return lambda columns: char_length(columns, argument(columns))
+        if kind in ("word", "quoted") and text.upper() not in ("NULL", "AND", "OR", "NOT"):
+            name = text.strip("`")
+            if name not in self.column_types:
+                raise ValueError(f"Unknown column {name}")
+            self.columns.append(name)
+            numeric = is_numeric_type(self.column_types[name])
+            return lambda columns: column_operand(columns, name, numeric)
+        raise ValueError(f"Unsupported operand {text!r}")
+
+def is_numeric_type(column_type):
+    return column_type.split("(")[0].upper() in NUMERIC_TYPES
+
+def value_rule(name, column, description, test):
+    """A rule testing each distinct value of one column: test(values) -> failing mask"""
+    return Rule(name, [column], description,
+                lambda columns: columns.spread(column, columns.per_value(column, name, test)))
+
+def check_rule(table, constraint, column_types):
+    term, referenced = CheckCompiler(constraint.expression, column_types).compile()
+    return Rule(constraint.name or f"{table} CHECK", referenced, constraint.expression,
+                lambda columns: term(columns).false)
+
+def load_rules(schema_path=NX_SCHEMA, tables=IMPORT_TABLES):
+    """(rules, skipped) for the import tables; skipped lists CHECKs that could not be compiled"""
+    schema = load_schema(schema_path)
+    rules, skipped, seen = [], [], set()
+    for column in REQUIRED_COLUMNS:
+        rules.append(value_rule(f"{column} missing", column, f"{column} is not empty",
+                                lambda values: np.array([not value.strip() for value in values], dtype=bool)))
+    for column in URL_COLUMNS:
+        rules.append(value_rule(f"{column} not a URL", column, "FILTER_VALIDATE_URL in importITData()",
+                                lambda values: np.array([value != "" and URL_RE.fullmatch(value) is None
+                                                         for value in values], dtype=bool)))
+    for column, allowed in IMPORTER_VALUES.items():
+        rules.append(value_rule(f"{column} not {'/'.join(allowed)}", column,
+                                f"in_array({column}, {list(allowed)}) in importITData()",
+                                lambda values, allowed=allowed: np.array([value not in PHP_EMPTY and value not in allowed
+                                                                          for value in values], dtype=bool)))
+    for name in tables:
+        table = schema.table(name)
+        if table is None:
+            raise ValueError(f"Table {name} not found in {schema_path}")
+        column_types = {column.name: column.type for column in table.columns.values()}
+        for column in table.columns.values():
+            m = re.fullmatch(r"(?:VAR)?CHAR\((\d+)\)", column.type, re.IGNORECASE)
+            if m and (column.name, m.group(1)) not in seen:
+                seen.add((column.name, m.group(1)))
+                length = int(m.group(1))
+                rules.append(value_rule(f"{column.name} longer than {length}", column.name,
+                                        f"CHAR_LENGTH({column.name}) <= {length}",
+                                        lambda values, length=length: char_lengths(values) > length))
+            elif is_numeric_type(column.type) and not column.auto_increment:
+                rules.append(value_rule(f"{column.name} not a number", column.name, f"{column.name} is numeric",
+                                        lambda values: np.isnan(to_numbers(values))
+                                        & np.array([value.strip() != "" for value in values], dtype=bool)))
+        for constraint in table.checks():
+            try:
+                rules.append(check_rule(name, constraint, column_types))
+            except ValueError as e:
+                skipped.append(f"{name}.{constraint.name}: {e}")
+    return rules, skipped
+
+def read_csv(source):
+    """Every cell as text, empty cells as '' (like fgetcsv)"""
+    return pd.read_csv(source, dtype=str, keep_default_na=False, na_filter=False, encoding="utf-8-sig")
+
+def validate_frame(frame, rules):
+    """(reasons, counts): the '; '-joined failed rule names per row ('' when clean) and failures per rule
+
+    Rules whose columns are not in the frame are left out of counts.
+    """
+    columns = Columns(frame)
+    reasons = np.full(len(frame), "", dtype=object)
+    counts = {}
+    for rule in rules:
+        if not all(column in columns for column in rule.columns):
+            continue
+        fails = np.asarray(rule.fails(columns), dtype=bool)
+        counts[rule.name] = int(fails.sum())
+        if counts[rule.name]:
+            previous = reasons[fails]
+            reasons[fails] = np.where(previous == "", rule.name, previous + ("; " + rule.name))
+    return pd.Series(reasons, index=frame.index, dtype=object), counts
+
+def split_file(input_path, clean_path, rejects_path, rules):
+    """Write the clean and rejected rows; returns statistics including per-step timings"""
+    started = time.perf_counter()
+    frame = read_csv(input_path)
+    loaded = time.perf_counter()
+    reasons, counts = validate_frame(frame, rules)
+    validated = time.perf_counter()
+
+    rejected = (reasons != "").to_numpy()
+    frame[~rejected].to_csv(clean_path, index=False, lineterminator="\n")
+    rejects = frame[rejected]
+    rejects.insert(0, "reject_reasons", reasons[rejected])
+    # Line of the row in the input, counting the header as line 1
+    rejects.insert(0, "line", frame.index[rejected] + 2)
+    rejects.to_csv(rejects_path, index=False, lineterminator="\n")
+    return {
+        "rows": len(frame),
+        "clean": int((~rejected).sum()),
+        "rejected": int(rejected.sum()),
+        "failures": {name: count for name, count in counts.items() if count},
+        "rules_applied": len(counts),
+        "load_seconds": loaded - started,
+        "validate_seconds": validated - loaded,
+        "write_seconds": time.perf_counter() - validated,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Split an IT domain CSV export into clean and rejected rows")
+    parser.add_argument("csv_file", help="CSV exported from the IT domain")
+    parser.add_argument("--clean", help="Clean rows output (default: <csv_file>.clean.csv)")
+    parser.add_argument("--rejects", help="Rejected rows with reasons (default: <csv_file>.rejects.csv)")
+    parser.add_argument("--schema", default=str(NX_SCHEMA), help="Schema with the CHECK constraints")
+    parser.add_argument("--strict", action="store_true", help="Exit with 1 when any row is rejected")
+    args = parser.parse_args(argv)
+
+    input_path = Path(args.csv_file)
+    stem = input_path.with_suffix("")
+    clean_path = Path(args.clean) if args.clean else stem.with_name(f"{stem.name}.clean.csv")
+    rejects_path = Path(args.rejects) if args.rejects else stem.with_name(f"{stem.name}.rejects.csv")
+
+    print_step(f"Validating {input_path}")
+    rules, skipped = load_rules(Path(args.schema))
+    for message in skipped:
+        print_warning(f"CHECK not applied: {message}")
+    try:
+        stats = split_file(input_path, clean_path, rejects_path, rules)
+    except (OSError, pd.errors.EmptyDataError, pd.errors.ParserError, UnicodeDecodeError) as e:
+        print_error(f"Cannot read {input_path}: {e}")
+        sys.exit(1)
+
+    print_status(f"{stats['rows']} rows checked against {stats['rules_applied']} rules "
+                 f"in {stats['validate_seconds'] * 1000:.0f} ms (load {stats['load_seconds'] * 1000:.0f} ms)")
+    for name, count in sorted(stats["failures"].items(), key=lambda item: -item[1]):
+        print_warning(f"{count:>8}  {name}")
+    print_status(f"✅ {stats['clean']} clean rows → {clean_path}")
+    if stats["rejected"]:
+        print_warning(f"{stats['rejected']} rejected rows → {rejects_path}")
+    if args.strict and stats["rejected"]:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
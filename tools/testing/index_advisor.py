@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+Index Advisor and Query-Plan Benchmark
+Loads the IT/NX schemas into SQLite, fills them with synthetic data at
+several sizes, runs the dashboard/API queries and to_summary_view with
+EXPLAIN QUERY PLAN, and reports redundant, unused and missing indexes
+together with query timings.
+
+SQLite's planner is not MySQL's, but full scans, automatic indexes and
+temporary sort B-trees show up the same way in both.
+"""
+
+import argparse
+import json
+import random
+import re
+import sqlite3
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(REPO_ROOT / 'tools' / 'maintenance'))
+
+from sql_tokenizer import iter_sqlite_statements
+from refresh_to_summary import SUMMARY_COLUMNS, refresh_to_summary
+
+SCHEMA_DIR = REPO_ROOT / 'app' / 'database' / 'schemas'
+SCHEMAS = {
+    'it': SCHEMA_DIR / 'it-domain-schema-new.sql',
+    'nx': SCHEMA_DIR / 'nx-domain-schema-new.sql',
+}
+DATA_TABLES = {
+    'it': ('it_domain_projects',),
+    'nx': ('imported_it_data', 'coverage_reports', 'version_control'),
+}
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+
+# Queries issued by the dashboards and APIs. "lookup" names the (table, column)
+# a point query is expected to search by, so a full scan of it can be flagged.
+WORKLOAD = [
+    {
+        'name': 'nx dashboard: coverage_reports',
+        'db': 'nx',
+        'sql': "SELECT * FROM coverage_reports ORDER BY project_name",
+    },
+    {
+        'name': 'nx dashboard: version_control',
+        'db': 'nx',
+        'sql': "SELECT * FROM version_control ORDER BY project_name",
+    },
+    {
+        'name': 'nx dashboard: imported_it_data',
+        'db': 'nx',
+        'sql': "SELECT DISTINCT project_name, import_date FROM imported_it_data ORDER BY project_name",
+    },
+    {
+        'name': 'nx dashboard: to_summary_view',
+        'db': 'nx',
+        'sql': "SELECT * FROM to_summary_view ORDER BY project",
+    },
+    {
+        'name': 'nx dashboard: to_summary_materialized',
+        'db': 'nx',
+        'sql': f"SELECT {', '.join(SUMMARY_COLUMNS)} FROM to_summary_materialized ORDER BY project",
+    },
+    {
+        'name': 'nx api: get-project-details',
+        'db': 'nx',
+        'sql': """
+            SELECT COALESCE(it.project_name, cr.project_name, vc.project_name) AS project, it.*, cr.*, vc.*
+            FROM imported_it_data it
+            LEFT JOIN coverage_reports cr ON it.project_name = cr.project_name
+            LEFT JOIN version_control vc ON it.project_name = vc.project_name
+            WHERE COALESCE(it.project_name, cr.project_name, vc.project_name) = ?
+            LIMIT 1
+        """,
+        'params': lambda size: (project_name(size // 2),),
+        'lookup': ('imported_it_data', 'project_name'),
+    },
+    *(
+        {
+            'name': f"nx refresh: changed {table}",
+            'db': 'nx',
+            'sql': f"SELECT DISTINCT project_name FROM {table} WHERE {column} > ?",
+            'params': lambda size: ('2024-12-25 00:00:00',),
+            'lookup': (table, column),
+        }
+        for table, column in (('imported_it_data', 'updated_at'), ('coverage_reports', 'updated_at'),
+                              ('version_control', 'updated_at'))
+    ),
+    {
+        'name': 'it export_view',
+        'db': 'it',
+        'sql': "SELECT * FROM export_view",
+    },
+    {
+        'name': 'it api: project by name',
+        'db': 'it',
+        'sql': "SELECT * FROM it_domain_projects WHERE project_name = ?",
+        'params': lambda size: (project_name(size // 2),),
+        'lookup': ('it_domain_projects', 'project_name'),
+    },
+    {
+        'name': 'it api: project by task_index',
+        'db': 'it',
+        'sql': "SELECT * FROM it_domain_projects WHERE task_index = ?",
+        'params': lambda size: (f"TASK{size // 3:07d}",),
+        'lookup': ('it_domain_projects', 'task_index'),
+    },
+]
+
+def print_status(message):
+    print(f"\033[0;32m[INFO]\033[0m {message}")
+
+def print_warning(message):
+    print(f"\033[1;33m[WARNING]\033[0m {message}")
+
+def print_error(message):
+    print(f"\033[0;31m[ERROR]\033[0m {message}")
+
+def print_step(message):
+    print(f"\033[0;34m[STEP]\033[0m {message}")
+
+def project_name(i):
+    return f"RL{i:07d}"
+
+def create_database(db):
+    """In-memory SQLite copy of one domain schema with its sample rows removed"""
+    conn = sqlite3.connect(':memory:')
+    with open(SCHEMAS[db], 'r', encoding='utf-8') as f:
+        for statement in iter_sqlite_statements(f):
+            try:
+                conn.execute(statement)
+            except sqlite3.Error:
+                # Sample rows relying on MySQL triggers are skipped
+                pass
+    for table in DATA_TABLES[db]:
+        conn.execute(f"DELETE FROM {table}")
+    conn.commit()
+    return conn
+
+def timestamp(rng):
+    moment = datetime(2024, 1, 1) + timedelta(seconds=rng.randrange(365 * 24 * 3600))
+    return moment.strftime('%Y-%m-%d %H:%M:%S')
+
+def populate_nx(conn, size, rng):
+    """imported_it_data for every project, coverage for 90% (plus 5% coverage-only), version control for 80%
+
+    to_summary_materialized is then rebuilt by the refresh job, as in production.
+    """
+    conn.executemany(
+        "INSERT INTO imported_it_data (project_name, task_index, spip_ip, ip, ip_subtype, dv_engineer, "
+        "digital_designer, business_unit, reuse_ip, spip_url, wiki_url, import_date) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            (project_name(i), f"TASK{i:07d}", f"XXXX_IP{i % 97}", f"IP{i % 97}", rng.choice(('default', 'gen2x1')),
+             f"DV{i % 50}", f"DD{i % 40}", rng.choice(('CN', 'PC')), rng.choice(('Y', 'N')),
+             f"https://jira.example.com/browse/SPIP-{i}", f"https://wiki.example.com/{i}", timestamp(rng))
+            for i in range(size)
+        ),
+    )
+    conn.execute("UPDATE imported_it_data SET updated_at = import_date")
+    conn.executemany(
+        "INSERT INTO coverage_reports (project_name, line_coverage, fsm_coverage, interface_toggle_coverage, "
+        "toggle_coverage, coverage_report_path, to_date, rtl_last_update, to_report_creation, updated_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            (project_name(i), rng.uniform(0, 100), rng.uniform(0, 100), rng.uniform(0, 100), rng.uniform(0, 100),
+             f"/project/coverage/{project_name(i)}.html", timestamp(rng)[:10], timestamp(rng), timestamp(rng), timestamp(rng))
+            for i in range(size // 10, size + size // 20)
+        ),
+    )
+    conn.executemany(
+        "INSERT INTO version_control (project_name, sanity_svn, release_svn, git_path, git_version, updated_at) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        (
+            (project_name(i), f"http://svn.example.com/{i}/sanity", f"http://svn.example.com/{i}/release",
+             f"ssh://git.example.com/{i}.git", f"{rng.getrandbits(160):040x}", timestamp(rng))
+            for i in range(size * 8 // 10)
+        ),
+    )
+    conn.commit()
+    refresh_to_summary(conn, 'sqlite', full=True)
+
+def populate_it(conn, size, rng):
+    """One it_domain_projects row per project"""
+    conn.executemany(
+        "INSERT INTO it_domain_projects (task_index, project_name, spip_ip, ip, ip_subtype, dv_engineer, "
+        "digital_designer, business_unit, reuse_ip, spip_url, wiki_url) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            (f"TASK{i:07d}", project_name(i), f"XXXX_IP{i % 97}", f"IP{i % 97}", rng.choice(('default', 'gen2x1')),
+             f"DV{i % 50}", f"DD{i % 40}", rng.choice(('CN', 'PC')), rng.choice(('Y', 'N')),
+             f"https://jira.example.com/browse/SPIP-{i}", f"https://wiki.example.com/{i}")
+            for i in range(size)
+        ),
+    )
+    conn.commit()
+
+POPULATE = {'it': populate_it, 'nx': populate_nx}
+
+def list_indexes(conn):
+    """All indexes per table: [{'name', 'table', 'columns', 'unique', 'origin'}]
+
+    origin is 'c' for CREATE INDEX, 'u' for UNIQUE constraints and 'pk' for primary keys.
+    """
+    indexes = []
+    tables = [row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'")]
+    for table in tables:
+        for _, name, unique, origin, _ in conn.execute(f"PRAGMA index_list({table})"):
+            columns = tuple(row[2] for row in conn.execute(f"PRAGMA index_info({name})"))
+            indexes.append({'name': name, 'table': table, 'columns': columns, 'unique': bool(unique), 'origin': origin})
+    return indexes
+
+def find_redundant_indexes(indexes):
+    """Indexes whose columns are a leading prefix of another index on the same table
+
+    An explicit CREATE INDEX duplicating a UNIQUE/PRIMARY KEY constraint is reported,
+    never the constraint itself.
+    """
+    redundant = []
+    for index in indexes:
+        if index['origin'] != 'c':
+            continue
+        for other in indexes:
+            if other is index or other['table'] != index['table']:
+                continue
+            covers = other['columns'][:len(index['columns'])] == index['columns']
+            if not covers or (index['unique'] and not (other['unique'] and other['columns'] == index['columns'])):
+                continue
+            if other['columns'] == index['columns'] and other['origin'] == 'c' and other['name'] > index['name']:
+                # Two identical explicit indexes: report only one of them
+                continue
+            redundant.append({
+                'index': index['name'], 'table': index['table'], 'columns': list(index['columns']),
+                'covered_by': other['name'],
+            })
+            break
+    return redundant
+
+def explain(conn, sql, params):
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+def time_query(conn, sql, params, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        conn.execute(sql, params).fetchall()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+AUTOMATIC_INDEX = re.compile(r"SEARCH (\w+)(?: AS \w+)? USING AUTOMATIC (?:PARTIAL )?(?:COVERING )?INDEX \((.*?)\)")
+USED_INDEX = re.compile(r"USING (?:COVERING )?INDEX (\w+)")
+SCAN = re.compile(r"^SCAN (\w+)")
+
+def analyze_plan(query, plan, indexes, aliases):
+    """Missing-index findings for one query plan"""
+    findings = []
+    for detail in plan:
+        match = AUTOMATIC_INDEX.search(detail)
+        if match:
+            table = aliases.get(match.group(1), match.group(1))
+            columns = [part.split('=')[0].split('>')[0].split('<')[0].strip() for part in match.group(2).split(' AND ')]
+            findings.append({
+                'query': query['name'], 'table': table, 'columns': columns,
+                'reason': 'SQLite builds a temporary automatic index for this join/filter',
+            })
+    lookup = query.get('lookup')
+    if lookup:
+        table, column = lookup
+        scanned = {aliases.get(m.group(1), m.group(1)) for m in (SCAN.match(d) for d in plan) if m}
+        if table in scanned:
+            indexed = any(index['table'] == table and index['columns'][:1] == (column,) for index in indexes)
+            findings.append({
+                'query': query['name'], 'table': table, 'columns': [column],
+                'reason': ('an index on this column exists but the plan scans the table instead '
+                           '(expression around the column, or the planner expects low selectivity)' if indexed
+                           else f"full scan of {table} for a lookup on {column}"),
+                'indexed': indexed,
+            })
+    return findings
+
+TABLE_ALIASES = {'it': 'imported_it_data', 'cr': 'coverage_reports', 'vc': 'version_control'}
+
+def benchmark(db, size, repeat, seed, extra_sql=()):
+    """Populate one database, run its workload and collect plans, timings and index findings"""
+    conn = create_database(db)
+    try:
+        started = time.perf_counter()
+        POPULATE[db](conn, size, random.Random(seed))
+        for statement in extra_sql:
+            conn.execute(statement)
+        conn.execute("ANALYZE")
+        load_seconds = time.perf_counter() - started
+
+        indexes = list_indexes(conn)
+        aliases = TABLE_ALIASES if db == 'nx' else {}
+        queries = []
+        missing = []
+        used = set()
+        for query in (q for q in WORKLOAD if q['db'] == db):
+            params = query['params'](size) if 'params' in query else ()
+            plan = explain(conn, query['sql'], params)
+            used.update(match.group(1) for detail in plan for match in USED_INDEX.finditer(detail))
+            missing.extend(analyze_plan(query, plan, indexes, aliases))
+            queries.append({
+                'name': query['name'],
+                'plan': plan,
+                'median_ms': round(time_query(conn, query['sql'], params, repeat), 3),
+            })
+
+        redundant = find_redundant_indexes(indexes)
+        redundant_names = {item['index'] for item in redundant}
+        return {
+            'db': db,
+            'size': size,
+            'load_seconds': round(load_seconds, 2),
+            'queries': queries,
+            'redundant': redundant,
+            'unused': [index['name'] for index in indexes
+                       if index['origin'] == 'c' and index['name'] not in used | redundant_names],
+            'missing': missing,
+        }
+    finally:
+        conn.close()
+
+def print_report(result):
+    print_step(f"{result['db'].upper()} schema, {result['size']:,} rows (loaded in {result['load_seconds']}s)")
+    width = max(len(query['name']) for query in result['queries'])
+    for query in result['queries']:
+        print(f"  {query['name']:<{width}}  {query['median_ms']:>10.2f} ms")
+        for detail in query['plan']:
+            print(f"  {'':<{width}}    {detail}")
+    for item in result['redundant']:
+        print_warning(f"Redundant index {item['index']} on {item['table']}({', '.join(item['columns'])}) "
+                      f"is covered by {item['covered_by']}")
+    for name in result['unused']:
+        print_warning(f"Index {name} is not used by any workload query")
+    for item in result['missing']:
+        print_warning(f"{item['query']}: {item['table']}({', '.join(item['columns'])}) - {item['reason']}")
+    if not (result['redundant'] or result['unused'] or result['missing']):
+        print_status("✅ No index issues found")
+    print()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Index advisor and query-plan benchmark for the IT/NX schemas")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="Row counts to benchmark (default: 10000 100000 1000000)")
+    parser.add_argument("--db", choices=("it", "nx"), nargs="+", default=["it", "nx"], help="Schemas to benchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per query; the median is reported")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the synthetic data")
+    parser.add_argument("--extra-sql", action="append", default=[],
+                        help="Statement run after loading, e.g. a candidate CREATE INDEX to compare plans")
+    parser.add_argument("--json", help="Also write the full report to this JSON file")
+    args = parser.parse_args(argv)
+
+    print("=" * 60)
+    print("Index Advisor and Query-Plan Benchmark")
+    print("=" * 60)
+
+    results = []
+    for size in args.sizes:
+        for db in args.db:
+            try:
+                result = benchmark(db, size, args.repeat, args.seed,
+                                   [sql for sql in args.extra_sql if db_of_statement(sql) in (None, db)])
+            except sqlite3.Error as e:
+                print_error(f"{db} benchmark at {size} rows failed: {e}")
+                sys.exit(1)
+            print_report(result)
+            results.append(result)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print_status(f"Report written to {args.json}")
+
+def db_of_statement(sql):
+    """Which schema an --extra-sql statement belongs to, judged by the tables it names"""
+    for db, tables in DATA_TABLES.items():
+        if any(re.search(rf"\b{table}\b", sql) for table in tables):
+            return db
+    return None
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+HTTP Load Generator for the IT/NX Domain Sites
+Sends a weighted mix of requests at a fixed rate to the Docker deployment or
+the test_server.py stand-in, and reports latency percentiles, error rates
+and throughput per endpoint.
+
+Requests are issued on a fixed schedule (open loop): a request waits for a
+free keep-alive connection when the server falls behind, and its latency is
+measured from the time it was scheduled. Slow responses therefore show up in
+the percentiles instead of silently lowering the request rate.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import sys
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from index_advisor import project_name
+
+DEFAULT_RPS = 50
+DEFAULT_DURATION = 30
+DEFAULT_WARMUP = 5
+DEFAULT_CONNECTIONS = 32
+DEFAULT_TIMEOUT = 10
+DEFAULT_PROJECT_COUNT = 200
+
+# Request mix: 'site' selects --it-url or --nx-url, '{project}' in a path is
+# replaced with a random project name for each request.
+DEFAULT_MIX = [
+    {'name': 'nx dashboard', 'site': 'nx', 'path': '/index.php?action=dashboard', 'weight': 30},
+    {'name': 'nx to_summary page', 'site': 'nx', 'path': '/index.php?action=to_summary', 'weight': 10},
+    {'name': 'nx export json', 'site': 'nx', 'path': '/index.php?action=export&format=json', 'weight': 5},
+    {'name': 'nx export csv', 'site': 'nx', 'path': '/index.php?action=export&format=csv', 'weight': 5},
+    {'name': 'nx export xml', 'site': 'nx', 'path': '/index.php?action=export&format=xml', 'weight': 5},
+    {'name': 'nx project details', 'site': 'nx', 'path': '/api/get-project-details.php?id={project}', 'weight': 35},
+    {'name': 'it project list', 'site': 'it', 'path': '/index.php?action=list', 'weight': 10},
+]
+PERCENTILES = (50, 95, 99)
+
+def print_status(message):
+    print(f"\033[0;32m[INFO]\033[0m {message}")
+
+def print_warning(message):
+    print(f"\033[1;33m[WARNING]\033[0m {message}")
+
+def print_error(message):
+    print(f"\033[0;31m[ERROR]\033[0m {message}")
+
+def print_step(message):
+    print(f"\033[0;34m[STEP]\033[0m {message}")
+
+class HTTPResponse:
+    def __init__(self, status, headers, body):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    @property
+    def keep_alive(self):
+        return self.headers.get('connection', '').lower() != 'close'
+
+async def read_response(reader, method='GET'):
+    """Read one HTTP/1.1 response: Content-Length, chunked or close-delimited body"""
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode('latin-1').split("\r\n")
+    status = int(lines[0].split(" ", 2)[1])
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+    if method == 'HEAD' or status in (204, 304) or 100 <= status < 200:
+        body = b""
+    elif 'chunked' in headers.get('transfer-encoding', '').lower():
+        chunks = []
+        while True:
+            size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+            if size == 0:
+                # Trailers end with an empty line
+                while await reader.readuntil(b"\r\n") != b"\r\n":
+                    pass
+                break
+            chunks.append(await reader.readexactly(size))
+            await reader.readexactly(2)
+        body = b"".join(chunks)
+    elif 'content-length' in headers:
+        body = await reader.readexactly(int(headers['content-length']))
+    else:
+        body = await reader.read()
+        headers['connection'] = 'close'
+    return HTTPResponse(status, headers, body)
+
+class ConnectionPool:
+    """Keep-alive connections to one origin, at most limit at a time"""
+
+    def __init__(self, url, limit=DEFAULT_CONNECTIONS):
+        parts = urlsplit(url)
+        if parts.scheme != 'http':
+            raise ValueError(f"only http:// URLs are supported, not {url}")
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.host_header = parts.netloc
+        self.prefix = parts.path.rstrip('/')
+        self.slots = asyncio.Semaphore(limit)
+        self.idle = []
+        self.opened = 0
+
+    async def _exchange(self, connection, path, headers):
+        reader, writer = connection
+        lines = [f"GET {self.prefix}{path} HTTP/1.1", f"Host: {self.host_header}",
+                 *(f"{name}: {value}" for name, value in headers.items())]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode('latin-1'))
+        await writer.drain()
+        return await read_response(reader)
+
+    async def request(self, path, headers=None):
+        headers = headers or {}
+        async with self.slots:
+            reused = bool(self.idle)
+            connection = self.idle.pop() if reused else await self._open()
+            try:
+                response = await self._exchange(connection, path, headers)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                connection[1].close()
+                if not reused:
+                    raise
+                # The server closed an idle keep-alive connection; retry once on a new one
+                connection = await self._open()
+                try:
+                    response = await self._exchange(connection, path, headers)
+                except BaseException:
+                    connection[1].close()
+                    raise
+            except BaseException:
+                connection[1].close()
+                raise
+            if response.keep_alive:
+                self.idle.append(connection)
+            else:
+                connection[1].close()
+            return response
+
+    async def _open(self):
+        self.opened += 1
+        return await asyncio.open_connection(self.host, self.port, limit=1 << 20)
+
+    def close(self):
+        for _, writer in self.idle:
+            writer.close()
+        self.idle = []
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return None
+    return sorted_values[max(0, math.ceil(p / 100 * len(sorted_values)) - 1)]
+
+def summarize(results, seconds):
+    """Stats for a list of results: {'requests', 'errors', 'error_rate', 'throughput_rps', 'latency_ms', ...}"""
+    latencies = sorted(result['latency'] * 1000 for result in results)
+    errors = {}
+    for result in results:
+        if result['error']:
+            errors[result['error']] = errors.get(result['error'], 0) + 1
+    failed = sum(errors.values())
+    return {
+        'requests': len(results),
+        'errors': failed,
+        'error_rate': round(failed / len(results), 4) if results else 0.0,
+        'error_kinds': errors,
+        'throughput_rps': round((len(results) - failed) / seconds, 2) if seconds else 0.0,
+        'bytes': sum(result['bytes'] for result in results),
+        'latency_ms': {
+            **{f"p{p}": round(percentile(latencies, p), 2) if latencies else None for p in PERCENTILES},
+            'mean': round(sum(latencies) / len(latencies), 2) if latencies else None,
+            'max': round(latencies[-1], 2) if latencies else None,
+        },
+    }
+
+async def send(pool, endpoint, path, scheduled, timeout, results):
+    loop = asyncio.get_running_loop()
+    result = {'endpoint': endpoint['name'], 'error': None, 'bytes': 0}
+    try:
+        response = await asyncio.wait_for(pool.request(path, endpoint.get('headers')), timeout)
+        result['bytes'] = len(response.body)
+        if response.status >= 400:
+            result['error'] = f"HTTP {response.status}"
+    except asyncio.TimeoutError:
+        result['error'] = "timeout"
+    except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+        result['error'] = type(e).__name__
+    result['latency'] = loop.time() - scheduled
+    if results is not None:
+        results.append(result)
+
+async def run_load(targets, mix=DEFAULT_MIX, rps=DEFAULT_RPS, duration=DEFAULT_DURATION, warmup=DEFAULT_WARMUP,
+                   connections=DEFAULT_CONNECTIONS, timeout=DEFAULT_TIMEOUT, projects=None, seed=42,
+                   arrival='constant'):
+    """Drive the mix at rps for warmup + duration seconds; returns the report dict
+
+    targets maps site names ('it', 'nx') to base URLs. Requests scheduled during
+    the warm-up are sent but not counted.
+    """
+    rng = random.Random(seed)
+    projects = projects or [project_name(i) for i in range(DEFAULT_PROJECT_COUNT)]
+    missing = {endpoint['site'] for endpoint in mix} - set(targets)
+    if missing:
+        raise ValueError(f"no URL for site(s) {', '.join(sorted(missing))}")
+    pools = {site: ConnectionPool(url, connections) for site, url in targets.items()}
+    weights = [endpoint.get('weight', 1) for endpoint in mix]
+
+    loop = asyncio.get_running_loop()
+    results = []
+    tasks = []
+    start = loop.time() + 0.05
+    offset = 0.0
+    started_at = datetime.now().isoformat(timespec='seconds')
+    try:
+        while offset < warmup + duration:
+            delay = start + offset - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            endpoint = rng.choices(mix, weights)[0]
+            path = endpoint['path'].replace('{project}', rng.choice(projects))
+            tasks.append(asyncio.create_task(send(pools[endpoint['site']], endpoint, path, start + offset, timeout,
+                                                  results if offset >= warmup else None)))
+            offset += rng.expovariate(rps) if arrival == 'poisson' else 1 / rps
+        await asyncio.gather(*tasks)
+    finally:
+        for pool in pools.values():
+            pool.close()
+
+    by_endpoint = {}
+    for result in results:
+        by_endpoint.setdefault(result['endpoint'], []).append(result)
+    return {
+        'started_at': started_at,
+        'config': {'targets': targets, 'rps': rps, 'duration': duration, 'warmup': warmup,
+                   'connections': connections, 'timeout': timeout, 'arrival': arrival, 'seed': seed,
+                   'mix': mix},
+        'connections_opened': sum(pool.opened for pool in pools.values()),
+        'endpoints': {endpoint['name']: summarize(by_endpoint.get(endpoint['name'], []), duration)
+                      for endpoint in mix},
+        'total': summarize(results, duration),
+    }
+
+def print_report(report):
+    rows = [(name, stats) for name, stats in report['endpoints'].items()] + [("TOTAL", report['total'])]
+    width = max(len(name) for name, _ in rows)
+    header = (f"{'Endpoint':<{width}}  {'Requests':>8}  {'Errors':>6}  {'Err%':>6}  {'RPS':>8}  "
+              f"{'p50 ms':>9}  {'p95 ms':>9}  {'p99 ms':>9}  {'max ms':>9}")
+    print(header)
+    print("-" * len(header))
+    for name, stats in rows:
+        latency = {key: "-" if value is None else f"{value:.1f}" for key, value in stats['latency_ms'].items()}
+        print(f"{name:<{width}}  {stats['requests']:>8}  {stats['errors']:>6}  {stats['error_rate'] * 100:>5.1f}%  "
+              f"{stats['throughput_rps']:>8.1f}  {latency['p50']:>9}  {latency['p95']:>9}  {latency['p99']:>9}  "
+              f"{latency['max']:>9}")
+    for name, stats in rows[:-1]:
+        for kind, count in stats['error_kinds'].items():
+            print_warning(f"{name}: {count} x {kind}")
+
+def load_mix(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        mix = json.load(f)
+    for endpoint in mix:
+        if not {'name', 'site', 'path'} <= set(endpoint):
+            raise ValueError(f"mix entries need name, site and path: {endpoint}")
+    return mix
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load generator for the IT/NX domain sites")
+    parser.add_argument("--it-url", default="http://localhost:8080", help="IT domain base URL")
+    parser.add_argument("--nx-url", default="http://localhost:8081", help="NX domain base URL")
+    parser.add_argument("--stand-in", action="store_true",
+                        help="Start test_server.py in this process and load it (handy for smoke runs; "
+                             "run test_server.py separately for realistic numbers)")
+    parser.add_argument("--rps", type=float, default=DEFAULT_RPS, help=f"Target request rate (default: {DEFAULT_RPS})")
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION,
+                        help=f"Measured seconds (default: {DEFAULT_DURATION})")
+    parser.add_argument("--warmup", type=float, default=DEFAULT_WARMUP,
+                        help=f"Seconds sent before measuring (default: {DEFAULT_WARMUP})")
+    parser.add_argument("--connections", type=int, default=DEFAULT_CONNECTIONS,
+                        help=f"Keep-alive connections per site (default: {DEFAULT_CONNECTIONS})")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="Per-request timeout in seconds")
+    parser.add_argument("--arrival", choices=("constant", "poisson"), default="constant",
+                        help="Evenly spaced or Poisson-distributed request times")
+    parser.add_argument("--mix", help="JSON file with a list of {name, site, path, weight[, headers]} entries")
+    parser.add_argument("--projects-file", help="Project names for {project}, one per line")
+    parser.add_argument("--project-count", type=int, default=DEFAULT_PROJECT_COUNT,
+                        help="Use the stand-in's synthetic names RL0000000.. up to this count")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the request sequence")
+    parser.add_argument("--json", help="Also write the report to this JSON file")
+    parser.add_argument("--max-error-rate", type=float,
+                        help="Exit with 1 when the overall error rate is above this fraction")
+    args = parser.parse_args(argv)
+
+    mix = load_mix(args.mix) if args.mix else DEFAULT_MIX
+    if args.projects_file:
+        projects = [line.strip() for line in Path(args.projects_file).read_text(encoding='utf-8').splitlines()
+                    if line.strip()]
+    else:
+        projects = [project_name(i) for i in range(args.project_count)]
+
+    print("=" * 60)
+    print("IT/NX Domain Load Test")
+    print("=" * 60)
+
+    stop = None
+    targets = {'it': args.it_url, 'nx': args.nx_url}
+    if args.stand_in:
+        import tempfile
+        from test_server import serve_in_background
+        data_dir = tempfile.TemporaryDirectory()
+        (it_port, nx_port), stop = serve_in_background(data_dir.name, projects=args.project_count)
+        targets = {'it': f"http://127.0.0.1:{it_port}", 'nx': f"http://127.0.0.1:{nx_port}"}
+        print_status(f"Stand-in server started with {args.project_count} projects")
+
+    print_step(f"{args.rps:g} requests/s for {args.duration:g}s (+{args.warmup:g}s warm-up) against "
+               f"{', '.join(f'{site}={url}' for site, url in targets.items())}")
+    try:
+        report = asyncio.run(run_load(targets, mix, args.rps, args.duration, args.warmup, args.connections,
+                                      args.timeout, projects, args.seed, args.arrival))
+    finally:
+        if stop:
+            stop()
+            data_dir.cleanup()
+
+    print()
+    print_report(report)
+    print()
+    offered = report['total']['requests'] / args.duration
+    print_status(f"Offered {offered:.1f} requests/s over {report['connections_opened']} connections")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print_status(f"Report written to {args.json}")
+
+    if args.max_error_rate is not None and report['total']['error_rate'] > args.max_error_rate:
+        print_error(f"Error rate {report['total']['error_rate']:.2%} is above {args.max_error_rate:.2%}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,521 @@
+#!/usr/bin/env python3
+"""
+Parsed Schema Model
+Reads a MySQL schema file once with sql_tokenizer and builds a model of
+the database state it leaves behind: tables with typed columns, indexes
+and constraints, views with their select lists, and triggers. Statements
+are applied in order, so DROP TABLE/VIEW and USE are honoured. Models are
+cached per file (keyed on modification time), so several checks over the
+same file parse it only once.
+"""
+
+import os
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from sql_tokenizer import SKIPPED_KINDS, iter_statements, refine_tokens
+
+# Words that end a column's type and start its options
+COLUMN_OPTIONS = {"NOT", "NULL", "DEFAULT", "PRIMARY", "UNIQUE", "AUTO_INCREMENT", "COMMENT", "CHECK",
+                  "REFERENCES", "ON", "COLLATE", "CHARACTER", "GENERATED", "AS", "CONSTRAINT", "KEY"}
+DEFAULT_DATABASE = ""
+
+@dataclass
+class Column:
+    name: str
+    type: str
+    nullable: bool = True
+    default: str = None
+    primary_key: bool = False
+    unique: bool = False
+    auto_increment: bool = False
+    on_update: str = None
+
+@dataclass
+class Constraint:
+    kind: str  # CHECK, PRIMARY KEY, UNIQUE or FOREIGN KEY
+    name: str = None
+    columns: list = field(default_factory=list)
+    expression: str = None  # CHECK only
+    references: tuple = None  # FOREIGN KEY only: (table, [columns])
+
+@dataclass
+class Index:
+    name: str
+    table: str
+    columns: list
+    unique: bool = False
+
+@dataclass
+class Table:
+    name: str
+    database: str
+    columns: dict = field(default_factory=dict)
+    constraints: list = field(default_factory=list)
+    indexes: list = field(default_factory=list)
+    # CREATE TABLE ... AS SELECT: columns are only known at run time
+    as_select: str = None
+
+    def checks(self):
+        """CHECK constraints, including those written on a column"""
+        return [constraint for constraint in self.constraints if constraint.kind == "CHECK"]
+
+@dataclass
+class SelectItem:
+    expression: str
+    name: str
+
+@dataclass
+class View:
+    name: str
+    database: str
+    select_list: list = field(default_factory=list)
+    # Items per SELECT of a UNION, the first one giving the column names
+    branch_sizes: list = field(default_factory=list)
+    tables: list = field(default_factory=list)
+
+    @property
+    def columns(self):
+        return [item.name for item in self.select_list]
+
+@dataclass
+class Trigger:
+    name: str
+    database: str
+    table: str
+    timing: str
+    event: str
+
+@dataclass
+class Database:
+    name: str
+    tables: dict = field(default_factory=dict)
+    views: dict = field(default_factory=dict)
+    triggers: dict = field(default_factory=dict)
+
+@dataclass
+class Schema:
+    path: str
+    databases: dict = field(default_factory=dict)
+    # Statements by their leading words, e.g. {'CREATE TABLE': 3, 'INSERT': 2}
+    statement_counts: Counter = field(default_factory=Counter)
+    errors: list = field(default_factory=list)
+
+    def table(self, name):
+        return next((database.tables[name] for database in self.databases.values() if name in database.tables), None)
+
+    def view(self, name):
+        return next((database.views[name] for database in self.databases.values() if name in database.views), None)
+
+    def tables(self):
+        return [table for database in self.databases.values() for table in database.tables.values()]
+
+    def views(self):
+        return [view for database in self.databases.values() for view in database.views.values()]
+
+    def indexes(self):
+        return [index for table in self.tables() for index in table.indexes]
+
+    def triggers(self):
+        return [trigger for database in self.databases.values() for trigger in database.triggers.values()]
+
+def unquote(text):
+    return text[1:-1].replace("``", "`") if text.startswith("`") else text
+
+class Statement:
+    """Significant tokens of one statement plus the source text between any two of them"""
+
+    def __init__(self, tokens):
+        self.tokens = [(kind, " " if kind == "comment" else text) for kind, text in refine_tokens(tokens)]
+        self.positions = [i for i, (kind, _) in enumerate(self.tokens) if kind not in SKIPPED_KINDS]
+        self.words = [self.tokens[i][1] for i in self.positions]
+        self.upper = [word.upper() for word in self.words]
+
+    def __len__(self):
+        return len(self.positions)
+
+    def text(self, start, end):
+        """Source of significant tokens start..end-1, whitespace collapsed"""
+        if start >= end:
+            return ""
+        raw = "".join(text for _, text in self.tokens[self.positions[start]:self.positions[end - 1] + 1])
+        return " ".join(raw.split())
+
+    def closing(self, start):
+        """Index of the parenthesis closing the one at start"""
+        depth = 0
+        for i in range(start, len(self.words)):
+            if self.tokens[self.positions[i]][0] != "punct":
+                continue
+            if self.words[i] == "(":
+                depth += 1
+            elif self.words[i] == ")":
+                depth -= 1
+                if depth == 0:
+                    return i
+        raise ValueError("unbalanced parentheses")
+
+    def split(self, start, end, separator=","):
+        """(start, end) ranges between top-level separators"""
+        parts, depth, part_start = [], 0, start
+        for i in range(start, end):
+            if self.tokens[self.positions[i]][0] != "punct":
+                continue
+            word = self.words[i]
+            if word == "(":
+                depth += 1
+            elif word == ")":
+                depth -= 1
+            elif word == separator and depth == 0:
+                parts.append((part_start, i))
+                part_start = i + 1
+        parts.append((part_start, end))
+        return [(a, b) for a, b in parts if a < b]
+
+    def name_list(self, start):
+        """Identifiers inside the parentheses at start, and the index after them"""
+        end = self.closing(start)
+        names = [unquote(self.words[a]) for a, _ in self.split(start + 1, end)]
+        return names, end + 1
+
+    def balanced(self):
+        depth = 0
+        for i, word in enumerate(self.words):
+            if self.tokens[self.positions[i]][0] == "punct":
+                depth += {"(": 1, ")": -1}.get(word, 0)
+                if depth < 0:
+                    return False
+        return depth == 0
+
+def parse_column(statement, start, end, table):
+    """A column definition; column-level CHECK/REFERENCES become table constraints"""
+    upper = statement.upper
+    column = Column(name=unquote(statement.words[start]), type="")
+    i = start + 1
+    type_start = i
+    while i < end and upper[i] not in COLUMN_OPTIONS:
+        i = statement.closing(i) + 1 if statement.words[i] == "(" else i + 1
+    column.type = statement.text(type_start, i)
+
+    while i < end:
+        word = upper[i]
+        if word == "NOT" and i + 1 < end and upper[i + 1] == "NULL":
+            column.nullable = False
+            i += 2
+        elif word == "NULL":
+            i += 1
+        elif word == "DEFAULT":
+            value_end = statement.closing(i + 1) + 1 if statement.words[i + 1] == "(" else i + 2
+            column.default = statement.text(i + 1, value_end)
+            i = value_end
+        elif word == "PRIMARY":
+            column.primary_key = column.unique = True
+            column.nullable = False
+            i += 2
+        elif word == "UNIQUE":
+            column.unique = True
+            i += 2 if i + 1 < end and upper[i + 1] == "KEY" else 1
+        elif word == "AUTO_INCREMENT":
+            column.auto_increment = True
+            i += 1
+        elif word == "ON" and i + 1 < end and upper[i + 1] == "UPDATE":
+            column.on_update = statement.text(i + 2, i + 3)
+            i += 3
+        elif word in ("CONSTRAINT", "CHECK"):
+            name = None
+            if word == "CONSTRAINT":
+                name, i = unquote(statement.words[i + 1]), i + 2
+            close = statement.closing(i + 1)
+            table.constraints.append(Constraint("CHECK", name, [column.name], statement.text(i + 2, close)))
+            i = close + 1
+        elif word == "REFERENCES":
+            ref_table = unquote(statement.words[i + 1])
+            ref_columns, i = statement.name_list(i + 2)
+            table.constraints.append(Constraint("FOREIGN KEY", None, [column.name], references=(ref_table, ref_columns)))
+        elif word in ("COMMENT", "COLLATE"):
+            i += 2
+        elif word == "CHARACTER":
+            i += 3
+        else:
+            i += 1
+    return column
+
+def parse_table_item(statement, start, end, table):
+    """One entry of a CREATE TABLE body: a column, a constraint or an index"""
+    upper = statement.upper
+    name = None
+    if upper[start] == "CONSTRAINT":
+        name = unquote(statement.words[start + 1])
+        start += 2
+    word = upper[start]
+
+    if word == "PRIMARY":
+        columns, _ = statement.name_list(start + 2)
+        table.constraints.append(Constraint("PRIMARY KEY", name, columns))
+        for column in columns:
+            if column in table.columns:
+                table.columns[column].primary_key = True
+                table.columns[column].nullable = False
+    elif word == "UNIQUE":
+        i = start + 1
+        if upper[i] in ("KEY", "INDEX"):
+            i += 1
+        if statement.words[i] != "(":
+            name = name or unquote(statement.words[i])
+            i += 1
+        columns, _ = statement.name_list(i)
+        table.constraints.append(Constraint("UNIQUE", name, columns))
+        table.indexes.append(Index(name, table.name, columns, unique=True))
+    elif word in ("KEY", "INDEX", "FULLTEXT"):
+        i = start + (2 if word == "FULLTEXT" else 1)
+        index_name = None
+        if statement.words[i] != "(":
+            index_name, i = unquote(statement.words[i]), i + 1
+        columns, _ = statement.name_list(i)
+        table.indexes.append(Index(index_name, table.name, columns))
+    elif word == "FOREIGN":
+        columns, i = statement.name_list(start + 2)
+        ref_table = unquote(statement.words[i + 1])
+        ref_columns, _ = statement.name_list(i + 2)
+        table.constraints.append(Constraint("FOREIGN KEY", name, columns, references=(ref_table, ref_columns)))
+    elif word == "CHECK":
+        close = statement.closing(start + 1)
+        table.constraints.append(Constraint("CHECK", name, [], statement.text(start + 2, close)))
+    else:
+        column = parse_column(statement, start, end, table)
+        table.columns[column.name] = column
+
+def parse_create_table(statement, start, database):
+    """CREATE TABLE [IF NOT EXISTS] name (...) or CREATE TABLE name AS SELECT ..."""
+    upper = statement.upper
+    i = start
+    if upper[i:i + 3] == ["IF", "NOT", "EXISTS"]:
+        i += 3
+    table = Table(unquote(statement.words[i]), database)
+    i += 1
+    if i < len(statement) and upper[i] in ("AS", "SELECT"):
+        table.as_select = statement.text(i + (upper[i] == "AS"), len(statement))
+        return table
+    if i >= len(statement) or statement.words[i] != "(":
+        raise ValueError(f"no column list for table {table.name}")
+    close = statement.closing(i)
+    for item_start, item_end in statement.split(i + 1, close):
+        parse_table_item(statement, item_start, item_end, table)
+    # Column-level UNIQUE/PRIMARY KEY imply a unique index too
+    for column in table.columns.values():
+        if column.unique and not any(index.columns == [column.name] for index in table.indexes):
+            table.indexes.append(Index(None, table.name, [column.name], unique=True))
+    return table
+
+def select_item(statement, start, end):
+    """An entry of a select list with its output column name"""
+    upper = statement.upper
+    expression_end = end
+    name = None
+    depth = 0
+    for i in range(start, end):
+        word = statement.words[i]
+        if word == "(":
+            depth += 1
+        elif word == ")":
+            depth -= 1
+        elif depth == 0 and upper[i] == "AS" and i == end - 2:
+            expression_end, name = i, unquote(statement.words[end - 1])
+    if name is None:
+        last = statement.words[end - 1]
+        if end - start == 1 or (end - start == 3 and statement.words[start + 1] == "."):
+            # column or alias.column
+            name = unquote(last)
+        elif end - start >= 2 and statement.tokens[statement.positions[end - 1]][0] in ("word", "quoted") \
+                and statement.words[end - 2] == ")":
+            # expression alias without AS
+            expression_end, name = end - 1, unquote(last)
+        else:
+            name = statement.text(start, end)
+    return SelectItem(statement.text(start, expression_end), name)
+
+def parse_create_view(statement, start, database):
+    """CREATE [OR REPLACE] [options] VIEW name [(columns)] AS SELECT ..."""
+    upper = statement.upper
+    i = upper.index("VIEW", start) + 1
+    view = View(unquote(statement.words[i]), database)
+    i += 1
+    names = None
+    if statement.words[i] == "(":
+        names, i = statement.name_list(i)
+    if upper[i] != "AS":
+        raise ValueError(f"no AS SELECT for view {view.name}")
+
+    # Split the body into UNION branches at depth 0, then each branch's select list ends at its FROM
+    depth = 0
+    branches = []
+    branch_start = i + 1
+    for j in range(i + 1, len(statement)):
+        word = statement.words[j]
+        if word == "(":
+            depth += 1
+        elif word == ")":
+            depth -= 1
+        elif depth == 0 and upper[j] == "UNION":
+            branches.append((branch_start, j))
+            branch_start = j + 2 if j + 1 < len(statement) and upper[j + 1] in ("ALL", "DISTINCT") else j + 1
+        elif upper[j] in ("FROM", "JOIN") and j + 1 < len(statement):
+            table = unquote(statement.words[j + 1])
+            if statement.words[j + 1] != "(" and table not in view.tables:
+                view.tables.append(table)
+    branches.append((branch_start, len(statement)))
+
+    for number, (branch_start, branch_end) in enumerate(branches):
+        if upper[branch_start] != "SELECT":
+            raise ValueError(f"view {view.name}: UNION branch {number + 1} is not a SELECT")
+        items_start = branch_start + 1
+        if upper[items_start] in ("DISTINCT", "ALL"):
+            items_start += 1
+        items_end = branch_end
+        depth = 0
+        for j in range(items_start, branch_end):
+            if statement.words[j] == "(":
+                depth += 1
+            elif statement.words[j] == ")":
+                depth -= 1
+            elif depth == 0 and upper[j] == "FROM":
+                items_end = j
+                break
+        items = [select_item(statement, a, b) for a, b in statement.split(items_start, items_end)]
+        view.branch_sizes.append(len(items))
+        if number == 0:
+            view.select_list = items
+    if names is not None:
+        for item, name in zip(view.select_list, names):
+            item.name = name
+    return view
+
+def parse_create_index(statement, start, database, schema):
+    """CREATE [UNIQUE] INDEX name ON table (columns)"""
+    upper = statement.upper
+    unique = upper[start] == "UNIQUE"
+    i = upper.index("INDEX", start) + 1
+    name = unquote(statement.words[i])
+    table_name = unquote(statement.words[upper.index("ON", i) + 1])
+    columns, _ = statement.name_list(upper.index("ON", i) + 2)
+    table = schema.databases[database].tables.get(table_name)
+    if table is None:
+        raise ValueError(f"index {name} on unknown table {table_name}")
+    table.indexes.append(Index(name, table_name, columns, unique))
+
+def parse_create_trigger(statement, start, database):
+    upper = statement.upper
+    i = upper.index("TRIGGER", start) + 1
+    name = unquote(statement.words[i])
+    timing, event = upper[i + 1], upper[i + 2]
+    table = unquote(statement.words[upper.index("ON", i) + 1])
+    return Trigger(name, database, table, timing, event)
+
+def drop_objects(statement, schema, database, kind):
+    """DROP TABLE/VIEW [IF EXISTS] a, b"""
+    upper = statement.upper
+    i = 2
+    if upper[i:i + 2] == ["IF", "EXISTS"]:
+        i += 2
+    objects = schema.databases[database].tables if kind == "TABLE" else schema.databases[database].views
+    for a, b in statement.split(i, len(statement)):
+        objects.pop(unquote(statement.words[b - 1]), None)
+
+def statement_kind(upper):
+    """'CREATE TABLE', 'DROP VIEW', 'INSERT', ... for the upper-cased words of a statement"""
+    if upper[0] not in ("CREATE", "DROP"):
+        return upper[0]
+    # Skip OR REPLACE, TEMPORARY, UNIQUE, ALGORITHM=..., DEFINER=... up to the object keyword
+    for word in upper[1:8]:
+        if word in ("TABLE", "VIEW", "INDEX", "TRIGGER", "DATABASE", "SCHEMA", "USER", "PROCEDURE", "FUNCTION"):
+            return f"{upper[0]} {word}"
+    return upper[0]
+
+def apply_statement(schema, statement, database):
+    """Update schema with one statement; returns the current database afterwards"""
+    upper = statement.upper
+    key = statement_kind(upper)
+    schema.statement_counts[key] += 1
+
+    if key in ("USE", "CREATE DATABASE", "CREATE SCHEMA"):
+        i = 1 if key == "USE" else 2
+        if upper[i:i + 3] == ["IF", "NOT", "EXISTS"]:
+            i += 3
+        name = unquote(statement.words[i])
+        schema.databases.setdefault(name, Database(name))
+        return name if key == "USE" else database
+
+    current = schema.databases.setdefault(database, Database(database))
+    if key == "CREATE TABLE":
+        table = parse_create_table(statement, 2, database)
+        current.tables[table.name] = table
+    elif key == "CREATE VIEW":
+        view = parse_create_view(statement, 1, database)
+        current.views[view.name] = view
+    elif key == "CREATE INDEX":
+        parse_create_index(statement, 1, database, schema)
+    elif key == "CREATE TRIGGER":
+        trigger = parse_create_trigger(statement, 1, database)
+        current.triggers[trigger.name] = trigger
+    elif key in ("DROP TABLE", "DROP VIEW"):
+        drop_objects(statement, schema, database, key.split()[1])
+    return database
+
+def parse_schema(source, path=None):
+    """Build the Schema model of a MySQL script (string or text file object)
+
+    Statements that cannot be parsed are recorded in schema.errors; the rest
+    of the file is still modelled.
+    """
+    schema = Schema(str(path) if path else "<string>")
+    database = DEFAULT_DATABASE
+    for number, tokens in enumerate(iter_statements(source), 1):
+        statement = Statement(tokens)
+        if not len(statement):
+            continue
+        if not statement.balanced():
+            schema.errors.append(f"statement {number}: unbalanced parentheses")
+            continue
+        try:
+            database = apply_statement(schema, statement, database)
+        except (ValueError, IndexError) as e:
+            schema.errors.append(f"statement {number}: {e or 'unexpected end of statement'}")
+    return schema
+
+_schema_cache = {}
+
+def load_schema(path):
+    """Schema model of a file, parsed once per file version"""
+    path = Path(path).resolve()
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _schema_cache.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    with open(path, 'r', encoding='utf-8') as f:
+        schema = parse_schema(f, path)
+    _schema_cache[path] = (key, schema)
+    return schema
+
+def main(argv=None):
+    """Print the model of one or more schema files"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Print the parsed model of MySQL schema files")
+    parser.add_argument("paths", nargs="+", help="Schema files")
+    args = parser.parse_args(argv)
+
+    for path in args.paths:
+        schema = load_schema(path)
+        print(f"{path}:")
+        for table in schema.tables():
+            print(f"  table {table.database}.{table.name}: {len(table.columns)} columns, "
+                  f"{len(table.indexes)} indexes, {len(table.checks())} checks")
+        for view in schema.views():
+            print(f"  view {view.database}.{view.name}: {len(view.columns)} columns from {', '.join(view.tables)}")
+        for error in schema.errors:
+            print(f"  error: {error}")
+
+if __name__ == "__main__":
+    main()
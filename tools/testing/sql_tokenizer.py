@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+"""
+SQL Tokenizer and Statement Splitter
+Splits MySQL scripts (schema files, migrations, mysqldump output) into
+statements in a single pass. Quotes, backticks, comments and DELIMITER
+blocks are understood, so semicolons inside trigger bodies, string
+literals and comments do not end a statement. Input is read in chunks
+and statements are yielded one at a time, so the memory used does not
+grow with the size of the file.
+"""
+
+import re
+import sys
+
+# One alternative per token kind. Every alternative can end at the end of the
+# buffer (\Z), so a token cut by a chunk boundary is rescanned after the next read.
+TOKEN_TEMPLATE = r"""
+    (?P<ws>\s+)
+  | (?P<comment>--(?=[ \t\r\n]|\Z)[^\n]*|\#[^\n]*|/\*.*?(?:\*/|\Z))
+  | (?P<string>'(?:[^'\\]+|\\.?|'')*(?:'|\Z)|"(?:[^"\\]+|\\.?|"")*(?:"|\Z))
+  | (?P<quoted>`(?:[^`]+|``)*(?:`|\Z))
+  | {code}
+  | (?P<punct>.)
+"""
+TOKEN_RE = re.compile(TOKEN_TEMPLATE.format(code=r"(?P<word>[\w$]+)"), re.VERBOSE | re.DOTALL)
+
+DEFAULT_DELIMITER = ";"
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+# Tokens that can form (part of) a statement delimiter
+DELIMITER_KINDS = ("word", "code", "punct")
+SKIPPED_KINDS = ("ws", "comment")
+
+_statement_patterns = {}
+
+def statement_token_pattern(delimiter):
+    """Token pattern for splitting on delimiter
+
+    Everything that is not whitespace, a quote, a comment or the delimiter's
+    first character is merged into 'code' runs, so the splitter handles a
+    few tokens per row of an extended INSERT instead of one per character.
+    """
+    pattern = _statement_patterns.get(delimiter)
+    if pattern is None:
+        code = r"(?P<code>[^\s'\"`\#/\-" + re.escape(delimiter[0]) + r"]+)"
+        pattern = _statement_patterns[delimiter] = re.compile(TOKEN_TEMPLATE.format(code=code), re.VERBOSE | re.DOTALL)
+    return pattern
+
+def print_status(message):
+    print(f"\033[0;32m[INFO]\033[0m {message}")
+
+def print_warning(message):
+    print(f"\033[1;33m[WARNING]\033[0m {message}")
+
+def print_error(message):
+    print(f"\033[0;31m[ERROR]\033[0m {message}")
+
+def print_step(message):
+    print(f"\033[0;34m[STEP]\033[0m {message}")
+
+class TokenStream:
+    """(kind, text) tokens of a string or a text file object, read in chunks
+
+    pattern may be replaced between tokens (iter_statements does so when a
+    DELIMITER directive changes the delimiter); text already buffered is
+    matched with the new pattern.
+    """
+
+    def __init__(self, source, chunk_size=DEFAULT_CHUNK_SIZE, pattern=TOKEN_RE):
+        self.source = source
+        self.chunk_size = chunk_size
+        self.pattern = pattern
+
+    def __iter__(self):
+        if isinstance(self.source, str):
+            buf, read, eof = self.source, None, True
+        else:
+            buf, read, eof = "", self.source.read, False
+        chunk_size = self.chunk_size
+        pos = 0
+
+        while True:
+            if pos >= len(buf):
+                if eof:
+                    return
+                buf, pos = read(chunk_size), 0
+                eof = not buf
+                continue
+
+            m = self.pattern.match(buf, pos)
+            end = m.end()
+            if end == len(buf) and not eof:
+                # The token may continue in the next chunk; read at least as much
+                # as is buffered so one very long token is not rescanned repeatedly
+                chunk = read(max(chunk_size, end - pos))
+                if chunk:
+                    buf, pos = buf[pos:] + chunk, 0
+                    continue
+                eof = True
+            yield m.lastgroup, m.group()
+            pos = end
+
+def iter_tokens(source, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield (kind, text) tokens from a string or a text file object
+
+    kind is one of ws, comment, string, quoted (backticks), word or punct.
+    """
+    return iter(TokenStream(source, chunk_size))
+
+def strip_delimiter(tokens, delimiter):
+    """Remove the trailing delimiter characters from a statement's tokens"""
+    remaining = len(delimiter)
+    while remaining:
+        kind, text = tokens.pop()
+        if len(text) > remaining:
+            tokens.append((kind, text[:-remaining]))
+            return
+        remaining -= len(text)
+
+def iter_statements(source, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield each statement of a MySQL script as a list of (kind, text) tokens
+
+    The delimiter itself is not included. DELIMITER directives change the
+    delimiter for the statements that follow and are not yielded; statements
+    holding only whitespace and comments are skipped. Words and punctuation
+    other than the delimiter come as 'code' runs; refine_tokens() splits them.
+    """
+    delimiter = DEFAULT_DELIMITER
+    tokens = []
+    significant = False
+    directive = None
+    # Text of the delimiter-capable tokens directly before the current one
+    tail = ""
+    stream = TokenStream(source, chunk_size, statement_token_pattern(delimiter))
+
+    for kind, text in stream:
+        if directive is not None:
+            # DELIMITER <text> runs to the end of the line
+            if kind == "ws" and "\n" in text:
+                delimiter = "".join(directive).strip() or DEFAULT_DELIMITER
+                stream.pattern = statement_token_pattern(delimiter)
+                directive = None
+            else:
+                directive.append(text)
+            continue
+
+        if not significant and kind == "code" and text.upper() == "DELIMITER":
+            directive = []
+            tokens = []
+            continue
+
+        tokens.append((kind, text))
+        if kind in SKIPPED_KINDS:
+            tail = ""
+            continue
+        significant = True
+        if kind not in DELIMITER_KINDS:
+            tail = ""
+            continue
+
+        if len(delimiter) == 1:
+            # Code runs never contain the delimiter's first character
+            if text != delimiter:
+                continue
+        else:
+            tail = (tail + text)[-len(delimiter):]
+            if tail != delimiter:
+                continue
+        strip_delimiter(tokens, delimiter)
+        if any(kind not in SKIPPED_KINDS for kind, _ in tokens):
+            yield tokens
+        tokens, significant, tail = [], False, ""
+
+    if directive is not None:
+        return
+    if significant:
+        yield tokens
+
+def statement_text(tokens):
+    """Source text of a statement, without surrounding whitespace"""
+    return "".join(text for _, text in tokens).strip()
+
+def refine_tokens(tokens):
+    """Split the code runs of a statement into word and punct tokens"""
+    refined = []
+    for kind, text in tokens:
+        if kind == "code":
+            refined.extend((m.lastgroup, m.group()) for m in TOKEN_RE.finditer(text))
+        else:
+            refined.append((kind, text))
+    return refined
+
+def unique_constraint(tokens):
+    """UNIQUE KEY name (columns) -> UNIQUE (columns)"""
+    columns = next(i for i, (kind, text) in enumerate(tokens) if text == "(")
+    return "UNIQUE " + statement_text(tokens[columns:])
+
+# MySQL -> SQLite rewrites, tried at each word (or comma) token. A pattern is a
+# sequence of significant tokens: words compared case-insensitively, None matches
+# any token, PARENTHESIZED a balanced (...) group, STRING a string literal and a
+# compiled regex a word it fully matches. The replacement is a string or a
+# function of the matched tokens.
+PARENTHESIZED = "(...)"
+STRING = "'...'"
+# utf8mb4_unicode_ci, latin1_bin, binary...: unlike a column type, never a plain word
+COLLATION_NAME = re.compile(r"binary|[a-z0-9]+_\w+", re.IGNORECASE)
+SQLITE_REWRITES = (
+    # SQLite only accepts AUTOINCREMENT after INTEGER PRIMARY KEY
+    (("INT", "AUTO_INCREMENT", "PRIMARY", "KEY"), "INTEGER PRIMARY KEY AUTOINCREMENT"),
+    (("TIMESTAMP", "DEFAULT", "CURRENT_TIMESTAMP", "ON", "UPDATE", "CURRENT_TIMESTAMP"), "DATETIME DEFAULT CURRENT_TIMESTAMP"),
+    (("TIMESTAMP", "DEFAULT", "CURRENT_TIMESTAMP"), "DATETIME DEFAULT CURRENT_TIMESTAMP"),
+    (("ON", "UPDATE", "CURRENT_TIMESTAMP"), ""),
+    (("AUTO_INCREMENT", "=", None), ""),
+    (("AUTO_INCREMENT",), ""),
+    (("DECIMAL", "(", None, ",", None, ")"), "REAL"),
+    (("VARCHAR", "(", None, ")"), "TEXT"),
+    (("ENUM", PARENTHESIZED), "TEXT"),
+    (("SET", PARENTHESIZED), "TEXT"),
+    (("INT",), "INTEGER"),
+    (("CHAR_LENGTH", "("), "LENGTH("),
+    (("CHARACTER", "SET", None), ""),
+    # Only before a collation name: `collate` may also be a column name
+    (("COLLATE", COLLATION_NAME), ""),
+    (("COLLATE", STRING), ""),
+    (("UNIQUE", "KEY", None, PARENTHESIZED), unique_constraint),
+    (("UNIQUE", "INDEX", None, PARENTHESIZED), unique_constraint),
+    ((",", "KEY", None, PARENTHESIZED), ""),
+    ((",", "INDEX", None, PARENTHESIZED), ""),
+    ((",", "FULLTEXT", "KEY", None, PARENTHESIZED), ""),
+    (("USING", "BTREE"), ""),
+    (("USING", "HASH"), ""),
+    (("INSERT", "IGNORE"), "INSERT OR IGNORE"),
+)
+# Column and index comments, only in CREATE TABLE / ALTER TABLE: elsewhere
+# `comment 'x'` is a column with a string alias
+SQLITE_TABLE_REWRITES = (
+    (("COMMENT", STRING), ""),
+)
+# mysqldump table options, only in CREATE TABLE / ALTER TABLE outside the column
+# list, so `SET comment = 'x'` or `CHECK (engine = 'x')` keep their column
+SQLITE_TABLE_OPTION_REWRITES = (
+    (("ENGINE", "=", None), ""),
+    (("DEFAULT", "CHARSET", "=", None), ""),
+    (("CHARSET", "=", None), ""),
+    (("ROW_FORMAT", "=", None), ""),
+    (("COLLATE", "=", COLLATION_NAME), ""),
+    (("COMMENT", "=", STRING), ""),
+)
+TABLE_STATEMENTS = (["CREATE", "TABLE"], ["ALTER", "TABLE"])
+
+def rewrites_by_word(rewrites):
+    by_word = {}
+    for pattern, replacement in rewrites:
+        by_word.setdefault(pattern[0], []).append((pattern, replacement))
+    return by_word
+
+SQLITE_REWRITES_BY_WORD = rewrites_by_word(SQLITE_REWRITES)
+SQLITE_TABLE_REWRITES_BY_WORD = rewrites_by_word(SQLITE_TABLE_REWRITES)
+SQLITE_TABLE_OPTION_REWRITES_BY_WORD = rewrites_by_word(SQLITE_TABLE_OPTION_REWRITES)
+WORD_RE = re.compile(r"[\w$]+")
+# Literal forms fixed up in every code run: _binary introducers and 0x hex literals
+LITERAL_FIXUP_RE = re.compile(r"(?<![\w$])(?:_binary\b|0x([0-9a-f]+)(?![\w$]))", re.IGNORECASE)
+# Statements containing none of these words (most INSERTs) skip the token-level
+# rewrite. Every word of a pattern must be present, so the last one is checked.
+SQLITE_REWRITE_WORDS_RE = re.compile(r"(?<![\w$])(?:" + "|".join(sorted({
+    [element for element in pattern if isinstance(element, str) and WORD_RE.fullmatch(element)][-1]
+    for pattern, _ in SQLITE_REWRITES + SQLITE_TABLE_REWRITES + SQLITE_TABLE_OPTION_REWRITES})) + r")(?![\w$])",
+    re.IGNORECASE)
+
+# Statements with no SQLite equivalent: (first word, second word or None for any)
+SQLITE_SKIPPED_STATEMENTS = (
+    ("USE", None),
+    ("CREATE", "DATABASE"),
+    ("CREATE", "SCHEMA"),
+    ("CREATE", "USER"),
+    ("CREATE", "TRIGGER"),
+    ("CREATE", "PROCEDURE"),
+    ("CREATE", "FUNCTION"),
+    ("GRANT", None),
+    ("FLUSH", None),
+    ("SET", None),
+    ("LOCK", "TABLES"),
+    ("UNLOCK", "TABLES"),
+    ("START", "TRANSACTION"),
+)
+
+# MySQL backslash escapes; \% and \_ keep their backslash, any other escaped character stands for itself
+MYSQL_ESCAPES = {"0": "\0", "b": "\b", "n": "\n", "r": "\r", "t": "\t", "Z": "\x1a", "%": "\\%", "_": "\\_"}
+SURROGATE_RE = re.compile("[\ud800-\udfff]")
+MYSQL_ESCAPE_RE = re.compile(r"\\(.?)|''|\"\"", re.DOTALL)
+
+def mysql_string_value(text):
+    """Value of a MySQL string literal token ('...' or "...")"""
+    quote = text[0]
+    body = text[1:-1] if len(text) > 1 and text.endswith(quote) else text[1:]
+
+    def unescape(m):
+        if m.group(1) is not None:
+            return MYSQL_ESCAPES.get(m.group(1), m.group(1))
+        # A doubled quote only stands for one inside strings using that quote
+        return quote if m.group() == quote * 2 else m.group()
+
+    return MYSQL_ESCAPE_RE.sub(unescape, body)
+
+def sqlite_string_literal(text):
+    """Re-quote a MySQL string literal token for SQLite, which has no backslash escapes
+
+    Values SQLite cannot take as text (NUL characters, or bytes that were not
+    UTF-8 when the file was read with errors='surrogateescape') become blobs.
+    """
+    if text[0] == "'" and "\\" not in text and (text.isascii() or not SURROGATE_RE.search(text)):
+        return text
+    value = mysql_string_value(text)
+    if "\0" in value or SURROGATE_RE.search(value):
+        return "X'" + value.encode('utf-8', 'surrogateescape').hex() + "'"
+    return "'" + value.replace("'", "''") + "'"
+
+def sqlite_code(text):
+    """Drop _binary introducers and turn 0x hex literals into SQLite blobs"""
+    if "_" not in text and "0" not in text:
+        return text
+    return LITERAL_FIXUP_RE.sub(lambda m: f"X'{m.group(1)}'" if m.group(1) else "", text)
+
+def match_pattern(tokens, start, pattern):
+    """Index just past pattern if it matches the significant tokens from start, else None"""
+    i = start
+    for expected in pattern:
+        while i < len(tokens) and tokens[i][0] in SKIPPED_KINDS:
+            i += 1
+        if i == len(tokens):
+            return None
+        if expected is PARENTHESIZED:
+            if tokens[i][1] != "(":
+                return None
+            depth = 0
+            while i < len(tokens):
+                if tokens[i][0] == "punct":
+                    depth += {"(": 1, ")": -1}.get(tokens[i][1], 0)
+                    if depth == 0:
+                        break
+                i += 1
+            else:
+                return None
+        elif expected is STRING:
+            if tokens[i][0] != "string":
+                return None
+        elif isinstance(expected, re.Pattern):
+            if tokens[i][0] != "word" or not expected.fullmatch(tokens[i][1]):
+                return None
+        elif expected is not None and tokens[i][1].upper() != expected:
+            return None
+        i += 1
+    return i
+
+def leading_words(tokens, count=2):
+    """The first count words of a statement, upper-cased (comments ignored)"""
+    head = " ".join(text for kind, text in tokens[:16] if kind in ("word", "code"))
+    return [word.upper() for word in WORD_RE.findall(head)[:count]]
+
+def rewrite_mysql_to_sqlite(tokens):
+    """SQLite text of one MySQL statement, or None if SQLite has no equivalent
+
+    Rewrites apply to code only, never inside strings or comments. Comments
+    are dropped (including mysqldump's /*!...*/ version comments, so views
+    and triggers in a dump are skipped) and string literals re-quoted.
+    """
+    words = leading_words(tokens)
+    for first, second in SQLITE_SKIPPED_STATEMENTS:
+        if words[:1] == [first] and (second is None or words[1:2] == [second]):
+            return None
+
+    if not any(kind == "code" and SQLITE_REWRITE_WORDS_RE.search(text) for kind, text in tokens):
+        # Nothing to rewrite at token level: fix up literals only
+        sql = "".join(sqlite_code(text) if kind == "code" else sqlite_string_literal(text) if kind == "string"
+                      else " " if kind == "comment" else text for kind, text in tokens).strip()
+        return sql or None
+
+    table_statement = words in TABLE_STATEMENTS
+    tokens = refine_tokens(tokens)
+    out = []
+    depth = 0
+    i = 0
+    while i < len(tokens):
+        kind, text = tokens[i]
+        if kind == "comment":
+            out.append(" ")
+            i += 1
+            continue
+        if kind == "word" or (kind == "punct" and text == ","):
+            word = text.upper()
+            candidates = SQLITE_REWRITES_BY_WORD.get(word, [])
+            if table_statement:
+                candidates = candidates + SQLITE_TABLE_REWRITES_BY_WORD.get(word, [])
+                if depth == 0:
+                    candidates = candidates + SQLITE_TABLE_OPTION_REWRITES_BY_WORD.get(word, [])
+            for pattern, replacement in candidates:
+                end = match_pattern(tokens, i, pattern)
+                if end is not None:
+                    out.append(replacement(tokens[i:end]) if callable(replacement) else replacement)
+                    depth += sum({"(": 1, ")": -1}.get(t, 0) for k, t in tokens[i:end] if k == "punct")
+                    i = end
+                    break
+            else:
+                out.append(sqlite_code(text))
+                i += 1
+            continue
+        if kind == "string":
+            out.append(sqlite_string_literal(text))
+        else:
+            out.append(text)
+            if kind == "punct":
+                depth += {"(": 1, ")": -1}.get(text, 0)
+        i += 1
+
+    sql = "".join(out).strip()
+    return sql or None
+
+def iter_sqlite_statements(source, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield the SQLite version of every statement in a MySQL script, ready for execute()"""
+    for tokens in iter_statements(source, chunk_size):
+        sql = rewrite_mysql_to_sqlite(tokens)
+        if sql is not None:
+            yield sql
+
+def main(argv=None):
+    """Convert a MySQL script to SQLite statements on stdout"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Split a MySQL script into statements, optionally converted for SQLite")
+    parser.add_argument("path", help="SQL file (- for stdin)")
+    parser.add_argument("--raw", action="store_true", help="Print the statements unchanged instead of converting them")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.path == "-" else open(args.path, 'r', encoding='utf-8')
+    try:
+        if args.raw:
+            statements = (statement_text(tokens) for tokens in iter_statements(source))
+        else:
+            statements = iter_sqlite_statements(source)
+        for sql in statements:
+            sys.stdout.write(sql)
+            sys.stdout.write(";\n")
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+TO Summary Benchmark Test
+Runs tools/benchmarks/benchmark_to_summary.py on a tiny dataset and checks
+the per-stage results, the history file and the regression check.
+"""
+
+import copy
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+
+import benchmark_to_summary as benchmark
+
+def print_status(message):
+    print(f"\033[0;32m[INFO]\033[0m {message}")
+
+def print_warning(message):
+    print(f"\033[1;33m[WARNING]\033[0m {message}")
+
+def print_error(message):
+    print(f"\033[0;31m[ERROR]\033[0m {message}")
+
+def print_step(message):
+    print(f"\033[0;34m[STEP]\033[0m {message}")
+
+def test_run_records_every_stage():
+    """Each stage reports time, memory and throughput; runs append to the history"""
+    print_step("Benchmarking 200 synthetic projects")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        run = benchmark.run_benchmarks([200], seed=1, repeat=1, data_dir=tmpdir)
+        history_path = Path(tmpdir) / "history.json"
+        assert benchmark.append_history(history_path, run) == 1
+        assert benchmark.append_history(history_path, run) == 2
+
+    stages = run["scales"]["200"]
+    assert tuple(stages) == benchmark.STAGES, list(stages)
+    for stage, result in stages.items():
+        assert result["seconds"] > 0 and result["peak_mb"] > 0 and result["records_per_second"] > 0, (stage, result)
+    assert stages["create_to_summary_records"]["records"] == 200, stages["create_to_summary_records"]
+    timings = ', '.join(f"{stage}: {result['seconds']}s" for stage, result in stages.items())
+    print_status(f"✅ {timings}")
+
+def test_json_stage_excludes_mapping_csv():
+    """save_to_summary_json writes the JSON only; the mapping rows belong to the CSV stage"""
+    print_step("Running the stages with the CSV stage stubbed out")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        dataset_dir = benchmark.prepare_dataset(tmpdir, 50, 1)
+        generate_field_mapping_csv = benchmark.generator.generate_field_mapping_csv
+        benchmark.generator.generate_field_mapping_csv = lambda mapping_rows: None
+        try:
+            benchmark.benchmark_scale(dataset_dir, 1, trace_memory=False)
+        finally:
+            benchmark.generator.generate_field_mapping_csv = generate_field_mapping_csv
+        mapping_lines = (dataset_dir / benchmark.generator.FIELD_MAPPING_CSV_PATH).read_text(encoding="utf-8").splitlines()
+        records = json.loads((dataset_dir / benchmark.generator.TO_SUMMARY_JSON_PATH).read_text(encoding="utf-8"))
+    assert mapping_lines == [",".join(benchmark.generator.FIELD_MAPPING_CSV_HEADER)], mapping_lines[:3]
+    assert len(records) == 50, len(records)
+    print_status("✅ JSON stage wrote 50 records and no mapping rows")
+
+def test_regression_detection():
+    """Only slowdowns beyond the threshold on stages above the noise floor count"""
+    print_step("Comparing against a synthetic baseline")
+    baseline = {"scales": {"1000": {
+        "load_domain_data": {"seconds": 1.0, "peak_mb": 100.0},
+        "save_to_summary_json": {"seconds": 0.01, "peak_mb": 2.0},
+    }}}
+    run = copy.deepcopy(baseline)
+    run["scales"]["1000"]["load_domain_data"]["seconds"] = 1.1
+    run["scales"]["1000"]["save_to_summary_json"]["seconds"] = 0.05
+    assert benchmark.compare_to_baseline(run, baseline, threshold=0.2) == []
+
+    run["scales"]["1000"]["load_domain_data"] = {"seconds": 1.5, "peak_mb": 130.0}
+    regressions = benchmark.compare_to_baseline(run, baseline, threshold=0.2)
+    assert [(item["stage"], item["metric"]) for item in regressions] == [
+        ("load_domain_data", "seconds"), ("load_domain_data", "peak_mb")], regressions
+    assert regressions[0]["change"] == 0.5
+    print_status(f"✅ {len(regressions)} regressions found")
+
+def main():
+    """Main test function"""
+    print("=" * 60)
+    print("TO Summary Benchmark Test")
+    print("=" * 60)
+
+    failed = False
+    for test in (test_run_records_every_stage, test_json_stage_excludes_mapping_csv, test_regression_detection):
+        try:
+            test()
+        except AssertionError as e:
+            print_error(f"❌ {e}")
+            failed = True
+        print()
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
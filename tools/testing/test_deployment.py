@@ -10,6 +10,14 @@ import os
 import re
 import sys
 from datetime import datetime
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+SCHEMA_DIR = REPO_ROOT / 'app' / 'database' / 'schemas'
+NX_SCHEMA_PATH = SCHEMA_DIR / 'nx-domain-schema-new.sql'
+sys.path.insert(0, str(REPO_ROOT / 'tools' / 'maintenance'))
+
+from sql_tokenizer import iter_sqlite_statements
 
 def print_status(message):
     print(f"\033[0;32m[INFO]\033[0m {message}")
@@ -24,29 +32,12 @@ def print_step(message):
     print(f"\033[0;34m[STEP]\033[0m {message}")
 
 def convert_mysql_to_sqlite(mysql_sql):
-    """Convert MySQL SQL to SQLite compatible SQL"""
-    sqlite_sql = mysql_sql
-    
-    # Convert MySQL-specific syntax to SQLite
-    conversions = [
-        (r'AUTO_INCREMENT', 'AUTOINCREMENT'),
-        (r'TIMESTAMP DEFAULT CURRENT_TIMESTAMP', 'DATETIME DEFAULT CURRENT_TIMESTAMP'),
-        (r'TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP', 'DATETIME DEFAULT CURRENT_TIMESTAMP'),
-        (r'DECIMAL\(\d+,\d+\)', 'REAL'),
-        (r'VARCHAR\(\d+\)', 'TEXT'),
-        (r'INT\b', 'INTEGER'),
-        (r'CREATE DATABASE.*?;', ''),
-        (r'USE .*?;', ''),
-        (r'CHARACTER SET.*?;', ';'),
-        (r'COLLATE .*?;', ';'),
-        (r'DELIMITER.*?DELIMITER ;', ''),
-        (r'CREATE TRIGGER.*?END//\s*', ''),
-    ]
-    
-    for pattern, replacement in conversions:
-        sqlite_sql = re.sub(pattern, replacement, sqlite_sql, flags=re.IGNORECASE | re.DOTALL)
-    
-    return sqlite_sql
+    """Convert MySQL SQL to SQLite compatible SQL, one statement per line ending in ';'
+
+    Prefer iter_sqlite_statements(): the text returned here cannot be split on ';'
+    safely once a string literal contains one.
+    """
+    return "".join(f"{statement};\n" for statement in iter_sqlite_statements(mysql_sql))
 
 def test_it_domain_schema():
     """Test IT Domain schema changes"""
@@ -58,20 +49,16 @@ def test_it_domain_schema():
     
     try:
         # Read and execute old schema
-        with open('/workspace/dv_website/database/it-domain-schema.sql', 'r') as f:
+        with open(SCHEMA_DIR / 'it-domain-schema.sql', 'r', encoding='utf-8') as f:
             old_schema = f.read()
         
-        # Convert to SQLite and execute
-        sqlite_old = convert_mysql_to_sqlite(old_schema)
-        
-        # Execute statements one by one
-        for statement in sqlite_old.split(';'):
-            if statement.strip():
-                try:
-                    cursor.execute(statement)
-                except sqlite3.Error as e:
-                    if 'already exists' not in str(e):
-                        print_warning(f"Old schema statement failed: {e}")
+        # Convert to SQLite and execute statements one by one
+        for statement in iter_sqlite_statements(old_schema):
+            try:
+                cursor.execute(statement)
+            except sqlite3.Error as e:
+                if 'already exists' not in str(e):
+                    print_warning(f"Old schema statement failed: {e}")
         
         # Check old tables
         cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
@@ -82,18 +69,15 @@ def test_it_domain_schema():
         new_conn = sqlite3.connect(':memory:')
         new_cursor = new_conn.cursor()
         
-        with open('/workspace/dv_website/database/it-domain-schema-new.sql', 'r') as f:
+        with open(SCHEMA_DIR / 'it-domain-schema-new.sql', 'r', encoding='utf-8') as f:
             new_schema = f.read()
         
-        sqlite_new = convert_mysql_to_sqlite(new_schema)
-        
-        for statement in sqlite_new.split(';'):
-            if statement.strip():
-                try:
-                    new_cursor.execute(statement)
-                except sqlite3.Error as e:
-                    if 'already exists' not in str(e):
-                        print_warning(f"New schema statement failed: {e}")
+        for statement in iter_sqlite_statements(new_schema):
+            try:
+                new_cursor.execute(statement)
+            except sqlite3.Error as e:
+                if 'already exists' not in str(e):
+                    print_warning(f"New schema statement failed: {e}")
         
         # Check new tables
         new_cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
@@ -150,18 +134,15 @@ def test_nx_domain_schema():
     
     try:
         # Read and execute new schema
-        with open('/workspace/dv_website/database/nx-domain-schema-new.sql', 'r') as f:
+        with open(NX_SCHEMA_PATH, 'r', encoding='utf-8') as f:
             new_schema = f.read()
         
-        sqlite_new = convert_mysql_to_sqlite(new_schema)
-        
-        for statement in sqlite_new.split(';'):
-            if statement.strip():
-                try:
-                    cursor.execute(statement)
-                except sqlite3.Error as e:
-                    if 'already exists' not in str(e):
-                        print_warning(f"NX schema statement failed: {e}")
+        for statement in iter_sqlite_statements(new_schema):
+            try:
+                cursor.execute(statement)
+            except sqlite3.Error as e:
+                if 'already exists' not in str(e):
+                    print_warning(f"NX schema statement failed: {e}")
         
         # Check tables
         cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
@@ -205,12 +186,144 @@ def test_nx_domain_schema():
     finally:
         conn.close()
 
+def execute_mysql(cursor, sql):
+    """Run MySQL statements in SQLite, skipping the ones SQLite has no equivalent for"""
+    for statement in iter_sqlite_statements(sql):
+        try:
+            cursor.execute(statement)
+        except sqlite3.Error:
+            pass
+
+def new_nx_database():
+    """An NX database created from nx-domain-schema-new.sql"""
+    conn = sqlite3.connect(':memory:')
+    with open(NX_SCHEMA_PATH, 'r', encoding='utf-8') as f:
+        execute_mysql(conn.cursor(), f.read())
+    return conn
+
+def migrated_nx_database():
+    """An NX database deployed by combined-init.sql before imported_it_data had updated_at, then migrated"""
+    conn = sqlite3.connect(':memory:')
+    cursor = conn.cursor()
+    with open(SCHEMA_DIR / 'combined-init.sql', 'r', encoding='utf-8') as f:
+        init_sql = f.read()
+    execute_mysql(cursor, init_sql[init_sql.index('USE nx_domain_db;'):])
+    cursor.execute("DROP INDEX idx_imported_updated_at")
+    cursor.execute("ALTER TABLE imported_it_data DROP COLUMN updated_at")
+    # A row imported before the migration, in the old column order
+    cursor.execute(
+        "INSERT INTO imported_it_data (project_name, spip_ip, ip, task_index, business_unit, import_date) "
+        "VALUES ('RL3333', 'XXXX_IP-RL3333', 'IP-RL3333', 'T-RL3333', 'PC', '2024-01-01 00:00:00')")
+    conn.commit()
+    
+    with open(SCHEMA_DIR / 'migration-script.sql', 'r', encoding='utf-8') as f:
+        migration_sql = f.read()
+    execute_mysql(cursor, migration_sql[migration_sql.index('USE nx_domain_db;'):])
+    conn.commit()
+    
+    migrated = cursor.execute(
+        "SELECT task_index, ip, business_unit, updated_at FROM imported_it_data WHERE project_name = 'RL3333'").fetchall()
+    assert migrated == [('T-RL3333', 'IP-RL3333', 'PC', '2024-01-01 00:00:00')], migrated
+    return conn
+
+def check_materialized_parity(conn, database):
+    """Refresh to_summary_materialized through full, incremental and delete scenarios, comparing it with the view"""
+    from refresh_to_summary import SUMMARY_COLUMNS, refresh_to_summary
+    
+    cursor = conn.cursor()
+    
+    def insert_it(project, import_date):
+        cursor.execute(
+            "INSERT INTO imported_it_data (project_name, task_index, ip, business_unit, reuse_ip, import_date, updated_at) "
+            "VALUES (?, ?, ?, 'CN', 'Y', COALESCE(?, CURRENT_TIMESTAMP), COALESCE(?, CURRENT_TIMESTAMP))",
+            (project, f"T-{project}", f"IP-{project}", import_date, import_date))
+    
+    def sorted_rows(sql):
+        return sorted(cursor.execute(sql).fetchall(), key=lambda row: tuple(str(value) for value in row))
+    
+    def assert_parity(label):
+        columns = ', '.join(SUMMARY_COLUMNS)
+        view_rows = sorted_rows(f"SELECT {columns} FROM to_summary_view")
+        materialized_rows = sorted_rows(f"SELECT {columns} FROM to_summary_materialized")
+        assert view_rows == materialized_rows, f"{database}, {label}: materialized rows differ from to_summary_view"
+        print_status(f"✅ {database}, {label}: {len(view_rows)} rows match to_summary_view")
+    
+    # Older rows with a single newest row per table, so the watermark second is predictable
+    cursor.execute("UPDATE coverage_reports SET updated_at = '2024-01-01 00:00:00' WHERE project_name = 'RL1234'")
+    cursor.execute("UPDATE coverage_reports SET updated_at = '2024-01-02 00:00:00' WHERE project_name = 'RLE1339'")
+    cursor.execute(
+        "INSERT INTO coverage_reports (project_name, line_coverage, updated_at) "
+        "VALUES ('RL5555', 70.0, '2024-01-01 00:00:00')")
+    insert_it('RL7777', '2024-01-01 00:00:00')
+    insert_it('RL9999', '2024-01-01 00:00:00')
+    insert_it('RLE1339', '2024-01-02 00:00:00')
+    conn.commit()
+    
+    stats = refresh_to_summary(conn)
+    assert stats["mode"] == "full", stats
+    assert_parity("full refresh")
+    untouched_id = cursor.execute("SELECT id FROM to_summary_materialized WHERE project = 'RL7777'").fetchone()[0]
+    
+    # Updates, inserts and deletes across all three source tables
+    cursor.execute("UPDATE coverage_reports SET line_coverage = 50.0, updated_at = CURRENT_TIMESTAMP WHERE project_name = 'RL1234'")
+    # combined-init.sql already has a version_control row for RLE1339; the new schema's sample row fails its CHECK
+    cursor.execute(
+        "INSERT INTO version_control (project_name, git_version) VALUES ('RLE1339', 'abc1234') "
+        "ON CONFLICT (project_name) DO UPDATE SET git_version = excluded.git_version, updated_at = CURRENT_TIMESTAMP")
+    cursor.execute("DELETE FROM imported_it_data WHERE project_name = 'RL9999'")
+    cursor.execute("DELETE FROM coverage_reports WHERE project_name = 'RL5555'")
+    insert_it('RL1234', None)
+    conn.commit()
+    
+    stats = refresh_to_summary(conn)
+    assert stats["mode"] == "incremental", stats
+    assert_parity("incremental refresh")
+    
+    # RL1234/RLE1339 changed, RL9999/RL5555 lost their source rows; RL7777 is left alone
+    assert stats["projects"] == 4 and stats["stale"] == 2, stats
+    assert cursor.execute("SELECT id FROM to_summary_materialized WHERE project = 'RL7777'").fetchone()[0] == untouched_id
+    print_status(f"✅ {database}, incremental refresh recomputed {stats['projects']} projects ({stats['stale']} deleted)")
+    
+    # project_name is not unique: losing one of two rows moves no watermark
+    insert_it('RL7777', '2024-01-01 00:00:00')
+    conn.commit()
+    refresh_to_summary(conn, full=True)
+    cursor.execute(
+        "DELETE FROM imported_it_data WHERE id = (SELECT MIN(id) FROM imported_it_data WHERE project_name = 'RL7777')")
+    conn.commit()
+    stats = refresh_to_summary(conn)
+    assert stats["stale"] == 1, stats
+    assert_parity("partial delete")
+    
+    # An in-place update, as importITData's ON DUPLICATE KEY UPDATE does; MySQL bumps updated_at
+    cursor.execute(
+        "UPDATE imported_it_data SET ip = 'IP-updated', updated_at = CURRENT_TIMESTAMP WHERE project_name = 'RLE1339'")
+    conn.commit()
+    stats = refresh_to_summary(conn)
+    assert stats["stale"] == 0, stats
+    assert_parity("in-place update")
+    
+    stats = refresh_to_summary(conn, full=True)
+    assert_parity("forced full refresh")
+
+def test_to_summary_materialized_parity():
+    """Test that the materialized TO summary matches to_summary_view after full and incremental refreshes,
+    on a new NX database and on one brought up to date by migration-script.sql"""
+    print_step("Testing Materialized TO Summary Refresh")
+    
+    for database, connect in (("New schema", new_nx_database), ("Migrated", migrated_nx_database)):
+        conn = connect()
+        try:
+            check_materialized_parity(conn, database)
+        finally:
+            conn.close()
+
 def test_migration_script():
     """Test migration script syntax"""
     print_step("Testing Migration Script")
     
     try:
-        with open('/workspace/dv_website/database/migration-script.sql', 'r') as f:
+        with open(SCHEMA_DIR / 'migration-script.sql', 'r', encoding='utf-8') as f:
             migration_sql = f.read()
         
         # Check for key migration components
@@ -312,6 +425,15 @@ def main():
     test_nx_domain_schema()
     print()
     
+    # Test materialized TO summary refresh
+    failed = False
+    try:
+        test_to_summary_materialized_parity()
+    except Exception as e:
+        print_error(f"❌ Materialized TO summary test failed: {e}")
+        failed = True
+    print()
+    
     # Test migration script
     test_migration_script()
     print()
@@ -324,6 +446,9 @@ def main():
     print("TEST SUMMARY")
     print("=" * 60)
     print()
+    if failed:
+        print_error("❌ Materialized TO summary does not match to_summary_view")
+        sys.exit(1)
     print_status("✅ All database schema files are syntactically correct")
     print_status("✅ Schema changes can be applied successfully")
     print_status("✅ Migration script includes all necessary components")
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Domain Data Cache Test
+Checks the --cache path of generate_to_summary_from_domains.py: a second
+load is a hit, a content change is a miss even when size and mtime are
+kept, so is a change to the fields --slim keeps, and the least recently
+used cache files are evicted first.
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+DATA_GENERATION_DIR = Path(__file__).resolve().parent.parent / "data-generation"
+sys.path.insert(0, str(DATA_GENERATION_DIR))
+
+import generate_to_summary_from_domains as generator
+
+def print_status(message):
+    print(f"\033[0;32m[INFO]\033[0m {message}")
+
+def print_warning(message):
+    print(f"\033[1;33m[WARNING]\033[0m {message}")
+
+def print_error(message):
+    print(f"\033[0;31m[ERROR]\033[0m {message}")
+
+def print_step(message):
+    print(f"\033[0;34m[STEP]\033[0m {message}")
+
+@contextmanager
+def fixture_copy():
+    """A temporary working directory holding a copy of the ideal domain fixtures"""
+    previous = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for name in ("IT_Domain", "NX_Domain"):
+            shutil.copytree(DATA_GENERATION_DIR / name, Path(tmpdir) / name)
+        os.chdir(tmpdir)
+        try:
+            yield Path(tmpdir)
+        finally:
+            os.chdir(previous)
+
+def canonical(value):
+    return json.dumps(value, ensure_ascii=False, sort_keys=True, default=str)
+
+def test_cache_hit():
+    """The second load comes from the cache and equals a fresh parse"""
+    print_step("Loading the fixtures twice through the cache")
+    with fixture_copy() as tmpdir:
+        cache_dir = tmpdir / "cache"
+        _, _, hit = generator.load_domain_data_cached(cache_dir)
+        assert not hit
+        domain_data, domain_index, hit = generator.load_domain_data_cached(cache_dir)
+        assert hit
+        assert canonical(domain_data) == canonical(generator.load_domain_data())
+        assert domain_index["projects"] == generator.build_domain_index(*domain_data[:2], domain_data[3])["projects"]
+        assert len(list(cache_dir.glob("*.pickle"))) == 1
+    print_status("✅ Second load was a hit")
+
+def test_cache_invalidation():
+    """Content changes and slim field changes miss; a touch alone still hits"""
+    print_step("Changing a source file and the slim field set")
+    with fixture_copy() as tmpdir:
+        cache_dir = tmpdir / "cache"
+        path = generator.IT_DV_TASKS_PATH
+        generator.load_domain_data_cached(cache_dir)
+
+        os.utime(path)
+        assert generator.load_domain_data_cached(cache_dir)[2], "touching a file invalidated the cache"
+
+        # Same size, same mtime, different content
+        stat = path.stat()
+        path.write_bytes(path.read_bytes().replace(b'"DV_Tasks"', b'"DV_Taskz"', 1))
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        assert path.stat().st_size == stat.st_size and path.stat().st_mtime_ns == stat.st_mtime_ns
+        domain_data, _, hit = generator.load_domain_data_cached(cache_dir)
+        assert not hit, "a content change with the same size and mtime was served from the cache"
+        assert domain_data[1][0]["sheet"] == "DV_Taskz", domain_data[1][0]["sheet"]
+
+        assert generator.load_domain_data_cached(cache_dir, slim=True)[2] is False
+        assert generator.load_domain_data_cached(cache_dir, slim=True)[2] is True
+        fields = generator.IT_DV_TASKS_FIELDS
+        generator.IT_DV_TASKS_FIELDS = fields + ("Load Multiplier",)
+        try:
+            domain_data, _, hit = generator.load_domain_data_cached(cache_dir, slim=True)
+        finally:
+            generator.IT_DV_TASKS_FIELDS = fields
+        assert not hit, "a new slim field was served from a cache without it"
+        assert "Load Multiplier" in domain_data[1][0]["data"], domain_data[1][0]["data"]
+    print_status("✅ Content and field changes missed, a touch hit")
+
+def test_lru_eviction():
+    """Over the size limit, the least recently used cache files go first"""
+    print_step("Filling a small cache directory")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache_dir = Path(tmpdir)
+        payload = {"domain_data": os.urandom(10_000)}
+        max_bytes = 25_000
+        assert generator.save_domain_cache(cache_dir, "a", payload, max_bytes) == 0
+        assert generator.save_domain_cache(cache_dir, "b", payload, max_bytes) == 0
+        # a is older than b until it is read again
+        os.utime(cache_dir / "a.pickle", ns=(1_000_000_000, 1_000_000_000))
+        os.utime(cache_dir / "b.pickle", ns=(2_000_000_000, 2_000_000_000))
+        assert generator.load_domain_cache(cache_dir, "a") == payload
+
+        assert generator.save_domain_cache(cache_dir, "c", payload, max_bytes) == 1
+        remaining = sorted(path.stem for path in cache_dir.glob("*.pickle"))
+        assert remaining == ["a", "c"], remaining
+        assert generator.load_domain_cache(cache_dir, "b") is None
+    print_status(f"✅ Kept {remaining}")
+
+def main():
+    """Main test function"""
+    print("=" * 60)
+    print("Domain Data Cache Test")
+    print("=" * 60)
+
+    failed = False
+    for test in (test_cache_hit, test_cache_invalidation, test_lru_eviction):
+        try:
+            test()
+        except AssertionError as e:
+            print_error(f"❌ {e}")
+            failed = True
+        print()
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
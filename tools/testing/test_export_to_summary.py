@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+TO Summary Export Service Test
+Checks that the streamed CSV/JSONL/XML exports match the whole-report output
+for both the view and the materialized table, that paging keeps projects
+with several rows together, that memory stays bounded, and the HTTP API.
+"""
+
+import argparse
+import http.client
+import json
+import sqlite3
+import sys
+import tempfile
+import threading
+import tracemalloc
+from pathlib import Path
+
+from test_server import build_database, to_summary_report
+from export_to_summary import ExportServer, api_page, decode_cursor, encode_cursor, iter_export, iter_pages, main as export_main
+
+def print_status(message):
+    print(f"\033[0;32m[INFO]\033[0m {message}")
+
+def print_warning(message):
+    print(f"\033[1;33m[WARNING]\033[0m {message}")
+
+def print_error(message):
+    print(f"\033[0;31m[ERROR]\033[0m {message}")
+
+def print_step(message):
+    print(f"\033[0;34m[STEP]\033[0m {message}")
+
+def make_database(tmpdir, projects, duplicates=()):
+    """A refreshed NX database; duplicates get a second imported_it_data row"""
+    path = Path(tmpdir) / "nx_domain.sqlite"
+    build_database('nx', path, projects, 42)
+    conn = sqlite3.connect(path)
+    for project in duplicates:
+        conn.execute("INSERT INTO imported_it_data (project_name, task_index) VALUES (?, ?)", (project, f"DUP-{project}"))
+    conn.commit()
+    return path, conn
+
+def whole_report(conn, source):
+    conn.row_factory = sqlite3.Row
+    rows = [dict(row) for row in conn.execute(f"SELECT * FROM {source} ORDER BY project")]
+    conn.row_factory = None
+    for row in rows:
+        for key in ('id', 'has_it_data', 'has_coverage', 'has_version_control', 'refreshed_at'):
+            row.pop(key, None)
+    return rows
+
+def test_streamed_exports_match_report():
+    """Page by page output equals generateTOSummaryReport() for the view and the materialized table"""
+    print_step("Streaming 120 projects in pages of 7")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        duplicates = ["RL0000006", "RL0000007", "RL0000013", "RL0000014"]
+        _, conn = make_database(tmpdir, 120, duplicates)
+        for source in ('to_summary_materialized', 'to_summary_view'):
+            if source == 'to_summary_view':
+                conn.execute("DELETE FROM to_summary_refresh_state")
+                conn.commit()
+            rows = whole_report(conn, source)
+            for export_format in ('csv', 'xml'):
+                streamed = "".join(iter_export(conn, export_format, page_size=7))
+                assert streamed == to_summary_report(rows, export_format), (source, export_format)
+            lines = "".join(iter_export(conn, 'jsonl', page_size=7)).splitlines()
+            assert [json.loads(line) for line in lines] == rows, source
+
+            pages = list(iter_pages(conn, page_size=7))
+            for previous, page in zip(pages, pages[1:]):
+                assert previous[-1]['project'] < page[0]['project'], (previous[-1]['project'], page[0]['project'])
+        assert sum(row['project'] in duplicates for row in rows) == 2 * len(duplicates)
+
+        conn.execute("DELETE FROM imported_it_data")
+        conn.execute("DELETE FROM coverage_reports")
+        conn.commit()
+        assert "".join(iter_export(conn, 'csv')) == ""
+        assert "".join(iter_export(conn, 'xml')) == '<?xml version="1.0"?>\n<to_summary_report></to_summary_report>\n'
+        conn.close()
+    print_status(f"✅ {len(rows)} rows in {len(pages)} pages, identical to the whole report")
+
+def test_export_memory_is_bounded():
+    """Peak memory while streaming depends on the page size, not on the project count"""
+    print_step("Streaming 5000 projects under tracemalloc")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        _, conn = make_database(tmpdir, 5000)
+        tracemalloc.start()
+        size = sum(len(chunk) for chunk in iter_export(conn, 'jsonl', page_size=100))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        conn.close()
+    assert peak < size / 5, (peak, size)
+    print_status(f"✅ {size // 1024} KiB exported with a {peak // 1024} KiB peak")
+
+def test_paged_api_and_http():
+    """Cursors walk every project once; the server streams chunked downloads and rejects bad input"""
+    print_step("Paging through the API and downloading over HTTP")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path, conn = make_database(tmpdir, 60, ["RL0000009"])
+        expected = [row['project'] for row in whole_report(conn, 'to_summary_materialized')]
+
+        projects, cursor = [], None
+        while True:
+            page = api_page(conn, cursor=cursor, limit=9)
+            assert page['source'] == "materialized"
+            projects += [row['project'] for row in page['rows']]
+            cursor = page['next_cursor']
+            if cursor is None:
+                break
+            assert decode_cursor(cursor) == projects[-1]
+        assert projects == expected, (len(projects), len(expected))
+        conn.close()
+        for token in ("not-a-cursor", encode_cursor("x")[:-2], "e30"):
+            try:
+                decode_cursor(token)
+            except ValueError:
+                continue
+            raise AssertionError(f"{token} was accepted")
+
+        server = ExportServer(("127.0.0.1", 0), argparse.Namespace(mysql=False, sqlite=str(path)), "sqlite")
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            client = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=10)
+            client.request("GET", "/export?format=csv&page_size=10")
+            response = client.getresponse()
+            body = response.read().decode('utf-8')
+            assert response.status == 200 and response.getheader("Transfer-Encoding") == "chunked"
+            assert body.count("\n") == len(expected) + 1, body[:200]
+
+            client.request("GET", "/api/to-summary?limit=5")
+            response = client.getresponse()
+            data = json.loads(response.read())
+            assert response.status == 200 and len(data['rows']) == 5 and data['next_cursor'], data.keys()
+            client.request("GET", f"/api/to-summary?limit=5&cursor={data['next_cursor']}")
+            response = client.getresponse()
+            assert json.loads(response.read())['rows'][0]['project'] == expected[5]
+
+            for bad in ("/export?format=pdf", "/api/to-summary?limit=0", "/api/to-summary?cursor=%25%25"):
+                client.request("GET", bad)
+                response = client.getresponse()
+                assert response.status == 400 and not json.loads(response.read())['success'], bad
+            client.request("GET", "/missing")
+            response = client.getresponse()
+            assert response.status == 404 and response.read()
+            client.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+    print_status(f"✅ {len(expected)} projects paged; HTTP export and errors checked")
+
+def test_page_size_must_be_positive():
+    """--page-size below 1 is a usage error, not an empty or failing export"""
+    print_step("Passing --page-size 0 and -5")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path, conn = make_database(tmpdir, 5)
+        conn.close()
+        output = Path(tmpdir) / "export.csv"
+        for page_size in ("0", "-5"):
+            try:
+                export_main(["--sqlite", str(path), "--output", str(output), "--page-size", page_size])
+            except SystemExit as e:
+                assert e.code == 2, e.code
+            else:
+                raise AssertionError(f"--page-size {page_size} was accepted")
+        assert not output.exists()
+        export_main(["--sqlite", str(path), "--output", str(output), "--page-size", "1"])
+        assert output.read_text(encoding="utf-8").count("\n") == 6
+    print_status("✅ Page sizes below 1 rejected")
+
+def main():
+    """Main test function"""
+    print("=" * 60)
+    print("TO Summary Export Service Test")
+    print("=" * 60)
+
+    failed = False
+    for test in (test_streamed_exports_match_report, test_export_memory_is_bounded, test_paged_api_and_http,
+                 test_page_size_must_be_positive):
+        try:
+            test()
+        except AssertionError as e:
+            print_error(f"❌ {e}")
+            failed = True
+        print()
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
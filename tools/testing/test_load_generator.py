@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Load Generator Test
+Checks the percentile maths, the HTTP client's handling of chunked and
+close-delimited responses, and a short run against the stand-in server.
+"""
+
+import asyncio
+import sys
+import tempfile
+
+from load_generator import DEFAULT_MIX, ConnectionPool, percentile, run_load, summarize
+from test_server import serve_in_background
+
+def print_status(message):
+    print(f"\033[0;32m[INFO]\033[0m {message}")
+
+def print_warning(message):
+    print(f"\033[1;33m[WARNING]\033[0m {message}")
+
+def print_error(message):
+    print(f"\033[0;31m[ERROR]\033[0m {message}")
+
+def print_step(message):
+    print(f"\033[0;34m[STEP]\033[0m {message}")
+
+def test_percentiles_and_summary():
+    """Nearest-rank percentiles, error counting and throughput"""
+    print_step("Summarizing synthetic results")
+    values = list(range(1, 101))
+    assert [percentile(values, p) for p in (50, 95, 99, 100)] == [50, 95, 99, 100]
+    assert percentile([7], 99) == 7 and percentile([], 50) is None
+
+    results = [{'latency': i / 1000, 'error': None, 'bytes': 10} for i in range(1, 99)]
+    results += [{'latency': 0.5, 'error': "HTTP 500", 'bytes': 0}, {'latency': 2.0, 'error': "timeout", 'bytes': 0}]
+    stats = summarize(results, 10)
+    assert stats['requests'] == 100 and stats['errors'] == 2 and stats['error_rate'] == 0.02, stats
+    assert stats['error_kinds'] == {"HTTP 500": 1, "timeout": 1}
+    assert stats['throughput_rps'] == 9.8 and stats['bytes'] == 980
+    assert stats['latency_ms']['p50'] == 50 and stats['latency_ms']['p99'] == 500 and stats['latency_ms']['max'] == 2000
+    print_status("✅ Summary matches")
+
+def test_client_response_framing():
+    """Chunked bodies keep the connection; close-delimited bodies end it"""
+    print_step("Reading chunked and close-delimited responses")
+
+    async def scenario():
+        async def handle(reader, writer):
+            while (await reader.readuntil(b"\r\n\r\n")).startswith(b"GET /chunked"):
+                writer.write(b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+                             b"5\r\nhello\r\n7;ext=1\r\n, world\r\n0\r\n\r\n")
+                await writer.drain()
+            writer.write(b"HTTP/1.1 404 Not Found\r\n\r\nno length")
+            writer.close()
+
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        pool = ConnectionPool(f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}", 2)
+        first = await pool.request("/chunked")
+        second = await pool.request("/chunked")
+        last = await pool.request("/other")
+        opened, idle = pool.opened, len(pool.idle)
+        pool.close()
+        server.close()
+        await server.wait_closed()
+        return first, second, last, opened, idle
+
+    first, second, last, opened, idle = asyncio.run(scenario())
+    assert first.body == second.body == b"hello, world", (first.body, second.body)
+    assert last.status == 404 and last.body == b"no length", (last.status, last.body)
+    assert opened == 1 and idle == 0, (opened, idle)
+    print_status("✅ Both framings read over one connection")
+
+def test_run_against_stand_in():
+    """Every endpoint of the default mix answers; a missing page is counted as errors"""
+    print_step("Loading the stand-in server for 1.5 seconds")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        (it_port, nx_port), stop = serve_in_background(tmpdir, projects=50)
+        try:
+            mix = DEFAULT_MIX + [{'name': 'missing page', 'site': 'nx', 'path': '/missing.php', 'weight': 10}]
+            report = asyncio.run(run_load({'it': f"http://127.0.0.1:{it_port}", 'nx': f"http://127.0.0.1:{nx_port}"},
+                                          mix, rps=100, duration=1.5, warmup=0.3, connections=8,
+                                          projects=[f"RL{i:07d}" for i in range(50)]))
+        finally:
+            stop()
+
+    total = report['total']
+    assert 145 <= total['requests'] <= 155, total['requests']
+    assert set(report['endpoints']) == {endpoint['name'] for endpoint in mix}
+    missing = report['endpoints'].pop('missing page')
+    assert missing['error_rate'] == 1.0 and missing['error_kinds'] == {"HTTP 404": missing['requests']}, missing
+    for name, stats in report['endpoints'].items():
+        assert stats['errors'] == 0, (name, stats['error_kinds'])
+        if stats['requests']:
+            latency = stats['latency_ms']
+            assert latency['p50'] <= latency['p95'] <= latency['p99'] <= latency['max'], (name, latency)
+    assert report['connections_opened'] <= 16, report['connections_opened']
+    print_status(f"✅ {total['requests']} requests, p99 {total['latency_ms']['p99']} ms")
+
+def main():
+    """Main test function"""
+    print("=" * 60)
+    print("Load Generator Test")
+    print("=" * 60)
+
+    failed = False
+    for test in (test_percentiles_and_summary, test_client_response_framing, test_run_against_stand_in):
+        try:
+            test()
+        except AssertionError as e:
+            print_error(f"❌ {e}")
+            failed = True
+        print()
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Response Cache Test
+Checks the stand-in server's TO summary cache: hits, gzip and identity
+ETags, 304s on If-None-Match, new ETags after a refresh or a deleted row,
+and LRU eviction by byte budget.
+"""
+
+import asyncio
+import gzip
+import http.client
+import sys
+
+from test_server import CachedBody, ResponseCache, accepts_gzip, etag_matches
+from test_stand_in_server import StandInServer
+from refresh_to_summary import refresh_to_summary  # on sys.path via test_server
+
+def print_status(message):
+    print(f"\033[0;32m[INFO]\033[0m {message}")
+
+def print_warning(message):
+    print(f"\033[1;33m[WARNING]\033[0m {message}")
+
+def print_error(message):
+    print(f"\033[0;31m[ERROR]\033[0m {message}")
+
+def print_step(message):
+    print(f"\033[0;34m[STEP]\033[0m {message}")
+
+def get(conn, path, headers=None):
+    conn.request("GET", path, headers=headers or {})
+    response = conn.getresponse()
+    return response.status, {name.lower(): value for name, value in response.getheaders()}, response.read()
+
+def test_header_parsing():
+    """Accept-Encoding q-values and If-None-Match weak comparison"""
+    print_step("Parsing Accept-Encoding and If-None-Match")
+    assert accepts_gzip("gzip, deflate, br") and accepts_gzip("br;q=1.0, *;q=0.5")
+    assert not accepts_gzip("") and not accepts_gzip("identity") and not accepts_gzip("gzip;q=0")
+    assert etag_matches('"a", W/"b"', '"b"') and etag_matches("*", '"c"') and not etag_matches('"a"', '"b"')
+    print_status("✅ Headers parsed")
+
+def test_cache_hits_and_revalidation():
+    """The second request is a hit; the stored ETag gets a 304 until the data changes"""
+    print_step("Fetching the JSON export and the TO summary page twice")
+    with StandInServer() as server:
+        conn = http.client.HTTPConnection("127.0.0.1", server.nx_port, timeout=10)
+        path = "/?action=export&format=json"
+        status, first, body = get(conn, path)
+        assert status == 200 and first['x-cache'] == "MISS" and 'content-encoding' not in first, first
+        status, gzipped, compressed = get(conn, path, {'Accept-Encoding': "gzip"})
+        assert status == 200 and gzipped['x-cache'] == "HIT" and gzipped['content-encoding'] == "gzip", gzipped
+        assert gzip.decompress(compressed) == body and gzipped['vary'] == "Accept-Encoding"
+        assert gzipped['etag'] != first['etag'] and gzipped['etag'].startswith('"'), (gzipped['etag'], first['etag'])
+
+        status, headers, body = get(conn, path, {'If-None-Match': first['etag']})
+        assert status == 304 and body == b"" and headers['etag'] == first['etag'], (status, headers)
+        assert 'content-length' not in headers and 'content-type' not in headers, headers
+        # A gzip ETag does not validate the identity representation
+        assert get(conn, path, {'If-None-Match': gzipped['etag']})[0] == 200
+        assert get(conn, "/?action=to_summary")[1]['x-cache'] == "MISS"
+        assert get(conn, "/?action=to_summary")[1]['x-cache'] == "HIT"
+
+        db = server.database('nx')
+        db.execute("UPDATE coverage_reports SET line_coverage = 12.34, updated_at = '2099-01-01 00:00:00' "
+                   "WHERE id = (SELECT MIN(id) FROM coverage_reports)")
+        db.commit()
+        # The pages read to_summary_materialized, so the body only changes with the refresh
+        status, headers, _ = get(conn, path, {'If-None-Match': first['etag']})
+        assert status == 304 and headers['x-cache'] == "MISS", (status, headers)
+        refresh_to_summary(db)
+        db.close()
+        status, headers, body = get(conn, path, {'If-None-Match': first['etag']})
+        assert status == 200 and headers['x-cache'] == "MISS" and headers['etag'] != first['etag'], headers
+        assert b"12.34" in body
+        conn.close()
+    print_status("✅ Hits, 304s and a new ETag after the refresh")
+
+def test_deleted_rows_leave_the_cache():
+    """Before the first refresh the page reads the view, and deleting an older row changes it"""
+    print_step("Deleting a project while the TO summary page is cached")
+    with StandInServer() as server:
+        db = server.database('nx')
+        db.execute("DELETE FROM to_summary_refresh_state")
+        db.commit()
+        conn = http.client.HTTPConnection("127.0.0.1", server.nx_port, timeout=10)
+        status, first, body = get(conn, "/?action=to_summary")
+        assert status == 200 and get(conn, "/?action=to_summary")[1]['x-cache'] == "HIT"
+
+        # The oldest row, so no change timestamp moves
+        project = db.execute("SELECT project_name FROM imported_it_data ORDER BY updated_at, id LIMIT 1").fetchone()[0]
+        assert f"<strong>{project}</strong>".encode() in body, project
+        for table in ("imported_it_data", "coverage_reports", "version_control"):
+            db.execute(f"DELETE FROM {table} WHERE project_name = ?", (project,))
+        db.commit()
+        db.close()
+        status, headers, body = get(conn, "/?action=to_summary", {'If-None-Match': first['etag']})
+        assert status == 200 and headers['x-cache'] == "MISS" and headers['etag'] != first['etag'], (status, headers)
+        assert f"<strong>{project}</strong>".encode() not in body, project
+        conn.close()
+    print_status(f"✅ {project} left the cached page once deleted")
+
+def test_lru_eviction_by_bytes():
+    """Least recently used entries go first; older versions and oversized bodies are not kept"""
+    print_step("Filling a small cache")
+
+    async def scenario():
+        cache = ResponseCache(max_bytes=3 * len(gzip.compress(b"x" * 100, mtime=0)))
+        builds = []
+
+        def builder(body):
+            async def build():
+                builds.append(body)
+                return body, "text/plain"
+            return build
+
+        for name in "abc":
+            await cache.get((name, 1), builder(b"x" * 100))
+        await cache.get(("a", 1), builder(b""))
+        await cache.get(("d", 1), builder(b"x" * 100))
+        kept = [key[0] for key in cache.entries]
+        evictions = cache.evictions
+
+        await cache.get(("a", 2), builder(b"x" * 100))
+        versions = [key for key in cache.entries if key[0] == "a"]
+        await cache.get(("big", 1), builder(bytes(range(256)) * 64))
+
+        first, second = await asyncio.gather(cache.get(("e", 1), builder(b"e")), cache.get(("e", 1), builder(b"e")))
+        return cache, kept, evictions, versions, builds, first, second
+
+    cache, kept, evictions, versions, builds, first, second = asyncio.run(scenario())
+    assert kept == ["c", "a", "d"] and evictions == 1, (kept, evictions)
+    assert versions == [("a", 2)], versions
+    assert ("big", 1) not in cache.entries and cache.bytes <= cache.max_bytes, cache.stats()
+    assert builds.count(b"e") == 1 and first[0] is second[0] and {first[1], second[1]} == {True, False}
+    assert CachedBody(b"same", "text/plain").etag == CachedBody(b"same", "text/csv").etag
+    print_status(f"✅ {cache.stats()}")
+
+def main():
+    """Main test function"""
+    print("=" * 60)
+    print("Response Cache Test")
+    print("=" * 60)
+
+    failed = False
+    for test in (test_header_parsing, test_cache_hits_and_revalidation, test_deleted_rows_leave_the_cache,
+                 test_lru_eviction_by_bytes):
+        try:
+            test()
+        except AssertionError as e:
+            print_error(f"❌ {e}")
+            failed = True
+        print()
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
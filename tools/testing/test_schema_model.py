@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Schema Model Test
+Checks that schema_model.py reads tables, columns, constraints, indexes and
+views out of the repository schemas, applies DROP/USE in order and parses
+each file only once.
+"""
+
+import io
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+from schema_model import load_schema, parse_schema
+
+SCHEMA_DIR = Path(__file__).resolve().parent.parent.parent / "app" / "database" / "schemas"
+
+def print_status(message):
+    print(f"\033[0;32m[INFO]\033[0m {message}")
+
+def print_warning(message):
+    print(f"\033[1;33m[WARNING]\033[0m {message}")
+
+def print_error(message):
+    print(f"\033[0;31m[ERROR]\033[0m {message}")
+
+def print_step(message):
+    print(f"\033[0;34m[STEP]\033[0m {message}")
+
+def test_nx_schema_model():
+    """Columns, CHECK constraints, indexes and the 33-field TO summary view"""
+    print_step("Modelling nx-domain-schema-new.sql")
+    schema = load_schema(SCHEMA_DIR / "nx-domain-schema-new.sql")
+    assert schema.errors == [], schema.errors
+    assert list(schema.databases) == ["nx_domain_db"], list(schema.databases)
+
+    coverage = schema.table("coverage_reports")
+    project = coverage.columns["project_name"]
+    assert (project.type, project.nullable, project.unique) == ("VARCHAR(100)", False, True), project
+    assert coverage.columns["id"].primary_key and coverage.columns["id"].auto_increment
+    assert coverage.columns["updated_at"].on_update == "CURRENT_TIMESTAMP", coverage.columns["updated_at"]
+    checks = {check.name: check.expression for check in coverage.checks()}
+    assert checks["chk_line_coverage"] == "line_coverage IS NULL OR (line_coverage >= 0 AND line_coverage <= 100)", checks
+    assert "idx_coverage_project" in [index.name for index in coverage.indexes]
+
+    view = schema.view("to_summary_view")
+    assert len(view.columns) == 33 and view.branch_sizes == [33, 33], view.branch_sizes
+    assert view.columns[:3] == ["task_index", "project", "spip_ip"], view.columns[:3]
+    assert view.select_list[1].expression.startswith("COALESCE("), view.select_list[1]
+    materialized = schema.table("to_summary_materialized")
+    assert [column for column in view.columns if column not in materialized.columns] == []
+    print_status(f"✅ {len(schema.tables())} tables, {len(schema.indexes())} indexes, view of {len(view.columns)} fields")
+
+def test_statements_applied_in_order():
+    """USE switches database, DROP removes objects, AS SELECT tables have no column list"""
+    print_step("Modelling a script with USE, DROP and CREATE TABLE ... AS SELECT")
+    schema = parse_schema(io.StringIO("""
+        USE it_db;
+        CREATE TABLE IF NOT EXISTS `projects` (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            name VARCHAR(20) NOT NULL DEFAULT 'x;y',  -- a comment, with a comma
+            unit ENUM('CN','PC') CHECK (unit IN ('CN', 'PC')),
+            CONSTRAINT uq_name UNIQUE (name),
+            KEY idx_unit (unit)
+        );
+        CREATE TABLE projects_backup AS SELECT * FROM projects;
+        CREATE VIEW v AS SELECT p.name, COUNT(*) AS total, UPPER(unit) unit_upper FROM projects p;
+        USE nx_db;
+        CREATE TABLE old (a INT);
+        DROP TABLE IF EXISTS old;
+        CREATE INDEX idx_missing ON nowhere (a);
+    """))
+    projects = schema.table("projects")
+    assert projects.database == "it_db" and list(projects.columns) == ["id", "name", "unit"], projects
+    assert projects.columns["name"].default == "'x;y'", projects.columns["name"]
+    assert [(c.kind, c.name, c.columns) for c in projects.constraints] == [
+        ("CHECK", None, ["unit"]), ("UNIQUE", "uq_name", ["name"])], projects.constraints
+    assert schema.table("projects_backup").as_select == "SELECT * FROM projects"
+    assert schema.view("v").columns == ["name", "total", "unit_upper"], schema.view("v").columns
+    assert schema.table("old") is None and list(schema.databases["nx_db"].tables) == []
+    assert schema.errors == ["statement 8: index idx_missing on unknown table nowhere"], schema.errors
+    assert schema.statement_counts["USE"] == 2 and schema.statement_counts["CREATE TABLE"] == 3
+    print_status("✅ Final state modelled")
+
+def test_all_schema_files_cached():
+    """Every schema file parses without errors, and only once per version"""
+    print_step("Modelling all schema files")
+    paths = sorted(SCHEMA_DIR.glob("*.sql"))
+    assert len(paths) == 8, paths
+    for path in paths:
+        schema = load_schema(path)
+        assert schema.errors == [], (path.name, schema.errors)
+        assert load_schema(path) is schema
+    migration = load_schema(SCHEMA_DIR / "migration-script.sql")
+    assert [trigger.name for trigger in migration.triggers()] == ["generate_task_index"]
+    assert migration.table("projects") is None and migration.table("projects_backup").as_select
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "schema.sql"
+        path.write_text("CREATE TABLE a (x INT);", encoding='utf-8')
+        first = load_schema(path)
+        path.write_text("CREATE TABLE b (x INT, y INT);", encoding='utf-8')
+        os.utime(path, ns=(0, 10 ** 9))
+        assert load_schema(path) is not first and load_schema(path).table("b") is not None
+    print_status(f"✅ {len(paths)} files modelled")
+
+def main():
+    """Main test function"""
+    print("=" * 60)
+    print("Schema Model Test")
+    print("=" * 60)
+
+    failed = False
+    for test in (test_nx_schema_model, test_statements_applied_in_order, test_all_schema_files_cached):
+        try:
+            test()
+        except AssertionError as e:
+            print_error(f"❌ {e}")
+            failed = True
+        print()
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
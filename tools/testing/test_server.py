@@ -1,266 +1,708 @@
 #!/usr/bin/env python3
 """
-Simple test server to simulate the IT and NX domain websites
-for testing purposes when Docker is not available.
+Stand-in test server for the IT and NX domain websites
+Serves the same pages and API as app/domains/*/index.php from SQLite copies
+of the IT/NX schemas, so the e2e and load tests can run when Docker is not
+available:
+
+  IT (port 8080)  /?action=list                       project listing
+  NX (port 8081)  /?action=dashboard|coverage|to_summary
+                  /?action=export&format=json|csv|xml generateTOSummaryReport()
+                  /api/get-project-details.php?id=X   project details JSON
+
+Connections are handled with asyncio (HTTP/1.1 keep-alive and pipelining)
+and queries run on a thread pool, each thread with its own read-only
+SQLite connection.
+
+The TO summary page and exports are served from a cache of gzipped bodies
+keyed on the data version (the latest change timestamps of the summary's
+source tables and of the last refresh job), with strong ETags so clients
+can revalidate with If-None-Match and get 304s.
 """
 
-import http.server
-import socketserver
-import os
+import argparse
+import asyncio
+import csv
+import gzip
+import hashlib
+import html
+import io
 import json
-from urllib.parse import urlparse, parse_qs
+import random
+import sqlite3
+import sys
+import tempfile
 import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from http import HTTPStatus
+from pathlib import Path
+from urllib.parse import parse_qsl, urlsplit
+from xml.sax.saxutils import escape as xml_escape
 
-class ITDomainHandler(http.server.SimpleHTTPRequestHandler):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, directory="/workspace/dv_website/it-domain", **kwargs)
-    
-    def do_GET(self):
-        if self.path == '/':
-            self.path = '/index.html'
-        
-        # Serve static test page for IT domain
-        self.send_response(200)
-        self.send_header('Content-type', 'text/html')
-        self.end_headers()
-        
-        html_content = """
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>IT Domain - DV Project Management</title>
-            <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css" rel="stylesheet">
-        </head>
-        <body>
-            <nav class="navbar navbar-expand-lg navbar-dark bg-primary">
-                <div class="container">
-                    <a class="navbar-brand" href="/">IT Domain - DV Management</a>
-                    <div class="navbar-nav ms-auto">
-                        <a class="nav-link" href="/">View Data</a>
-                        <a class="nav-link" href="/add_project">Add Project</a>
-                        <a class="nav-link" href="/add_task">Add Task</a>
-                    </div>
-                </div>
-            </nav>
-            
-            <div class="container mt-4">
-                <h2>IT Domain Test Page</h2>
-                <div class="alert alert-info">
-                    <strong>Test Status:</strong> IT Domain website is running on port 8080
-                </div>
-                
-                <div class="row">
-                    <div class="col-md-6">
-                        <div class="card">
-                            <div class="card-header">
-                                <h5>IT Domain Fields (17 Total)</h5>
-                            </div>
-                            <div class="card-body">
-                                <ul class="list-group">
-                                    <li class="list-group-item">1. Index (Auto-generated)</li>
-                                    <li class="list-group-item">2. Project</li>
-                                    <li class="list-group-item">3. SPIP_IP</li>
-                                    <li class="list-group-item">4. IP</li>
-                                    <li class="list-group-item">5. IP Postfix</li>
-                                    <li class="list-group-item">6. IP Subtype</li>
-                                    <li class="list-group-item">7. Alternative Name</li>
-                                    <li class="list-group-item">8. DV Engineer</li>
-                                    <li class="list-group-item">9. Digital Designer</li>
-                                    <li class="list-group-item">10. Business Unit</li>
-                                    <li class="list-group-item">11. Analog Designer</li>
-                                    <li class="list-group-item">12. SPIP URL</li>
-                                    <li class="list-group-item">13. Wiki URL</li>
-                                    <li class="list-group-item">14. Spec Version</li>
-                                    <li class="list-group-item">15. Spec Path</li>
-                                    <li class="list-group-item">16. Inherit from IP</li>
-                                    <li class="list-group-item">17. Re-use IP</li>
-                                </ul>
-                            </div>
-                        </div>
-                    </div>
-                    
-                    <div class="col-md-6">
-                        <div class="card">
-                            <div class="card-header">
-                                <h5>Test Features</h5>
-                            </div>
-                            <div class="card-body">
-                                <div class="mb-3">
-                                    <label>Task Index Auto-generation:</label>
-                                    <input type="text" class="form-control" value="TASK_001" readonly>
-                                    <small class="text-muted">Auto-generated task index</small>
-                                </div>
-                                
-                                <div class="mb-3">
-                                    <label>URL Validation:</label>
-                                    <input type="url" class="form-control" placeholder="https://example.com">
-                                    <small class="text-muted">URL format validation</small>
-                                </div>
-                                
-                                <div class="mb-3">
-                                    <label>IP Subtype (Constrained):</label>
-                                    <select class="form-control">
-                                        <option value="default">default</option>
-                                        <option value="gen2x1">gen2x1</option>
-                                    </select>
-                                </div>
-                                
-                                <button class="btn btn-primary">Add Test Project</button>
-                                <button class="btn btn-success">Export to CSV</button>
-                            </div>
-                        </div>
-                    </div>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
-        self.wfile.write(html_content.encode())
-
-class NXDomainHandler(http.server.SimpleHTTPRequestHandler):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, directory="/workspace/dv_website/nx-domain", **kwargs)
-    
-    def do_GET(self):
-        if self.path == '/':
-            self.path = '/index.html'
-        
-        # Serve static test page for NX domain
-        self.send_response(200)
-        self.send_header('Content-type', 'text/html')
-        self.end_headers()
-        
-        html_content = """
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>NX Domain - DV Reports & TO Summary</title>
-            <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css" rel="stylesheet">
-        </head>
-        <body>
-            <nav class="navbar navbar-expand-lg navbar-dark bg-success">
-                <div class="container">
-                    <a class="navbar-brand" href="/">NX Domain - DV Reports</a>
-                    <div class="navbar-nav ms-auto">
-                        <a class="nav-link" href="/">Dashboard</a>
-                        <a class="nav-link" href="/coverage">Coverage Reports</a>
-                        <a class="nav-link" href="/import">Import IT Data</a>
-                        <a class="nav-link" href="/to_summary">TO Summary</a>
-                    </div>
-                </div>
-            </nav>
-            
-            <div class="container mt-4">
-                <h2>NX Domain Test Page</h2>
-                <div class="alert alert-success">
-                    <strong>Test Status:</strong> NX Domain website is running on port 8081
-                </div>
-                
-                <div class="row">
-                    <div class="col-md-6">
-                        <div class="card">
-                            <div class="card-header">
-                                <h5>NX Domain Fields (16 Total)</h5>
-                            </div>
-                            <div class="card-body">
-                                <ul class="list-group">
-                                    <li class="list-group-item">1. Line Coverage <span class="badge bg-success">95%</span></li>
-                                    <li class="list-group-item">2. FSM Coverage <span class="badge bg-warning">85%</span></li>
-                                    <li class="list-group-item">3. Interface Toggle Coverage <span class="badge bg-success">92%</span></li>
-                                    <li class="list-group-item">4. Toggle Coverage <span class="badge bg-success">88%</span></li>
-                                    <li class="list-group-item">5. Coverage Report Path</li>
-                                    <li class="list-group-item">6. Sanity SVN</li>
-                                    <li class="list-group-item">7. Sanity SVN Version</li>
-                                    <li class="list-group-item">8. Release SVN</li>
-                                    <li class="list-group-item">9. Release SVN Version</li>
-                                    <li class="list-group-item">10. Git Path</li>
-                                    <li class="list-group-item">11. Git Version</li>
-                                    <li class="list-group-item">12. Golden Checklist</li>
-                                    <li class="list-group-item">13. Golden Checklist Version</li>
-                                    <li class="list-group-item">14. TO Date</li>
-                                    <li class="list-group-item">15. RTL Last Update</li>
-                                    <li class="list-group-item">16. TO Report Creation</li>
-                                </ul>
-                            </div>
-                        </div>
-                    </div>
-                    
-                    <div class="col-md-6">
-                        <div class="card">
-                            <div class="card-header">
-                                <h5>TO Summary (33 Total Fields)</h5>
-                            </div>
-                            <div class="card-body">
-                                <div class="table-responsive">
-                                    <table class="table table-striped">
-                                        <thead>
-                                            <tr>
-                                                <th>Project</th>
-                                                <th>Line Cov</th>
-                                                <th>FSM Cov</th>
-                                                <th>DV Engineer</th>
-                                            </tr>
-                                        </thead>
-                                        <tbody>
-                                            <tr>
-                                                <td>Test_Project_1</td>
-                                                <td><span class="badge bg-success">95%</span></td>
-                                                <td><span class="badge bg-warning">85%</span></td>
-                                                <td>John.Doe</td>
-                                            </tr>
-                                            <tr>
-                                                <td>Test_Project_2</td>
-                                                <td><span class="badge bg-success">92%</span></td>
-                                                <td><span class="badge bg-success">90%</span></td>
-                                                <td>Jane.Smith</td>
-                                            </tr>
-                                        </tbody>
-                                    </table>
-                                </div>
-                                
-                                <div class="mt-3">
-                                    <strong>Combined Data:</strong> 17 IT fields + 16 NX fields = 33 total fields
-                                </div>
-                                
-                                <div class="mt-3">
-                                    <input type="file" class="form-control" accept=".csv">
-                                    <button class="btn btn-primary mt-2">Import CSV from IT Domain</button>
-                                </div>
-                            </div>
-                        </div>
-                    </div>
-                </div>
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(REPO_ROOT / 'tools' / 'maintenance'))
+
+from index_advisor import POPULATE, create_database
+from refresh_to_summary import SUMMARY_COLUMNS, WATERMARK_COLUMNS
+
+DEFAULT_PROJECTS = 200
+DEFAULT_WORKERS = 8
+KEEP_ALIVE_SECONDS = 15
+MAX_HEADER_BYTES = 64 * 1024
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+
+# The view follows the source tables' change timestamps and row counts (a
+# deleted row moves no timestamp); the materialized summary follows the
+# watermarks its last refresh recorded.
+DATA_VERSION_SQL = "SELECT " + ", ".join(
+    [f"(SELECT MAX({column}) FROM {table}) AS {table}" for table, column in WATERMARK_COLUMNS.items()]
+    + [f"(SELECT COUNT(*) FROM {table}) AS {table}_rows" for table in WATERMARK_COLUMNS]
+    + [f"(SELECT {table}_watermark FROM to_summary_refresh_state WHERE id = 1) AS refreshed_{table}"
+       for table in WATERMARK_COLUMNS]
+    + ["(SELECT refreshed_at FROM to_summary_refresh_state WHERE id = 1) AS refreshed_at"]
+)
+
+# Same columns as app/domains/nx-domain/api/get-project-details.php
+PROJECT_DETAILS_SQL = """
+SELECT
+    COALESCE(it.project_name, cr.project_name, vc.project_name) AS project,
+    it.project_name, it.spip_ip, it.ip, it.ip_postfix, it.ip_subtype, it.alternative_name, it.task_index,
+    cr.line_coverage, cr.fsm_coverage, cr.interface_toggle_coverage, cr.toggle_coverage, cr.coverage_report_path,
+    it.dv_engineer, it.digital_designer, it.business_unit, it.analog_designer, it.inherit_from_ip, it.reuse_ip,
+    vc.sanity_svn, vc.sanity_svn_ver, vc.release_svn, vc.release_svn_ver, vc.git_path, vc.git_version,
+    vc.golden_checklist, vc.golden_checklist_version,
+    cr.to_date, cr.rtl_last_update, cr.to_report_creation,
+    it.spip_url, it.wiki_url, it.spec_version, it.spec_path
+FROM imported_it_data it
+LEFT JOIN coverage_reports cr ON it.project_name = cr.project_name
+LEFT JOIN version_control vc ON it.project_name = vc.project_name
+WHERE COALESCE(it.project_name, cr.project_name, vc.project_name) = ?
+LIMIT 1
+"""
+
+REPORT_CONTENT_TYPES = {
+    'json': 'application/json',
+    'csv': 'text/csv; charset=UTF-8',
+    'xml': 'application/xml',
+}
+
+IT_PROJECT_FIELDS = (
+    ("task_index", "Task Index"), ("project_name", "Project"), ("spip_ip", "SPIP IP"), ("ip", "IP"),
+    ("ip_postfix", "IP Postfix"), ("ip_subtype", "IP Subtype"), ("alternative_name", "Alternative Name"),
+    ("dv_engineer", "DV Engineer"), ("digital_designer", "Digital Designer"), ("business_unit", "Business Unit"),
+    ("analog_designer", "Analog Designer"), ("inherit_from_ip", "Inherit from IP"), ("reuse_ip", "Re-use IP"),
+    ("spip_url", "SPIP URL"), ("wiki_url", "Wiki URL"), ("spec_version", "Spec Version"), ("spec_path", "Spec Path"),
+)
+
+def print_status(message):
+    print(f"\033[0;32m[INFO]\033[0m {message}")
+
+def print_warning(message):
+    print(f"\033[1;33m[WARNING]\033[0m {message}")
+
+def print_error(message):
+    print(f"\033[0;31m[ERROR]\033[0m {message}")
+
+def print_step(message):
+    print(f"\033[0;34m[STEP]\033[0m {message}")
+
+def build_database(domain, path, projects, seed):
+    """Write a SQLite copy of one domain schema with synthetic rows to path"""
+    conn = create_database(domain)
+    try:
+        if projects:
+            POPULATE[domain](conn, projects, random.Random(seed))
+        target = sqlite3.connect(path)
+        conn.backup(target)
+        target.close()
+    finally:
+        conn.close()
+
+class DomainDatabase:
+    """Read-only access to one SQLite file from the worker threads of an executor"""
+
+    def __init__(self, path, executor):
+        self.path = Path(path)
+        self.executor = executor
+        self.local = threading.local()
+
+    def connection(self):
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(f"{self.path.as_uri()}?mode=ro", uri=True)
+            conn.row_factory = sqlite3.Row
+            self.local.conn = conn
+        return conn
+
+    def _fetch_all(self, sql, params):
+        return [dict(row) for row in self.connection().execute(sql, params)]
+
+    async def fetch_all(self, sql, params=()):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, self._fetch_all, sql, params)
+
+    async def fetch_one(self, sql, params=()):
+        rows = await self.fetch_all(sql, params)
+        return rows[0] if rows else None
+
+class Request:
+    def __init__(self, method, target, version, headers):
+        self.method = method
+        self.target = target
+        self.version = version
+        self.headers = headers
+        url = urlsplit(target)
+        self.path = url.path
+        self.query = dict(parse_qsl(url.query))
+
+    @property
+    def keep_alive(self):
+        connection = self.headers.get('connection', '').lower()
+        if self.version == 'HTTP/1.0':
+            return connection == 'keep-alive'
+        return connection != 'close'
+
+class Response:
+    def __init__(self, body, status=200, content_type='text/html; charset=UTF-8', headers=None):
+        self.body = body.encode('utf-8') if isinstance(body, str) else body
+        self.status = status
+        self.headers = {'Content-Type': content_type} if content_type else {}
+        self.headers.update(headers or {})
+
+def json_response(data, status=200):
+    return Response(json.dumps(data), status, 'application/json',
+                    {'Access-Control-Allow-Origin': '*', 'Access-Control-Allow-Methods': 'GET',
+                     'Access-Control-Allow-Headers': 'Content-Type'})
+
+def to_summary_report(rows, report_format):
+    """generateTOSummaryReport() output for rows of the TO summary"""
+    if report_format == 'json':
+        return json.dumps(rows, indent=4)
+    if report_format == 'csv':
+        if not rows:
+            return ''
+        output = io.StringIO()
+        writer = csv.writer(output, lineterminator="\n")
+        writer.writerow(rows[0].keys())
+        writer.writerows(row.values() for row in rows)
+        return output.getvalue()
+    projects = "".join(
+        "<project>" + "".join(f"<{key}>{xml_escape('' if value is None else str(value))}</{key}>"
+                              for key, value in row.items()) + "</project>"
+        for row in rows
+    )
+    return f'<?xml version="1.0"?>\n<to_summary_report>{projects}</to_summary_report>\n'
+
+class CachedBody:
+    """A gzipped response body with the strong ETags of its two encodings"""
+
+    def __init__(self, body, content_type):
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        self.etag = f'"{digest}"'
+        self.gzip_etag = f'"{digest}-gzip"'
+        self.gzip_body = gzip.compress(body, mtime=0)
+        self.content_type = content_type
+
+    @property
+    def size(self):
+        return len(self.gzip_body)
+
+class ResponseCache:
+    """LRU cache of CachedBody entries, bounded by their gzipped size
+
+    Concurrent misses for the same key share one build. Storing a key drops
+    older data versions of the same resource, which can no longer be served.
+    """
+
+    def __init__(self, max_bytes, executor=None):
+        self.max_bytes = max_bytes
+        self.executor = executor
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.pending = {}
+        self.hits = self.misses = self.evictions = 0
+
+    async def get(self, key, build):
+        """(entry, hit) for key = (resource, version); build() returns (body bytes, content type)"""
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry, True
+        if key in self.pending:
+            self.hits += 1
+            return await asyncio.shield(self.pending[key]), True
+
+        self.misses += 1
+        self.pending[key] = asyncio.ensure_future(self._build(key, build))
+        return await asyncio.shield(self.pending[key]), False
+
+    async def _build(self, key, build):
+        try:
+            body, content_type = await build()
+            entry = await asyncio.get_running_loop().run_in_executor(self.executor, CachedBody, body, content_type)
+        finally:
+            del self.pending[key]
+        self.put(key, entry)
+        return entry
+
+    def put(self, key, entry):
+        resource = key[0]
+        for old in [old for old in self.entries if old[0] == resource and old != key]:
+            self._remove(old)
+        if entry.size > self.max_bytes:
+            return
+        if key in self.entries:
+            self._remove(key)
+        self.entries[key] = entry
+        self.bytes += entry.size
+        while self.bytes > self.max_bytes:
+            self._remove(next(iter(self.entries)))
+            self.evictions += 1
+
+    def _remove(self, key):
+        self.bytes -= self.entries.pop(key).size
+
+    def stats(self):
+        return {'entries': len(self.entries), 'bytes': self.bytes, 'max_bytes': self.max_bytes,
+                'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+def accepts_gzip(header):
+    """Whether an Accept-Encoding header allows gzip"""
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        if coding.strip().lower() in ("gzip", "*"):
+            quality = params.strip()
+            try:
+                return not quality.startswith("q=") or float(quality[2:]) > 0
+            except ValueError:
+                return False
+    return False
+
+def etag_matches(header, etag):
+    """If-None-Match uses the weak comparison: W/ prefixes are ignored"""
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+async def read_request(reader):
+    """The next request on a connection, or None when the client closed it"""
+    try:
+        head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEP_ALIVE_SECONDS)
+    except asyncio.IncompleteReadError as e:
+        if e.partial.strip():
+            raise ValueError("incomplete request head")
+        return None
+    except asyncio.LimitOverrunError:
+        raise ValueError("request head too large")
+
+    lines = head.decode('latin-1').split("\r\n")
+    try:
+        method, target, version = lines[0].split(" ")
+    except ValueError:
+        raise ValueError(f"malformed request line {lines[0]!r}")
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+    # Bodies are not used by any route but must be consumed to keep the connection in sync
+    length = int(headers.get('content-length') or 0)
+    if length:
+        await reader.readexactly(length)
+    return Request(method, target, version, headers)
+
+def encode_response(response, keep_alive, head_only=False):
+    status = HTTPStatus(response.status)
+    headers = {
+        **response.headers,
+        'Connection': 'keep-alive' if keep_alive else 'close',
+        'Date': time.strftime('%a, %d %b %Y %H:%M:%S GMT', time.gmtime()),
+        'Server': 'dv-website-stand-in',
+    }
+    if status != HTTPStatus.NOT_MODIFIED:
+        headers['Content-Length'] = str(len(response.body))
+    lines = [f"HTTP/1.1 {status.value} {status.phrase}"] + [f"{name}: {value}" for name, value in headers.items()]
+    head = ("\r\n".join(lines) + "\r\n\r\n").encode('latin-1')
+    return head if head_only else head + response.body
+
+async def serve_connection(app, reader, writer):
+    """Answer requests on one connection in order until either side closes it"""
+    try:
+        while True:
+            try:
+                request = await read_request(reader)
+            except ValueError as e:
+                writer.write(encode_response(Response(f"Bad request: {e}", 400, 'text/plain'), False))
+                break
+            except asyncio.TimeoutError:
+                break
+            if request is None:
+                break
+
+            if request.method not in ('GET', 'HEAD'):
+                response = Response("Method not allowed", 405, 'text/plain', {'Allow': 'GET, HEAD'})
+            else:
+                try:
+                    response = await app(request)
+                except Exception as e:
+                    response = Response(f"Internal server error: {e}", 500, 'text/plain')
+            writer.write(encode_response(response, request.keep_alive, request.method == 'HEAD'))
+            await writer.drain()
+            if not request.keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    except asyncio.CancelledError:
+        # Server shutdown; end the connection quietly
+        pass
+    finally:
+        writer.close()
+
+def escape(value, default=''):
+    return html.escape(str(default if value is None else value))
+
+def format_percentage(value):
+    return f"{float(value):,.1f}%" if value else "N/A"
+
+def parse_timestamp(value):
+    return datetime.fromisoformat(str(value)) if value else None
+
+def format_date(value):
+    moment = parse_timestamp(value)
+    return moment.strftime('%Y-%m-%d') if moment else "N/A"
+
+def format_datetime(value):
+    moment = parse_timestamp(value)
+    return moment.strftime('%Y-%m-%d %H:%M') if moment else "N/A"
+
+def coverage_badge(value):
+    if not value:
+        return '<span class="text-muted">N/A</span>'
+    color = 'success' if value >= 90 else 'warning' if value >= 80 else 'danger'
+    return f'<span class="badge bg-{color}">{format_percentage(value)}</span>'
+
+def page(title, brand, color, links, body):
+    nav = "".join(f'<a class="nav-link" href="{href}">{label}</a>' for href, label in links)
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title}</title>
+    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css" rel="stylesheet">
+</head>
+<body>
+    <nav class="navbar navbar-expand-lg navbar-dark bg-{color}">
+        <div class="container">
+            <a class="navbar-brand" href="index.php">{brand}</a>
+            <div class="navbar-nav ms-auto">{nav}</div>
+        </div>
+    </nav>
+    <div class="container mt-4">
+{body}
+    </div>
+</body>
+</html>
+"""
+
+def table(headers, rows, classes="table table-striped"):
+    head = "".join(f"<th>{header}</th>" for header in headers)
+    body = "\n".join("<tr>" + "".join(f"<td>{cell}</td>" for cell in row) + "</tr>" for row in rows)
+    return (f'<div class="table-responsive"><table class="{classes}"><thead><tr>{head}</tr></thead>'
+            f'<tbody>\n{body}\n</tbody></table></div>')
+
+class ITDomainApp:
+    """app/domains/it-domain/index.php: the project listing"""
+
+    links = (("?action=list", "View Projects"), ("?action=add", "Add Project"))
+
+    def __init__(self, db):
+        self.db = db
+
+    async def __call__(self, request):
+        if request.path not in ('/', '/index.php'):
+            return Response("Not found", 404, 'text/plain')
+        action = request.query.get('action', 'list')
+        if action != 'list':
+            return Response(f"Action {action} is not available in the stand-in server", 404, 'text/plain')
+
+        projects = await self.db.fetch_all("SELECT * FROM it_domain_projects ORDER BY project_name")
+        rows = []
+        for project in projects:
+            cells = [escape(project[field]) for field, _ in IT_PROJECT_FIELDS]
+            cells[0] = f"<code>{escape(project['task_index'], 'N/A')}</code>"
+            cells[1] = f"<strong>{cells[1]}</strong>"
+            cells[12] = {'Y': '<span class="badge bg-success">Yes</span>',
+                         'N': '<span class="badge bg-danger">No</span>'}.get(project['reuse_ip'], '')
+            cells.append(f'<a href="?action=edit&amp;id={project["id"]}" class="btn btn-sm btn-outline-primary">Edit</a>')
+            rows.append(cells)
+        body = f"""
+        <div class="d-flex justify-content-between align-items-center mb-3">
+            <h2>All Projects ({len(projects)})</h2>
+            <form method="POST" style="display: inline;">
+                <button type="submit" name="export_data" class="btn btn-success">Export All Data to CSV</button>
+            </form>
+        </div>
+        <div class="card">
+            <div class="card-header"><h5>Complete Project Overview - All 17 TO Report Fields</h5></div>
+            <div class="card-body">
+                {table([label for _, label in IT_PROJECT_FIELDS] + ["Actions"], rows, "table table-striped table-hover")}
             </div>
-        </body>
-        </html>
-        """
-        self.wfile.write(html_content.encode())
+        </div>"""
+        return Response(page("IT Domain - DV Project Management", "IT Domain - DV Management", "primary",
+                             self.links, body))
 
-def start_server(port, handler_class):
-    """Start a simple HTTP server on the specified port"""
-    with socketserver.TCPServer(("", port), handler_class) as httpd:
-        print(f"Server running on port {port}")
-        httpd.serve_forever()
+class NXDomainApp:
+    """app/domains/nx-domain/index.php and api/get-project-details.php"""
 
-if __name__ == "__main__":
-    # Start IT domain server on port 8080
-    it_thread = threading.Thread(target=start_server, args=(8080, ITDomainHandler))
-    it_thread.daemon = True
-    it_thread.start()
-    
-    # Start NX domain server on port 8081
-    nx_thread = threading.Thread(target=start_server, args=(8081, NXDomainHandler))
-    nx_thread.daemon = True
-    nx_thread.start()
-    
-    print("Starting test servers...")
-    print("IT Domain: http://localhost:8080")
-    print("NX Domain: http://localhost:8081")
+    links = (("?action=dashboard", "Dashboard"), ("?action=coverage", "Coverage Reports"),
+             ("?action=import", "Import IT Data"), ("?action=to_summary", "TO Summary"))
+
+    def __init__(self, db, cache=None):
+        self.db = db
+        self.cache = cache
+
+    async def __call__(self, request):
+        if request.path == '/api/get-project-details.php':
+            return await self.project_details(request)
+        if request.path not in ('/', '/index.php'):
+            return Response("Not found", 404, 'text/plain')
+        action = request.query.get('action', 'dashboard')
+        if action == 'export':
+            return await self.export(request)
+        if action == 'to_summary':
+            return await self.cached(request, 'to_summary', self.to_summary_page)
+        handler = {'dashboard': self.dashboard, 'coverage': self.coverage}.get(action)
+        if handler is None:
+            return Response(f"Action {action} is not available in the stand-in server", 404, 'text/plain')
+        return Response(self.page(await handler()))
+
+    def page(self, body):
+        return page("NX Domain - DV Reports & TO Summary", "NX Domain - DV Reports", "success", self.links, body)
+
+    async def cached(self, request, resource, build):
+        """Serve build()'s (body, content type) through the response cache"""
+        if self.cache is None:
+            body, content_type = await build()
+            return Response(body, content_type=content_type)
+
+        version = tuple((await self.db.fetch_all(DATA_VERSION_SQL))[0].values())
+        entry, hit = await self.cache.get((resource, version), build)
+        use_gzip = accepts_gzip(request.headers.get('accept-encoding', ''))
+        etag = entry.gzip_etag if use_gzip else entry.etag
+        headers = {'ETag': etag, 'Vary': 'Accept-Encoding', 'Cache-Control': 'no-cache',
+                   'X-Cache': 'HIT' if hit else 'MISS'}
+        if etag_matches(request.headers.get('if-none-match', ''), etag):
+            return Response(b"", 304, None, headers)
+        if use_gzip:
+            return Response(entry.gzip_body, content_type=entry.content_type,
+                            headers={**headers, 'Content-Encoding': 'gzip'})
+        body = await asyncio.get_running_loop().run_in_executor(self.db.executor, gzip.decompress, entry.gzip_body)
+        return Response(body, content_type=entry.content_type, headers=headers)
+
+    async def to_summary_page(self):
+        return self.page(await self.to_summary()).encode('utf-8'), 'text/html; charset=UTF-8'
+
+    async def dashboard(self):
+        coverage, imported, summary = await asyncio.gather(
+            self.db.fetch_all("SELECT * FROM coverage_reports ORDER BY project_name"),
+            self.db.fetch_one("SELECT COUNT(DISTINCT project_name) AS n FROM imported_it_data"),
+            self.db.fetch_one("SELECT COUNT(*) AS n FROM to_summary_view"),
+        )
+        cards = "".join(
+            f"""<div class="col-md-4"><div class="card text-center">
+                <div class="card-header bg-{color} text-white"><h5>{title}</h5></div>
+                <div class="card-body"><h3>{count}</h3><p>{text}</p>
+                <a href="?action={action}" class="btn btn-{color}">{button}</a></div></div></div>"""
+            for color, title, count, text, action, button in (
+                ("info", "Coverage Reports", len(coverage), "Projects with coverage data", "coverage", "View Reports"),
+                ("warning", "Imported IT Data", imported['n'], "Projects from IT domain", "import", "Import Data"),
+                ("primary", "TO Summary", summary['n'], "Combined project records", "to_summary", "View Summary"),
+            )
+        )
+        recent = table(
+            ["Project", "Line Coverage", "FSM Coverage", "Toggle Coverage", "TO Date"],
+            ([escape(r['project_name']), format_percentage(r['line_coverage']), format_percentage(r['fsm_coverage']),
+              format_percentage(r['toggle_coverage']), format_date(r['to_date'])] for r in coverage[:5]),
+        )
+        return f"""
+        <h2>NX Domain Dashboard</h2>
+        <div class="row">{cards}</div>
+        <div class="row mt-4"><div class="col-md-12"><div class="card">
+            <div class="card-header"><h5>Recent Coverage Data</h5></div>
+            <div class="card-body">{recent}</div>
+        </div></div></div>"""
+
+    async def coverage(self):
+        reports = await self.db.fetch_all("SELECT * FROM coverage_reports ORDER BY project_name")
+        rows = (
+            [escape(r['project_name']), coverage_badge(r['line_coverage']), coverage_badge(r['fsm_coverage']),
+             coverage_badge(r['interface_toggle_coverage']), coverage_badge(r['toggle_coverage']),
+             f'<a href="{escape(r["coverage_report_path"])}" target="_blank" class="btn btn-sm btn-outline-info">View Report</a>'
+             if r['coverage_report_path'] else "N/A",
+             format_date(r['to_date']), format_datetime(r['rtl_last_update'])]
+            for r in reports
+        )
+        headers = ["Project Name", "Line Coverage", "FSM Coverage", "Interface Toggle", "Toggle Coverage",
+                   "Coverage Report", "TO Date", "RTL Update"]
+        return f'<h2>Coverage Reports</h2><div class="card"><div class="card-body">{table(headers, rows)}</div></div>'
+
+    async def to_summary(self):
+        summary = await self.summary_rows()
+        rows = []
+        for s in summary:
+            links = "".join(
+                f'<a href="{escape(s[field])}" target="_blank" class="btn btn-sm btn-outline-{color}" title="{title}">{title[0]}</a>'
+                for field, color, title in (("spip_url", "primary", "SPIP"), ("wiki_url", "info", "Wiki"),
+                                            ("coverage_report_path", "success", "Coverage"))
+                if s[field]
+            )
+            rows.append([
+                f"<strong>{escape(s['project'])}</strong>", escape(s['spip_ip'], 'N/A'), escape(s['ip'], 'N/A'),
+                escape(s['dv_engineer'], 'N/A'), escape(s['digital_designer'], 'N/A'),
+                escape(s['business_unit'], 'N/A'), coverage_badge(s['line_coverage']),
+                coverage_badge(s['fsm_coverage']), coverage_badge(s['toggle_coverage']), format_date(s['to_date']),
+                f'<code class="small">{escape(s["git_version"][:8])}</code>' if s['git_version']
+                else '<span class="text-muted">N/A</span>',
+                f'<div class="btn-group" role="group">{links}</div>',
+            ])
+        headers = ["Project", "SPIP IP", "IP", "DV Engineer", "DD", "BU", "Line Cov", "FSM Cov", "Toggle Cov",
+                   "TO Date", "Git Version", "Links"]
+        empty = "" if summary else (
+            '<div class="text-center py-4"><p class="text-muted">No TO summary data available. Import IT domain data '
+            'and ensure coverage reports are available.</p></div>')
+        return (f'<h2>TO Summary - Combined Project Data</h2><div class="card"><div class="card-body">'
+                f'{table(headers, rows, "table table-striped table-hover")}{empty}</div></div>')
+
+    async def summary_rows(self):
+        """getTOSummaryRows(): the materialized summary once it has been refreshed, else the view"""
+        refreshed = await self.db.fetch_one("SELECT COUNT(*) AS n FROM to_summary_refresh_state")
+        if refreshed['n']:
+            return await self.db.fetch_all(
+                f"SELECT {', '.join(SUMMARY_COLUMNS)} FROM to_summary_materialized ORDER BY project")
+        return await self.db.fetch_all("SELECT * FROM to_summary_view ORDER BY project")
+
+    async def export(self, request):
+        report_format = request.query.get('format', 'json')
+        if report_format not in REPORT_CONTENT_TYPES:
+            return Response(f"Unknown format {report_format}", 400, 'text/plain')
+
+        async def build():
+            report = to_summary_report(await self.summary_rows(), report_format)
+            return report.encode('utf-8'), REPORT_CONTENT_TYPES[report_format]
+
+        return await self.cached(request, f"export.{report_format}", build)
+
+    async def project_details(self, request):
+        identifier = request.query.get('id')
+        if identifier is None:
+            return json_response({'success': False, 'error': 'Project identifier is required'}, 400)
+        try:
+            project = await self.db.fetch_one(PROJECT_DETAILS_SQL, (identifier,))
+        except sqlite3.Error as e:
+            return json_response({'success': False, 'error': f"Database error: {e}"}, 500)
+        if project is None:
+            return json_response({'success': False, 'error': 'Project not found'}, 400)
+
+        # Same formats as PHP's date('M j, Y') and date('M j, Y g:i A')
+        for field, with_time in (('to_date', False), ('rtl_last_update', True), ('to_report_creation', True)):
+            moment = parse_timestamp(project[field])
+            if moment:
+                formatted = f"{moment:%b} {moment.day}, {moment.year}"
+                if with_time:
+                    formatted += f" {moment.hour % 12 or 12}:{moment:%M %p}"
+                project[f"{field}_formatted"] = formatted
+        return json_response({'success': True, 'project': project})
+
+async def start_servers(data_dir, host='', it_port=8080, nx_port=8081, projects=DEFAULT_PROJECTS, seed=42,
+                        workers=DEFAULT_WORKERS, cache_bytes=DEFAULT_CACHE_BYTES):
+    """Build both databases under data_dir and start listening; returns the asyncio servers
+
+    cache_bytes=0 turns the TO summary response cache off.
+    """
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="stand-in-db")
+    servers = []
+    for domain, port in (('it', it_port), ('nx', nx_port)):
+        path = Path(data_dir) / f"{domain}_domain.sqlite"
+        await asyncio.get_running_loop().run_in_executor(executor, build_database, domain, path, projects, seed)
+        db = DomainDatabase(path, executor)
+        if domain == 'it':
+            app = ITDomainApp(db)
+        else:
+            app = NXDomainApp(db, ResponseCache(cache_bytes, executor) if cache_bytes else None)
+        servers.append(await asyncio.start_server(lambda r, w, app=app: serve_connection(app, r, w),
+                                                  host or None, port, limit=MAX_HEADER_BYTES))
+    return servers
+
+def serve_in_background(data_dir, host='127.0.0.1', it_port=0, nx_port=0, **kwargs):
+    """Run both servers on an event loop thread; returns ((it_port, nx_port), stop)
+
+    Port 0 picks free ports, which is what tests want.
+    """
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    servers = asyncio.run_coroutine_threadsafe(
+        start_servers(data_dir, host, it_port, nx_port, **kwargs), loop).result()
+
+    def stop():
+        async def close():
+            for server in servers:
+                server.close()
+                await server.wait_closed()
+            # Idle keep-alive connections are still waiting for their next request
+            tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        asyncio.run_coroutine_threadsafe(close(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+    return tuple(server.sockets[0].getsockname()[1] for server in servers), stop
+
+async def serve_forever(args, data_dir):
+    servers = await start_servers(data_dir, args.host, args.it_port, args.nx_port, args.projects, args.seed,
+                                  args.workers, args.cache_bytes)
+    print_status(f"IT Domain: http://localhost:{args.it_port}")
+    print_status(f"NX Domain: http://localhost:{args.nx_port}")
+    print_status(f"Databases: {data_dir} ({args.projects} synthetic projects)")
     print("Press Ctrl+C to stop")
-    
+    await asyncio.gather(*(server.serve_forever() for server in servers))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stand-in IT/NX domain websites backed by SQLite")
+    parser.add_argument("--host", default="", help="Address to bind (default: all interfaces)")
+    parser.add_argument("--it-port", type=int, default=8080, help="IT domain port (default: 8080)")
+    parser.add_argument("--nx-port", type=int, default=8081, help="NX domain port (default: 8081)")
+    parser.add_argument("--projects", type=int, default=DEFAULT_PROJECTS,
+                        help=f"Synthetic projects per domain (default: {DEFAULT_PROJECTS})")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the synthetic data")
+    parser.add_argument("--cache-bytes", type=int, default=DEFAULT_CACHE_BYTES,
+                        help="Byte budget of the TO summary response cache; 0 turns it off (default: 64 MiB)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Query threads (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--data-dir", help="Keep the SQLite files here (default: a temporary directory)")
+    args = parser.parse_args(argv)
+
+    print_step("Starting test servers...")
     try:
-        while True:
-            time.sleep(1)
+        if args.data_dir:
+            Path(args.data_dir).mkdir(parents=True, exist_ok=True)
+            asyncio.run(serve_forever(args, args.data_dir))
+        else:
+            with tempfile.TemporaryDirectory() as data_dir:
+                asyncio.run(serve_forever(args, data_dir))
     except KeyboardInterrupt:
-        print("\nShutting down servers...")
\ No newline at end of file
+        print("\nShutting down servers...")
+    except OSError as e:
+        print_error(f"Cannot start servers: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+SQL Tokenizer Test
+Checks that sql_tokenizer.py splits MySQL scripts on real statement
+boundaries only (not inside strings, comments or DELIMITER blocks), gives
+the same statements when the input arrives in small chunks, and that the
+SQLite conversion loads every schema file in app/database/schemas.
+"""
+
+import io
+import sqlite3
+import sys
+from pathlib import Path
+
+from sql_tokenizer import iter_sqlite_statements, iter_statements, statement_text
+
+SCHEMA_DIR = Path(__file__).resolve().parent.parent.parent / 'app' / 'database' / 'schemas'
+
+SCRIPT = """-- header; not a statement
+CREATE TABLE t (id INT AUTO_INCREMENT PRIMARY KEY, note VARCHAR(20) DEFAULT 'a;b');
+# hash comment; still a comment
+INSERT INTO t (note) VALUES ('it''s; fine'), ("dq \\"; x"), ('back\\\\');
+/* block; comment */ SELECT note AS `odd;name` FROM t;
+DELIMITER //
+CREATE TRIGGER trg BEFORE INSERT ON t
+FOR EACH ROW
+BEGIN
+    SET NEW.note = CONCAT(NEW.note, ';');
+END//
+DELIMITER ;
+SELECT 1;;
+SELECT 'INT' AS kind
+"""
+
+def print_status(message):
+    print(f"\033[0;32m[INFO]\033[0m {message}")
+
+def print_warning(message):
+    print(f"\033[1;33m[WARNING]\033[0m {message}")
+
+def print_error(message):
+    print(f"\033[0;31m[ERROR]\033[0m {message}")
+
+def print_step(message):
+    print(f"\033[0;34m[STEP]\033[0m {message}")
+
+def split(source, chunk_size=1 << 16):
+    return [statement_text(tokens) for tokens in iter_statements(source, chunk_size)]
+
+def test_statement_boundaries():
+    """Semicolons in strings, comments, identifiers and trigger bodies do not split"""
+    print_step("Splitting a script with quotes, comments and a DELIMITER block")
+    statements = split(SCRIPT)
+    assert len(statements) == 6, statements
+    assert statements[0].startswith("-- header; not a statement\nCREATE TABLE t"), statements[0]
+    assert statements[1].endswith("('back\\\\')"), statements[1]
+    assert statements[3].startswith("CREATE TRIGGER trg") and statements[3].endswith("END"), statements[3]
+    assert statements[4:] == ["SELECT 1", "SELECT 'INT' AS kind"], statements[4:]
+    print_status(f"✅ {len(statements)} statements")
+
+def test_chunked_input_matches():
+    """Reading a file object a few characters at a time gives the same statements"""
+    print_step("Splitting the same script from a file in tiny chunks")
+    expected = split(SCRIPT)
+    for chunk_size in (1, 2, 3, 7, 64):
+        assert split(io.StringIO(SCRIPT), chunk_size) == expected, f"chunk size {chunk_size}"
+    print_status("✅ Chunked and whole-string input agree")
+
+def test_sqlite_conversion():
+    """Rewrites touch code only, strings are re-quoted; triggers and USE statements are dropped"""
+    print_step("Converting the script to SQLite")
+    statements = list(iter_sqlite_statements(SCRIPT))
+    assert len(statements) == 5, statements
+    assert "INTEGER PRIMARY KEY AUTOINCREMENT" in statements[0] and "TEXT DEFAULT 'a;b'" in statements[0], statements[0]
+    assert not any("TRIGGER" in statement for statement in statements), statements
+    assert statements[-1] == "SELECT 'INT' AS kind", statements[-1]
+
+    conn = sqlite3.connect(':memory:')
+    for statement in statements[:3]:
+        conn.execute(statement)
+    notes = [row[0] for row in conn.execute("SELECT note FROM t ORDER BY id")]
+    assert notes == ["it's; fine", 'dq "; x', "back\\"], notes
+    assert list(iter_sqlite_statements("USE nx_domain;\nCREATE DATABASE x CHARACTER SET utf8mb4;")) == []
+    print_status("✅ SQLite statements execute")
+
+def test_comment_and_collate_identifiers():
+    """COMMENT and COLLATE clauses are dropped; columns named comment or collate are kept"""
+    print_step("Converting columns named comment and collate")
+    script = """CREATE TABLE notes (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    comment VARCHAR(200) COMMENT 'free text',
+    title VARCHAR(50) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci COMMENT "title",
+    CHECK (comment <> 'x')
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='notes';
+INSERT INTO notes (comment, title) VALUES ('c', 't');
+UPDATE notes SET comment = 'd' WHERE comment = 'c';
+SELECT comment, title FROM notes ORDER BY title COLLATE utf8mb4_bin, comment;
+CREATE TABLE rules (id INT, collate VARCHAR(20) COLLATE 'utf8mb4_bin', comment TEXT);
+INSERT INTO rules (collate, comment) VALUES ('ci', 'c');
+SELECT comment 'note' FROM rules WHERE collate = 'ci';
+"""
+    statements = list(iter_sqlite_statements(script))
+    assert len(statements) == 7, statements
+    assert "comment TEXT" in statements[0] and "CHECK (comment <> 'x')" in statements[0], statements[0]
+    assert not any(text in statements[0] for text in ("free text", "utf8mb4", "ENGINE", "'notes'", '"title"')), statements[0]
+    assert statements[1] == "INSERT INTO notes (comment, title) VALUES ('c', 't')", statements[1]
+    assert statements[2] == "UPDATE notes SET comment = 'd' WHERE comment = 'c'", statements[2]
+    assert statements[3] == "SELECT comment, title FROM notes ORDER BY title , comment", statements[3]
+    # SQLite reserves COLLATE, so these are compared as text only
+    assert statements[4] == "CREATE TABLE rules (id INTEGER, collate TEXT , comment TEXT)", statements[4]
+    assert statements[5] == "INSERT INTO rules (collate, comment) VALUES ('ci', 'c')", statements[5]
+    assert statements[6] == "SELECT comment 'note' FROM rules WHERE collate = 'ci'", statements[6]
+
+    conn = sqlite3.connect(':memory:')
+    for statement in statements[:3]:
+        conn.execute(statement)
+    rows = conn.execute(statements[3]).fetchall()
+    assert rows == [("d", "t")], rows
+    print_status("✅ comment and collate columns survive the conversion")
+
+def test_schema_files_load():
+    """Every schema file creates its tables, views and indexes in SQLite"""
+    print_step("Loading app/database/schemas/*.sql")
+    for path in sorted(SCHEMA_DIR.glob('*-schema*.sql')):
+        conn = sqlite3.connect(':memory:')
+        with open(path, 'r', encoding='utf-8') as f:
+            for statement in iter_sqlite_statements(f, chunk_size=512):
+                try:
+                    conn.execute(statement)
+                except sqlite3.Error as e:
+                    # Sample rows may rely on triggers or break CHECK constraints; DDL must not fail
+                    assert statement.upper().startswith("INSERT"), f"{path.name}: {e}\n{statement}"
+        objects = conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE type IN ('table', 'view')").fetchone()[0]
+        assert objects > 0, path.name
+        print_status(f"✅ {path.name}: {objects} tables and views")
+
+def main():
+    """Main test function"""
+    print("=" * 60)
+    print("SQL Tokenizer Test")
+    print("=" * 60)
+
+    failed = False
+    for test in (test_statement_boundaries, test_chunked_input_matches, test_sqlite_conversion,
+                 test_comment_and_collate_identifiers, test_schema_files_load):
+        try:
+            test()
+        except AssertionError as e:
+            print_error(f"❌ {e}")
+            failed = True
+        print()
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Stand-in Server Test
+Starts test_server.py on free ports and checks the IT listing, the NX TO
+summary page and api/get-project-details.php against its SQLite data, plus
+keep-alive, pipelining and concurrent clients.
+"""
+
+import http.client
+import json
+import socket
+import sqlite3
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from test_server import serve_in_background
+
+PROJECTS = 50
+
+def print_status(message):
+    print(f"\033[0;32m[INFO]\033[0m {message}")
+
+def print_warning(message):
+    print(f"\033[1;33m[WARNING]\033[0m {message}")
+
+def print_error(message):
+    print(f"\033[0;31m[ERROR]\033[0m {message}")
+
+def print_step(message):
+    print(f"\033[0;34m[STEP]\033[0m {message}")
+
+class StandInServer:
+    """Both domain servers on free ports for the duration of a with block"""
+
+    def __enter__(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        (self.it_port, self.nx_port), self.stop = serve_in_background(self.tmpdir.name, projects=PROJECTS)
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+        self.tmpdir.cleanup()
+
+    def database(self, domain):
+        return sqlite3.connect(Path(self.tmpdir.name) / f"{domain}_domain.sqlite")
+
+def get(port, path, conn=None):
+    conn = conn or http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    conn.request("GET", path)
+    response = conn.getresponse()
+    return response.status, response.getheader("Content-Type"), response.read().decode('utf-8')
+
+def test_pages_show_database_rows():
+    """The IT listing and TO summary list every project in the SQLite copies"""
+    print_step("Fetching the IT listing and the NX pages")
+    with StandInServer() as server:
+        status, content_type, body = get(server.it_port, "/")
+        assert status == 200 and content_type.startswith("text/html"), (status, content_type)
+        assert f"All Projects ({PROJECTS})" in body, body[:500]
+        assert "RL0000007" in body and "Export All Data to CSV" in body
+
+        conn = server.database('nx')
+        (count,) = conn.execute("SELECT COUNT(*) FROM to_summary_view").fetchone()
+        (first,) = conn.execute("SELECT project FROM to_summary_view ORDER BY project LIMIT 1").fetchone()
+        conn.close()
+        status, _, body = get(server.nx_port, "/index.php?action=to_summary")
+        assert status == 200 and body.count("<tr>") == count + 1, (status, body.count("<tr>"), count)
+        assert f"<strong>{first}</strong>" in body
+
+        status, _, body = get(server.nx_port, "/")
+        assert status == 200 and "NX Domain Dashboard" in body and f"<h3>{count}</h3>" in body
+        assert get(server.nx_port, "/?action=coverage")[0] == 200
+        assert get(server.nx_port, "/missing.php")[0] == 404
+
+        status, content_type, body = get(server.nx_port, "/?action=export&format=json")
+        assert status == 200 and content_type == "application/json" and len(json.loads(body)) == count
+        status, content_type, body = get(server.nx_port, "/?action=export&format=csv")
+        assert status == 200 and content_type.startswith("text/csv") and body.count("\n") == count + 1
+        status, content_type, body = get(server.nx_port, "/?action=export&format=xml")
+        assert status == 200 and body.count("<task_index>") == count, body[:200]
+        assert get(server.nx_port, "/?action=export&format=pdf")[0] == 400
+    print_status(f"✅ {count} TO summary rows rendered")
+
+def test_project_details_api():
+    """Same JSON shape and errors as get-project-details.php"""
+    print_step("Calling api/get-project-details.php")
+    with StandInServer() as server:
+        status, content_type, body = get(server.nx_port, "/api/get-project-details.php?id=RL0000020")
+        data = json.loads(body)
+        assert status == 200 and content_type == "application/json", (status, content_type)
+        project = data['project']
+        assert data['success'] and project['project'] == "RL0000020" and project['task_index'] == "TASK0000020"
+        assert len([key for key in project if not key.endswith("_formatted")]) == 34, sorted(project)
+        assert project['line_coverage'] is not None, project
+        if project['to_date']:
+            assert project['to_date_formatted'].count(",") == 1, project['to_date_formatted']
+        if project['rtl_last_update']:
+            assert project['rtl_last_update_formatted'].endswith(("AM", "PM")), project['rtl_last_update_formatted']
+
+        status, _, body = get(server.nx_port, "/api/get-project-details.php?id=nope")
+        assert status == 400 and json.loads(body) == {'success': False, 'error': 'Project not found'}
+        status, _, body = get(server.nx_port, "/api/get-project-details.php")
+        assert status == 400 and json.loads(body)['error'] == 'Project identifier is required'
+    print_status("✅ Project details match the PHP endpoint")
+
+def test_keep_alive_and_concurrency():
+    """One connection serves many requests, pipelined requests are answered in order, clients run in parallel"""
+    print_step("Checking keep-alive, pipelining and concurrent clients")
+    with StandInServer() as server:
+        conn = http.client.HTTPConnection("127.0.0.1", server.nx_port, timeout=10)
+        get(server.nx_port, "/api/get-project-details.php?id=RL0000001", conn)
+        sock = conn.sock
+        for i in range(2, 6):
+            status, _, _ = get(server.nx_port, f"/api/get-project-details.php?id=RL{i:07d}", conn)
+            assert status == 200 and conn.sock is sock, "connection was not kept alive"
+        conn.close()
+
+        with socket.create_connection(("127.0.0.1", server.nx_port), timeout=10) as sock:
+            sock.sendall(b"".join(f"GET /api/get-project-details.php?id=RL{i:07d} HTTP/1.1\r\nHost: x\r\n\r\n".encode()
+                                  for i in (3, 4)) + b"GET / HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n")
+            data = b""
+            while chunk := sock.recv(65536):
+                data += chunk
+        assert data.count(b"HTTP/1.1 200 OK") == 3, data[:300]
+        assert data.index(b"RL0000003") < data.index(b"RL0000004") < data.index(b"NX Domain Dashboard")
+
+        def client(n):
+            conn = http.client.HTTPConnection("127.0.0.1", server.nx_port, timeout=10)
+            statuses = [get(server.nx_port, f"/api/get-project-details.php?id=RL{(n + i) % PROJECTS:07d}", conn)[0]
+                        for i in range(10)]
+            conn.close()
+            return statuses
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=32) as pool:
+            statuses = [status for result in pool.map(client, range(32)) for status in result]
+        elapsed = time.perf_counter() - started
+        assert statuses == [200] * 320, sorted(set(statuses))
+    print_status(f"✅ 320 requests from 32 clients in {elapsed:.2f}s")
+
+def main():
+    """Main test function"""
+    print("=" * 60)
+    print("Stand-in Server Test")
+    print("=" * 60)
+
+    failed = False
+    for test in (test_pages_show_database_rows, test_project_details_api, test_keep_alive_and_concurrency):
+        try:
+            test()
+        except AssertionError as e:
+            print_error(f"❌ {e}")
+            failed = True
+        print()
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
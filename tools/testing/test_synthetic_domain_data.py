@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Synthetic Domain Data Test
+Checks that generate_synthetic_domain_data.py writes files load_domain_data
+reads unchanged, that the same seed gives the same bytes, and that the
+data contains the duplicates, holes and unmatched NX rows it promises.
+"""
+
+import math
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+DATA_GENERATION_DIR = Path(__file__).resolve().parent.parent / "data-generation"
+sys.path.insert(0, str(DATA_GENERATION_DIR))
+
+import generate_to_summary_from_domains as generator
+from generate_synthetic_domain_data import generate_synthetic_domain_data
+
+def print_status(message):
+    print(f"\033[0;32m[INFO]\033[0m {message}")
+
+def print_warning(message):
+    print(f"\033[1;33m[WARNING]\033[0m {message}")
+
+def print_error(message):
+    print(f"\033[0;31m[ERROR]\033[0m {message}")
+
+def print_step(message):
+    print(f"\033[0;34m[STEP]\033[0m {message}")
+
+@contextmanager
+def working_directory(path):
+    """load_domain_data reads relative paths, so run it from the generated tree"""
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+def test_generated_data_loads():
+    """Every project gets one TO summary record with aligned supplemental data"""
+    print_step("Generating 2,000 synthetic projects")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        counts = generate_synthetic_domain_data(tmpdir, projects=2000, seed=7)
+        with working_directory(tmpdir):
+            domain_data = generator.load_domain_data()
+    it_allproject_data, it_dv_tasks_data, it_supplemental_data, nx_examples_data, nx_supplemental_data = domain_data
+
+    assert [len(data) for data in domain_data] == [counts[path] for path in (
+        generator.IT_ALLPROJECT_PATH, generator.IT_DV_TASKS_PATH, generator.IT_SUPPLEMENTAL_PATH,
+        generator.NX_EXAMPLES_PATH, generator.NX_SUPPLEMENTAL_PATH)], counts
+
+    domain_index = generator.build_domain_index(it_allproject_data, it_dv_tasks_data, nx_examples_data)
+    projects = domain_index["projects"]
+    assert len(projects) == 2000 == len(it_supplemental_data) == len(nx_supplemental_data), len(projects)
+
+    dv_projects = [item['data']['Project'] for item in it_dv_tasks_data]
+    assert len(dv_projects) > len(set(dv_projects)), "no duplicate dv_tasks projects"
+    assert any(isinstance(item['data']['BU'], float) and math.isnan(item['data']['BU']) for item in it_dv_tasks_data)
+    assert any(item['data']['Finish Date'] == "NaT" for item in it_dv_tasks_data)
+    assert any(str(item['data']['IP']).startswith("IP: ") for item in it_allproject_data)
+    assert set(projects) - set(dv_projects), "no allproject-only projects"
+
+    records = [record for record, _ in generator.iter_to_summary_records(
+        enumerate(projects), domain_index, it_supplemental_data, nx_supplemental_data)]
+    unmatched = sum(1 for record in records if record['nx_domain_original'] is None)
+    assert 0 < unmatched < len(records), unmatched
+    assert all(record['to_summary']['spec path'] == f"/project/spec/{record['project']}_spec.pdf" for record in records)
+    print_status(f"✅ {len(records)} records, {unmatched} without NX match")
+
+def test_same_seed_same_bytes():
+    """Generation is deterministic per seed"""
+    print_step("Comparing two runs with the same seed")
+    with tempfile.TemporaryDirectory() as first, tempfile.TemporaryDirectory() as second, \
+            tempfile.TemporaryDirectory() as other:
+        generate_synthetic_domain_data(first, projects=300, seed=3)
+        generate_synthetic_domain_data(second, projects=300, seed=3)
+        generate_synthetic_domain_data(other, projects=300, seed=4)
+        for path in (generator.IT_DV_TASKS_PATH, generator.NX_EXAMPLES_PATH, generator.NX_SUPPLEMENTAL_PATH):
+            content = (Path(first) / path).read_bytes()
+            assert content == (Path(second) / path).read_bytes(), f"{path} differs for the same seed"
+            assert content != (Path(other) / path).read_bytes(), f"{path} identical for different seeds"
+    print_status("✅ Same seed, same files")
+
+def main():
+    """Main test function"""
+    print("=" * 60)
+    print("Synthetic Domain Data Test")
+    print("=" * 60)
+
+    failed = False
+    for test in (test_generated_data_loads, test_same_seed_same_bytes):
+        try:
+            test()
+        except AssertionError as e:
+            print_error(f"❌ {e}")
+            failed = True
+        print()
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
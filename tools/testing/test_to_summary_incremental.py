@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+TO Summary Incremental Regeneration Test
+Runs generate_to_summary_from_domains.py --incremental, changes, adds and
+deletes one source row, runs it again and checks that the output files are
+byte-identical to a full run on the changed data, and that only the
+affected projects were rebuilt.
+"""
+
+import io
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from pathlib import Path
+
+DATA_GENERATION_DIR = Path(__file__).resolve().parent.parent / "data-generation"
+sys.path.insert(0, str(DATA_GENERATION_DIR))
+
+import generate_to_summary_from_domains as generator
+from generate_synthetic_domain_data import generate_synthetic_domain_data
+
+PROJECTS = 200
+
+def print_status(message):
+    print(f"\033[0;32m[INFO]\033[0m {message}")
+
+def print_warning(message):
+    print(f"\033[1;33m[WARNING]\033[0m {message}")
+
+def print_error(message):
+    print(f"\033[0;31m[ERROR]\033[0m {message}")
+
+def print_step(message):
+    print(f"\033[0;34m[STEP]\033[0m {message}")
+
+def run_generator(workdir, *argv):
+    """Run main() inside workdir and return what it printed"""
+    previous = os.getcwd()
+    os.chdir(workdir)
+    output = io.StringIO()
+    try:
+        with redirect_stdout(output):
+            generator.main(list(argv))
+    finally:
+        os.chdir(previous)
+    return output.getvalue()
+
+def read_outputs(workdir, output_format):
+    return ((Path(workdir) / generator.to_summary_output_path(output_format)).read_bytes(),
+            (Path(workdir) / generator.field_mapping_csv_path()).read_bytes())
+
+def edit_source(workdir, path, edit):
+    """Rewrite one domain JSON file after edit(records) changed its records in place"""
+    path = Path(workdir) / path
+    with open(path, 'r', encoding='utf-8') as f:
+        records = json.load(f)
+    edit(records)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(records, f, ensure_ascii=False)
+
+def change_sources(workdir):
+    """Change one dv_tasks row, add one allproject row for a new project and delete one NX row"""
+    edit_source(workdir, generator.IT_DV_TASKS_PATH,
+                lambda records: records[3]["data"].update(DD="Changed Designer"))
+    # allproject-only projects come last, so appending one shifts no other position
+    edit_source(workdir, generator.IT_ALLPROJECT_PATH, lambda records: records.append({
+        "source": "allproject-2025-06-23-09-32-12.xlsx", "sheet": "subtask",
+        "data": {"Project": "ZZNEW0001", "IP": "IP: AFE", "Assignee": "New", "Subtask Status": "OPEN"}}))
+    edit_source(workdir, generator.NX_EXAMPLES_PATH, lambda records: records.pop(10))
+
+def rebuilt_count(printed):
+    m = re.search(r"增量更新: 重新計算 (\d+) 筆", printed)
+    assert m, printed[-500:]
+    return int(m.group(1))
+
+def check_incremental_matches_full(*options):
+    """An incremental run after the changes writes what a full run writes"""
+    output_format = "jsonl" if "jsonl" in options else "json"
+    with tempfile.TemporaryDirectory() as tmpdir:
+        incremental_dir = Path(tmpdir) / "incremental"
+        full_dir = Path(tmpdir) / "full"
+        generate_synthetic_domain_data(incremental_dir, projects=PROJECTS, seed=11)
+
+        assert rebuilt_count(run_generator(incremental_dir, "--incremental", *options)) == PROJECTS
+        assert rebuilt_count(run_generator(incremental_dir, "--incremental", *options)) == 0
+
+        change_sources(incremental_dir)
+        shutil.copytree(incremental_dir, full_dir)
+        rebuilt = rebuilt_count(run_generator(incremental_dir, "--incremental", *options))
+        run_generator(full_dir, *options)
+
+        incremental = read_outputs(incremental_dir, output_format)
+        full = read_outputs(full_dir, output_format)
+    assert incremental[0] == full[0], f"{options}: TO summary output differs from a full run"
+    assert incremental[1] == full[1], f"{options}: field mapping CSV differs from a full run"
+    # The changed project, the project that lost its NX row and the new one
+    assert 0 < rebuilt <= 3, rebuilt
+    return rebuilt
+
+def test_incremental_matches_full_run():
+    """Changed, added and deleted source rows give the same files as a full run"""
+    print_step(f"Regenerating {PROJECTS} synthetic projects incrementally")
+    for options in ((), ("--output-format", "jsonl", "--originals", "reference"), ("--workers", "2")):
+        rebuilt = check_incremental_matches_full(*options)
+        print_status(f"✅ {' '.join(options) or 'defaults'}: {rebuilt} projects rebuilt, output equals a full run")
+
+def main():
+    """Main test function"""
+    print("=" * 60)
+    print("TO Summary Incremental Regeneration Test")
+    print("=" * 60)
+
+    failed = False
+    for test in (test_incremental_matches_full_run,):
+        try:
+            test()
+        except AssertionError as e:
+            print_error(f"❌ {e}")
+            failed = True
+        print()
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
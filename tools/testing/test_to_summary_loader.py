@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+TO Summary Loader Test
+Loads generated TO summary records into a SQLite stand-in of nx_domain_db
+(built from nx-domain-schema-new.sql) and checks upserts, batching and
+constraint rejects.
+"""
+
+import copy
+import sqlite3
+import sys
+from pathlib import Path
+
+TOOLS_DIR = Path(__file__).resolve().parent.parent
+REPO_ROOT = TOOLS_DIR.parent
+sys.path.insert(0, str(TOOLS_DIR / "data-generation"))
+
+import generate_to_summary_from_domains as generator
+from load_to_summary_into_nx_db import load_to_summary_records
+from sql_tokenizer import iter_sqlite_statements
+
+NX_SCHEMA_PATH = REPO_ROOT / "app" / "database" / "schemas" / "nx-domain-schema-new.sql"
+
+def print_status(message):
+    print(f"\033[0;32m[INFO]\033[0m {message}")
+
+def print_warning(message):
+    print(f"\033[1;33m[WARNING]\033[0m {message}")
+
+def print_error(message):
+    print(f"\033[0;31m[ERROR]\033[0m {message}")
+
+def print_step(message):
+    print(f"\033[0;34m[STEP]\033[0m {message}")
+
+def create_nx_database():
+    """In-memory SQLite copy of the NX domain schema (including its sample rows)"""
+    conn = sqlite3.connect(':memory:')
+    with open(NX_SCHEMA_PATH, 'r', encoding='utf-8') as f:
+        for statement in iter_sqlite_statements(f):
+            try:
+                conn.execute(statement)
+            except sqlite3.Error:
+                # Sample rows that violate the schema's own CHECK constraints are skipped
+                pass
+    conn.commit()
+    return conn
+
+def fixture_records():
+    """Records from the checked-in to_summary_examples.json"""
+    with open(TOOLS_DIR / "data-generation" / generator.TO_SUMMARY_JSON_PATH, 'r', encoding='utf-8') as f:
+        return list(generator.iter_json_array(f))
+
+def synthetic_records(count):
+    """Copies of the fixture records under distinct project names"""
+    base = fixture_records()
+    records = []
+    for i in range(count):
+        record = copy.deepcopy(base[i % len(base)])
+        record["to_summary"]["Project"] = f"RL{i:05d}"
+        records.append(record)
+    return records
+
+def table_counts(conn):
+    return {
+        table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        for table in ("coverage_reports", "version_control", "imported_it_data")
+    }
+
+def test_load_fixture_records():
+    """Fixture records land in all three tables and show up in to_summary_view"""
+    print_step("Loading fixture records into SQLite stand-in")
+    conn = create_nx_database()
+    records = fixture_records()
+
+    stats = load_to_summary_records(conn, records, "sqlite", batch_size=10)
+    assert stats["records"] == len(records) and stats["rejected"] == 0, stats
+
+    counts = table_counts(conn)
+    assert counts == {"coverage_reports": 2, "version_control": 2, "imported_it_data": 2}, counts
+
+    # The schema's sample coverage rows are updated in place
+    line_coverage = dict(conn.execute("SELECT project_name, line_coverage FROM coverage_reports"))
+    for record in records:
+        to_summary = record["to_summary"]
+        assert line_coverage[to_summary["Project"]] == float(to_summary["Line Coverage"])
+
+    view_rows = conn.execute("SELECT project, git_version, reuse_ip FROM to_summary_view").fetchall()
+    expected = sorted((r["to_summary"]["Project"], r["to_summary"]["git version"], r["to_summary"]["re-use IP"]) for r in records)
+    assert sorted(view_rows) == expected, view_rows
+    print_status(f"✅ {stats['records']} records loaded, view rows match")
+
+def test_reload_is_idempotent():
+    """Loading the same records twice leaves one row per project"""
+    print_step("Reloading the same records")
+    conn = create_nx_database()
+    records = synthetic_records(250)
+    load_to_summary_records(conn, records, "sqlite", batch_size=64)
+    first = table_counts(conn)
+    stats = load_to_summary_records(conn, records, "sqlite", batch_size=7)
+    assert table_counts(conn) == first, (first, table_counts(conn))
+    assert first["imported_it_data"] == 250
+    assert stats["batches"] == -(-250 // 7), stats["batches"]
+    print_status(f"✅ Row counts stable after reload: {first}")
+
+def test_constraint_rejects_only_bad_records():
+    """A record violating a CHECK constraint is rejected without losing its batch; empty batches are not counted"""
+    print_step("Loading a batch containing an invalid business unit")
+    conn = create_nx_database()
+    records = synthetic_records(20)
+    records[5]["to_summary"]["BU"] = "XX"
+
+    stats = load_to_summary_records(conn, records, "sqlite", batch_size=10)
+    assert stats["rejected"] == 1 and stats["records"] == 19, stats
+    assert table_counts(conn)["imported_it_data"] == 19
+    assert conn.execute("SELECT COUNT(*) FROM imported_it_data WHERE project_name = 'RL00005'").fetchone()[0] == 0
+    assert stats["batches"] == 2, stats["batches"]
+
+    # A batch whose records are all rejected writes nothing and is not counted
+    conn = create_nx_database()
+    for record in records[10:]:
+        record["to_summary"]["BU"] = "XX"
+    stats = load_to_summary_records(conn, records, "sqlite", batch_size=10)
+    assert stats["rejected"] == 11 and stats["records"] == 9 and stats["batches"] == 1, stats
+    print_status(f"✅ Rejected: {stats['errors'][0]}")
+
+def main():
+    """Main test function"""
+    print("=" * 60)
+    print("TO Summary Loader Test")
+    print("=" * 60)
+
+    failed = False
+    for test in (test_load_fixture_records, test_reload_is_idempotent, test_constraint_rejects_only_bad_records):
+        try:
+            test()
+        except AssertionError as e:
+            print_error(f"❌ {e}")
+            failed = True
+        print()
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+TO Summary Metrics Test
+Runs generate_to_summary_from_domains.py with --metrics and --profile on
+synthetic data and checks the stage timings, counters and pstats output.
+"""
+
+import io
+import json
+import os
+import pstats
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from pathlib import Path
+
+DATA_GENERATION_DIR = Path(__file__).resolve().parent.parent / "data-generation"
+sys.path.insert(0, str(DATA_GENERATION_DIR))
+
+import generate_to_summary_from_domains as generator
+from generate_synthetic_domain_data import generate_synthetic_domain_data
+
+def print_status(message):
+    print(f"\033[0;32m[INFO]\033[0m {message}")
+
+def print_warning(message):
+    print(f"\033[1;33m[WARNING]\033[0m {message}")
+
+def print_error(message):
+    print(f"\033[0;31m[ERROR]\033[0m {message}")
+
+def print_step(message):
+    print(f"\033[0;34m[STEP]\033[0m {message}")
+
+def run_generator(tmpdir, *argv):
+    """Run main() inside tmpdir and return the metrics report"""
+    metrics_path = Path(tmpdir) / "metrics.json"
+    previous = os.getcwd()
+    os.chdir(tmpdir)
+    try:
+        with redirect_stdout(io.StringIO()):
+            generator.main(["--output-format", "jsonl", "--metrics", str(metrics_path), *argv])
+    finally:
+        os.chdir(previous)
+    with open(metrics_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def test_metrics_counters():
+    """Counters add up per project and are the same with worker processes"""
+    print_step("Collecting metrics for 500 synthetic projects")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        generate_synthetic_domain_data(tmpdir, projects=500, seed=5)
+        report = run_generator(tmpdir)
+        parallel = run_generator(tmpdir, "--workers", "2")
+
+    counters = report["counters"]
+    assert report["records"] == report["projects"] == 500, report
+    for index in ("dv_tasks", "allproject", "nx"):
+        assert counters.get(f"{index}_index_hits", 0) + counters.get(f"{index}_index_misses", 0) == 500, counters
+    assert counters["fallback_to_allproject"] == counters["dv_tasks_index_misses"] > 0, counters
+    assert set(report["stages"]) == {"load", "index", "build_and_write"}, report["stages"]
+    assert parallel["counters"] == counters, (parallel["counters"], counters)
+    print_status(f"✅ {counters}")
+
+def test_profile_output():
+    """--profile writes a pstats file covering the run"""
+    print_step("Profiling a run")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        generate_synthetic_domain_data(tmpdir, projects=50, seed=5)
+        profile_path = Path(tmpdir) / "run.pstats"
+        run_generator(tmpdir, "--profile", str(profile_path))
+        stats = pstats.Stats(str(profile_path))
+    functions = {function for _, _, function in stats.stats}
+    assert {"run", "build_to_summary_record", "load_domain_data"} <= functions, sorted(functions)[:20]
+    print_status(f"✅ {len(stats.stats)} functions profiled")
+
+def main():
+    """Main test function"""
+    print("=" * 60)
+    print("TO Summary Metrics Test")
+    print("=" * 60)
+
+    failed = False
+    for test in (test_metrics_counters, test_profile_output):
+        try:
+            test()
+        except AssertionError as e:
+            print_error(f"❌ {e}")
+            failed = True
+        print()
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+TO Summary Reference Mode Test
+Checks that every {"source", "row"} reference written by
+generate_to_summary_from_domains.py --originals reference resolves to a row
+of the domain file it names, and that the row is the one embed mode
+inlines for the same record.
+"""
+
+import io
+import json
+import os
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from pathlib import Path
+
+DATA_GENERATION_DIR = Path(__file__).resolve().parent.parent / "data-generation"
+sys.path.insert(0, str(DATA_GENERATION_DIR))
+
+import generate_to_summary_from_domains as generator
+from generate_synthetic_domain_data import generate_synthetic_domain_data
+
+PROJECTS = 200
+
+def print_status(message):
+    print(f"\033[0;32m[INFO]\033[0m {message}")
+
+def print_warning(message):
+    print(f"\033[1;33m[WARNING]\033[0m {message}")
+
+def print_error(message):
+    print(f"\033[0;31m[ERROR]\033[0m {message}")
+
+def print_step(message):
+    print(f"\033[0;34m[STEP]\033[0m {message}")
+
+def run_generator(workdir, *argv):
+    """Run main() inside workdir and return the records it wrote"""
+    previous = os.getcwd()
+    os.chdir(workdir)
+    try:
+        with redirect_stdout(io.StringIO()):
+            generator.main(list(argv))
+        return generator.load_to_summary_output("jsonl" if "jsonl" in argv else "json")
+    finally:
+        os.chdir(previous)
+
+def load_source(workdir, path):
+    with open(Path(workdir) / path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def canonical(value):
+    # NaN is not equal to itself, so compare the serialized form
+    return json.dumps(value, ensure_ascii=False, sort_keys=True)
+
+def source_path(field, source):
+    """The domain file a reference in the given record field points into"""
+    if field == "it_domain_original":
+        return generator.IT_DV_TASKS_PATH.parent / generator.IT_ORIGINAL_SOURCE_FILES[source]
+    return {
+        "it_domain_supplemental": generator.IT_SUPPLEMENTAL_PATH,
+        "nx_domain_original": generator.NX_EXAMPLES_PATH,
+        "nx_domain_supplemental": generator.NX_SUPPLEMENTAL_PATH,
+    }[field]
+
+def test_references_resolve():
+    """Each reference names a row whose source matches and which equals the embedded original"""
+    print_step(f"Resolving the references of {PROJECTS} synthetic projects")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        generate_synthetic_domain_data(tmpdir, projects=PROJECTS, seed=3)
+        embedded = run_generator(tmpdir)
+        sources = {}
+        for output_format in ("json", "jsonl"):
+            referenced = run_generator(tmpdir, "--output-format", output_format, "--originals", "reference")
+            assert len(referenced) == len(embedded), (len(referenced), len(embedded))
+
+            resolved = 0
+            for record, original in zip(referenced, embedded):
+                assert record["example_id"] == original["example_id"], (record["example_id"], original["example_id"])
+                for field in generator.EMBEDDED_SOURCE_FIELDS:
+                    reference = record[field]
+                    if reference is None:
+                        assert original[field] is None, (record["example_id"], field)
+                        continue
+                    assert set(reference) == {"source", "row"}, reference
+                    path = source_path(field, reference["source"])
+                    if path not in sources:
+                        sources[path] = load_source(tmpdir, path)
+                    rows = sources[path]
+                    assert 0 <= reference["row"] < len(rows), (record["example_id"], field, reference)
+                    item = rows[reference["row"]]
+                    assert item["source"] == reference["source"], (record["example_id"], field, reference)
+                    assert canonical(item) == canonical(original[field]), (record["example_id"], field, reference)
+                    resolved += 1
+            assert resolved > len(referenced), resolved
+            print_status(f"✅ {output_format}: {resolved} references resolved to the embedded rows")
+
+def main():
+    """Main test function"""
+    print("=" * 60)
+    print("TO Summary Reference Mode Test")
+    print("=" * 60)
+
+    failed = False
+    for test in (test_references_resolve,):
+        try:
+            test()
+        except AssertionError as e:
+            print_error(f"❌ {e}")
+            failed = True
+        print()
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
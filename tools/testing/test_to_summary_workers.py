@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+TO Summary Worker Parity Test
+Checks that generate_to_summary_from_domains.py --workers N writes the same
+bytes as --workers 1 for every output format and originals mode.
+"""
+
+import io
+import os
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from pathlib import Path
+
+DATA_GENERATION_DIR = Path(__file__).resolve().parent.parent / "data-generation"
+sys.path.insert(0, str(DATA_GENERATION_DIR))
+
+import generate_to_summary_from_domains as generator
+from generate_synthetic_domain_data import generate_synthetic_domain_data
+
+PROJECTS = 300
+
+def print_status(message):
+    print(f"\033[0;32m[INFO]\033[0m {message}")
+
+def print_warning(message):
+    print(f"\033[1;33m[WARNING]\033[0m {message}")
+
+def print_error(message):
+    print(f"\033[0;31m[ERROR]\033[0m {message}")
+
+def print_step(message):
+    print(f"\033[0;34m[STEP]\033[0m {message}")
+
+def run_generator(workdir, *argv):
+    """Run main() inside workdir and return the output and field mapping bytes"""
+    previous = os.getcwd()
+    os.chdir(workdir)
+    try:
+        with redirect_stdout(io.StringIO()):
+            generator.main(list(argv))
+        output_format = "jsonl" if "jsonl" in argv else "json"
+        return (generator.to_summary_output_path(output_format).read_bytes(),
+                generator.field_mapping_csv_path().read_bytes())
+    finally:
+        os.chdir(previous)
+
+def test_workers_match_single_process():
+    """--workers 3 output is byte-identical to --workers 1"""
+    print_step(f"Generating {PROJECTS} synthetic projects with 1 and 3 workers")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        generate_synthetic_domain_data(tmpdir, projects=PROJECTS, seed=5)
+        for output_format in ("json", "jsonl"):
+            for originals in ("embed", "reference", "omit"):
+                options = ("--output-format", output_format, "--originals", originals)
+                single = run_generator(tmpdir, "--workers", "1", *options)
+                sharded = run_generator(tmpdir, "--workers", "3", *options)
+                assert single[0] == sharded[0], f"{output_format}/{originals}: TO summary output differs"
+                assert single[1] == sharded[1], f"{output_format}/{originals}: field mapping CSV differs"
+                print_status(f"✅ {output_format}/{originals}: {len(single[0])} bytes identical")
+
+def main():
+    """Main test function"""
+    print("=" * 60)
+    print("TO Summary Worker Parity Test")
+    print("=" * 60)
+
+    failed = False
+    for test in (test_workers_match_single_process,):
+        try:
+            test()
+        except AssertionError as e:
+            print_error(f"❌ {e}")
+            failed = True
+        print()
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
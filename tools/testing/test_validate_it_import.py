@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+IT Import Pre-Validator Test
+Checks that the compiled CHECK rules reject exactly the rows SQLite refuses
+under the same constraints, MySQL's collation and NULL handling, and the
+clean/rejects split of an IT export, including its speed at 100k rows.
+"""
+
+import csv
+import random
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+from index_advisor import create_database
+from validate_it_import import load_rules, main as validate_main, split_file, validate_frame
+
+# Exact-case values, so SQLite's binary collation agrees with utf8mb4_unicode_ci
+VALUE_POOLS = {
+    "business_unit": ["CN", "PC", "XX", ""],
+    "reuse_ip": ["Y", "N", "maybe", ""],
+    "ip_subtype": ["default", "gen2x1", "gen3", ""],
+    "spip_url": ["https://jira.example.com/browse/SPIP-1", "HTTP://x", "ftp://x", "jira", ""],
+    "wiki_url": ["https://wiki.example.com/1", "www.example.com", ""],
+    "sanity_svn": ["http://svn/sanity", "svn://svn/sanity", ""],
+    "release_svn": ["https://svn/release", "release", ""],
+    "git_path": ["ssh://git.example.com/ip.git", "https://github.com/ip", "ssh://host/ip.git", ""],
+    "git_version": ["a" * 40, "a1b2c3d4e5", "a" * 11, "a" * 39, ""],
+    "line_coverage": ["0", "100", "100.01", "-0.5", "55.25", ""],
+    "fsm_coverage": ["12.5", "101", ""],
+    "interface_toggle_coverage": ["99.99", "-1", ""],
+    "toggle_coverage": ["100.00", "250", ""],
+    "coverage_report_path": ["/project/cov/index.html", "/project/cov", "report.html", "report.txt", ""],
+}
+
+IT_EXPORT_COLUMNS = [
+    "id", "task_index", "project_name", "spip_ip", "ip", "ip_postfix", "ip_subtype", "alternative_name",
+    "dv_engineer", "digital_designer", "business_unit", "analog_designer", "inherit_from_ip", "reuse_ip",
+    "spip_url", "wiki_url", "spec_version", "spec_path", "created_at", "updated_at",
+]
+
+def print_status(message):
+    print(f"\033[0;32m[INFO]\033[0m {message}")
+
+def print_warning(message):
+    print(f"\033[1;33m[WARNING]\033[0m {message}")
+
+def print_error(message):
+    print(f"\033[0;31m[ERROR]\033[0m {message}")
+
+def print_step(message):
+    print(f"\033[0;34m[STEP]\033[0m {message}")
+
+def it_export_row(i, rng):
+    return {
+        "id": str(i + 1), "task_index": f"TASK{i:07d}", "project_name": f"RL{i:07d}", "spip_ip": f"XXXX_IP{i % 97}",
+        "ip": f"IP{i % 97}", "ip_postfix": "", "ip_subtype": rng.choice(("default", "gen2x1")), "alternative_name": "",
+        "dv_engineer": f"DV{i % 50}", "digital_designer": f"DD{i % 40}", "business_unit": rng.choice(("CN", "PC")),
+        "analog_designer": "", "inherit_from_ip": "", "reuse_ip": rng.choice(("Y", "N", "")),
+        "spip_url": f"https://jira.example.com/browse/SPIP-{i}", "wiki_url": f"https://wiki.example.com/{i}",
+        "spec_version": "1.0", "spec_path": f"/specs/{i}.pdf",
+        "created_at": "2024-01-01 00:00:00", "updated_at": "2024-01-01 00:00:00",
+    }
+
+def test_check_rules_match_sqlite():
+    """Every CHECK compiles, and rejects the same rows SQLite refuses to insert"""
+    print_step("Comparing compiled CHECKs with SQLite")
+    rules, skipped = load_rules()
+    assert not skipped, skipped
+    checks = [rule for rule in rules if rule.name.startswith("chk_")]
+    assert len(checks) == 14, [rule.name for rule in checks]
+
+    conn = create_database('nx')
+    rng = random.Random(7)
+    compared = 0
+    for table in ("imported_it_data", "coverage_reports", "version_control"):
+        columns = [row[1] for row in conn.execute(f"PRAGMA table_info({table})") if row[1] in VALUE_POOLS]
+        # DECIMAL columns are REAL in the SQLite copy; an empty CSV cell is stored there as NULL
+        numeric = {row[1] for row in conn.execute(f"PRAGMA table_info({table})") if row[2] == "REAL"}
+        frame = pd.DataFrame({column: [rng.choice(VALUE_POOLS[column]) for _ in range(300)] for column in columns})
+        frame.insert(0, "project_name", [f"P{i}" for i in range(len(frame))])
+
+        refused = []
+        for row in frame.itertuples(index=False):
+            values = [None if column in numeric and value == "" else value for column, value in zip(frame, row)]
+            try:
+                conn.execute(f"INSERT INTO {table} ({', '.join(frame)}) VALUES ({', '.join('?' * len(values))})", values)
+                refused.append(False)
+            except sqlite3.IntegrityError as e:
+                assert "CHECK" in str(e), e
+                refused.append(True)
+        conn.rollback()
+
+        reasons, _ = validate_frame(frame, [rule for rule in checks if set(rule.columns) <= set(columns)])
+        mismatched = frame[(reasons != "").to_numpy() != refused]
+        assert mismatched.empty, (table, mismatched.head().to_dict('records'))
+        compared += len(frame)
+    conn.close()
+    print_status(f"✅ {compared} rows judged the same as SQLite")
+
+def test_collation_and_null_rules():
+    """MySQL's case-insensitive, pad-space comparison, NULLs in numeric columns and importITData()'s own checks"""
+    print_step("Checking collation, NULL and importer rules")
+    # The importer's exact business unit check is left out here; test_importer_value_rules covers it
+    rules = [rule for rule in load_rules()[0] if not rule.name.startswith("business_unit not")]
+    frame = pd.DataFrame({
+        "project_name": ["A", "B", "C", " ", "E", "F"],
+        "business_unit": ["pc ", "Cn", "C N", "", "", ""],
+        "spip_url": ["", "https://jira.example.com/browse/X", "", "", "http//jira", ""],
+        "line_coverage": ["", "42", "", "", "abc", "1e2"],
+        "git_version": ["", "", "", "", "", "ABCDEF0123"],
+    })
+    reasons, counts = validate_frame(frame, rules)
+    assert reasons.tolist() == ["", "", "chk_it_business_unit", "project_name missing",
+                                "spip_url not a URL; line_coverage not a number", ""], reasons.tolist()
+    assert "chk_it_reuse_ip" not in counts and counts["chk_line_coverage"] == 0, counts
+    print_status("✅ Rules follow utf8mb4_unicode_ci and importITData()")
+
+def test_importer_value_rules():
+    """Values the CHECKs accept under the collation but importITData()'s in_array() refuses are rejected"""
+    print_step("Checking business unit and reuse IP values the way importITData() does")
+    rules, _ = load_rules()
+    frame = pd.DataFrame({
+        "project_name": [f"P{i}" for i in range(8)],
+        "business_unit": ["pc ", "cn", "PC", "CN", "", "0", "CN", "XX"],
+        "reuse_ip": ["Y", "N", "y", "n", "", "0", "Y ", "Y"],
+    })
+    reasons, counts = validate_frame(frame, rules)
+    # '0' is empty() to PHP, so only the CHECKs refuse it
+    assert reasons.tolist() == ["business_unit not CN/PC", "business_unit not CN/PC", "reuse_ip not Y/N",
+                                "reuse_ip not Y/N", "", "chk_it_business_unit; chk_it_reuse_ip", "reuse_ip not Y/N",
+                                "business_unit not CN/PC; chk_it_business_unit"], reasons.tolist()
+    assert counts["chk_it_reuse_ip"] == 1, counts
+    print_status("✅ Case and trailing-space variants rejected like in_array()")
+
+def test_split_it_export():
+    """An IT export is split into an importable clean file and a rejects file with lines and reasons"""
+    print_step("Splitting a 100,000-row IT export")
+    rng = random.Random(42)
+    rows = [it_export_row(i, rng) for i in range(100_000)]
+    bad = {5: ("business_unit", "XX"), 77: ("reuse_ip", "Yes"), 500: ("wiki_url", "wiki/page"),
+           9000: ("project_name", ""), 99_999: ("ip_subtype", "gen3")}
+    for index, (column, value) in bad.items():
+        rows[index][column] = value
+    rows[1]["alternative_name"] = 'Quoted, "name"\nwith newline'
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        export = Path(tmpdir) / "it_projects.csv"
+        with open(export, "w", encoding="utf-8-sig", newline="") as f:
+            writer = csv.DictWriter(f, IT_EXPORT_COLUMNS, lineterminator="\n")
+            writer.writeheader()
+            writer.writerows(rows)
+
+        rules, _ = load_rules()
+        stats = split_file(export, Path(tmpdir) / "clean.csv", Path(tmpdir) / "rejects.csv", rules)
+        assert stats["rows"] == 100_000 and stats["rejected"] == len(bad), stats
+        assert stats["validate_seconds"] < 1.0, stats["validate_seconds"]
+
+        clean = pd.read_csv(Path(tmpdir) / "clean.csv", dtype=str, keep_default_na=False)
+        assert list(clean.columns) == IT_EXPORT_COLUMNS and len(clean) == 100_000 - len(bad)
+        assert clean.loc[1, "alternative_name"] == rows[1]["alternative_name"]
+        rejects = pd.read_csv(Path(tmpdir) / "rejects.csv", dtype=str, keep_default_na=False)
+        assert rejects["line"].astype(int).tolist() == [index + 2 for index in sorted(bad)], rejects["line"].tolist()
+        assert rejects["reject_reasons"].tolist() == ["business_unit not CN/PC; chk_it_business_unit",
+                                                      "reuse_ip not Y/N; chk_it_reuse_ip",
+                                                      "wiki_url not a URL; chk_it_wiki_url", "project_name missing",
+                                                      "chk_it_ip_subtype"], rejects["reject_reasons"].tolist()
+
+        try:
+            validate_main([str(export), "--strict"])
+        except SystemExit as e:
+            assert e.code == 1, e.code
+        else:
+            raise AssertionError("--strict did not fail with rejected rows")
+        assert (Path(tmpdir) / "it_projects.clean.csv").exists() and (Path(tmpdir) / "it_projects.rejects.csv").exists()
+
+        empty = Path(tmpdir) / "empty.csv"
+        empty.touch()
+        try:
+            validate_main([str(empty)])
+        except SystemExit as e:
+            assert e.code == 1, e.code
+        else:
+            raise AssertionError("an empty file was accepted")
+    print_status(f"✅ {stats['clean']} clean, {stats['rejected']} rejected, "
+                 f"validated in {stats['validate_seconds'] * 1000:.0f} ms")
+
+def main():
+    """Main test function"""
+    print("=" * 60)
+    print("IT Import Pre-Validator Test")
+    print("=" * 60)
+
+    failed = False
+    for test in (test_check_rules_match_sqlite, test_collation_and_null_rules, test_importer_value_rules,
+                 test_split_it_export):
+        try:
+            test()
+        except AssertionError as e:
+            print_error(f"❌ {e}")
+            failed = True
+        print()
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
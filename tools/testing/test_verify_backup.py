@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Backup Verification Test
+Builds mysqldump-style backups (plain, gzip and tar.gz like tools/backup/*.sh
+write them) and checks that verify_backup.py restores every row, names the
+SQLite files after the dumped databases and rejects truncated dumps.
+"""
+
+import gzip
+import io
+import sqlite3
+import sys
+import tarfile
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backup"))
+
+from verify_backup import find_problems, regexp, verify_backup
+
+def print_status(message):
+    print(f"\033[0;32m[INFO]\033[0m {message}")
+
+def print_warning(message):
+    print(f"\033[1;33m[WARNING]\033[0m {message}")
+
+def print_error(message):
+    print(f"\033[0;31m[ERROR]\033[0m {message}")
+
+def print_step(message):
+    print(f"\033[0;34m[STEP]\033[0m {message}")
+
+def coverage_dump(rows, database="nx_domain_db", use=False, completed=True):
+    """A mysqldump of one coverage_reports table, as mysqldump 8.0 writes it"""
+    values = ",".join(f"({i},'RL{i:05d}',{i % 100}.50,'it\\'s; row {i}',NULL,_binary 'x\\0{i}','2024-01-01 00:00:00')"
+                      for i in range(1, rows + 1))
+    lines = [
+        "-- MySQL dump 10.13  Distrib 8.0.36, for Linux (x86_64)",
+        "--",
+        f"-- Host: localhost    Database: {database}",
+        "-- ------------------------------------------------------",
+        "/*!40101 SET @OLD_CHARACTER_SET_CLIENT=@@CHARACTER_SET_CLIENT */;",
+        "/*!50503 SET NAMES utf8mb4 */;",
+        "",
+    ]
+    if use:
+        lines += [f"CREATE DATABASE /*!32312 IF NOT EXISTS*/ `{database}` /*!40100 DEFAULT CHARACTER SET utf8mb4 */;",
+                  "", f"USE `{database}`;", ""]
+    lines += [
+        "DROP TABLE IF EXISTS `coverage_reports`;",
+        "/*!40101 SET @saved_cs_client     = @@character_set_client */;",
+        "CREATE TABLE `coverage_reports` (",
+        "  `id` int NOT NULL AUTO_INCREMENT,",
+        "  `project_name` varchar(100) COLLATE utf8mb4_unicode_ci NOT NULL COMMENT 'RL project',",
+        "  `line_coverage` decimal(5,2) DEFAULT NULL,",
+        "  `note` text,",
+        "  `kind` enum('line','fsm') DEFAULT NULL,",
+        "  `raw` blob,",
+        "  `updated_at` timestamp NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,",
+        "  PRIMARY KEY (`id`),",
+        "  UNIQUE KEY `uniq_project` (`project_name`),",
+        "  KEY `idx_line_coverage` (`line_coverage`) USING BTREE,",
+        "  CONSTRAINT `chk_line_coverage` CHECK (((`line_coverage` >= 0) and (`line_coverage` <= 100))),",
+        "  CONSTRAINT `chk_project` CHECK ((`project_name` regexp '^RL'))",
+        f") ENGINE=InnoDB AUTO_INCREMENT={rows + 1} DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;",
+        "/*!40101 SET character_set_client = @saved_cs_client */;",
+        "",
+        "LOCK TABLES `coverage_reports` WRITE;",
+        "/*!40000 ALTER TABLE `coverage_reports` DISABLE KEYS */;",
+        f"INSERT INTO `coverage_reports` VALUES {values};",
+        "/*!40000 ALTER TABLE `coverage_reports` ENABLE KEYS */;",
+        "UNLOCK TABLES;",
+        "/*!50003 SET sql_mode = 'STRICT_TRANS_TABLES' */ ;",
+        "DELIMITER ;;",
+        "/*!50003 CREATE*/ /*!50017 DEFINER=`root`@`%`*/ /*!50003 TRIGGER `trg` BEFORE INSERT ON `coverage_reports` "
+        "FOR EACH ROW BEGIN SET NEW.note = CONCAT(NEW.note, ';'); END */;;",
+        "DELIMITER ;",
+        "/*!50001 DROP VIEW IF EXISTS `coverage_view`*/;",
+        "/*!50001 CREATE ALGORITHM=UNDEFINED */ /*!50001 VIEW `coverage_view` AS select 1 AS `one` */;",
+        "/*!40101 SET CHARACTER_SET_CLIENT=@OLD_CHARACTER_SET_CLIENT */;",
+        "",
+    ]
+    if completed:
+        lines.append("-- Dump completed on 2024-01-01 12:00:00")
+    return "\n".join(lines) + "\n"
+
+def test_gzip_dump_restores():
+    """Every row comes back with its escapes, NULLs and binary values intact"""
+    print_step("Restoring a gzip dump of 2,500 rows")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "nx_domain_backup_20240101_120000.sql.gz"
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            f.write(coverage_dump(2500))
+        reports = verify_backup(path, tmpdir, batch_rows=1000)
+        assert find_problems(reports, ["coverage_reports"]) == [], find_problems(reports, ["coverage_reports"])
+
+        report = reports[0]
+        assert report["complete"] and report["inserted_rows"] == 2500, report
+        database = report["databases"]["nx_domain_db"]
+        assert database["integrity"] == "ok" and database["tables"]["coverage_reports"]["rows"] == 2500, database
+
+        conn = sqlite3.connect(database["path"])
+        conn.create_function("REGEXP", 2, regexp)
+        row = conn.execute("SELECT project_name, line_coverage, note, kind, raw FROM coverage_reports WHERE id = 7").fetchone()
+        assert row == ("RL00007", 7.5, "it's; row 7", None, b"x\x007"), row
+        assert [name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")] == []
+        try:
+            conn.execute("INSERT INTO coverage_reports (project_name, line_coverage) VALUES ('XX1', 5)")
+            assert False, "restored CHECK constraint not enforced"
+        except sqlite3.IntegrityError:
+            pass
+        conn.close()
+    print_status(f"✅ {report['inserted_rows']} rows at {report['rows_per_second']:,.0f} rows/s")
+
+def test_archive_with_several_dumps():
+    """tar.gz archives are read member by member; other members are ignored"""
+    print_step("Restoring a tar.gz archive holding two dumps and a config archive")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "dv_complete_backup_20240101_120000.tar.gz"
+        with tarfile.open(path, "w:gz") as archive:
+            for name, content in (("opt/backups/it_domain_backup.sql", coverage_dump(10, "it_domain_db")),
+                                  ("opt/backups/nx_domain_backup.sql", coverage_dump(20, "nx_domain_db")),
+                                  ("opt/backups/config_backup.tar.gz", "not a dump")):
+                data = content.encode('utf-8')
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                archive.addfile(info, io.BytesIO(data))
+        reports = verify_backup(path, tmpdir)
+        assert [report["dump"] for report in reports] == ["it_domain_backup", "nx_domain_backup"], reports
+        assert [list(report["databases"]) for report in reports] == [["it_domain_db"], ["nx_domain_db"]]
+        assert [report["inserted_rows"] for report in reports] == [10, 20]
+        assert find_problems(reports, ["coverage_reports", "projects"]) == ["required table projects is missing"]
+    print_status("✅ Both dumps restored")
+
+def test_all_databases_dump():
+    """USE statements switch the target file; system databases are skipped"""
+    print_step("Restoring an --all-databases style dump")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "backup_20240101.sql"
+        path.write_text(coverage_dump(5, "mysql", use=True, completed=False)
+                        + coverage_dump(3, "it_domain_db", use=True), encoding='utf-8')
+        reports = verify_backup(path, tmpdir)
+        assert list(reports[0]["databases"]) == ["it_domain_db"], reports[0]["databases"]
+        assert reports[0]["inserted_rows"] == 3, reports[0]
+        assert find_problems(reports) == []
+    print_status("✅ Only it_domain_db restored")
+
+def test_truncated_dump_fails():
+    """A dump cut off mid-INSERT or a broken gzip stream fails verification"""
+    print_step("Restoring truncated dumps")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        content = coverage_dump(200)
+        cut = content[:content.index("INSERT INTO") + 3000]
+        path = Path(tmpdir) / "cut.sql"
+        path.write_text(cut, encoding='utf-8')
+        problems = find_problems(verify_backup(path, tmpdir))
+        assert any("truncated" in problem for problem in problems), problems
+        assert any("could not be restored" in problem for problem in problems), problems
+
+        compressed = gzip.compress(content.encode('utf-8'))
+        path = Path(tmpdir) / "cut.sql.gz"
+        path.write_bytes(compressed[:len(compressed) // 2])
+        problems = find_problems(verify_backup(path, tmpdir))
+        assert any("EOFError" in problem for problem in problems), problems
+    print_status(f"✅ Rejected: {problems[-1]}")
+
+def main():
+    """Main test function"""
+    print("=" * 60)
+    print("Backup Verification Test")
+    print("=" * 60)
+
+    failed = False
+    for test in (test_gzip_dump_restores, test_archive_with_several_dumps, test_all_databases_dump,
+                 test_truncated_dump_fails):
+        try:
+            test()
+        except AssertionError as e:
+            print_error(f"❌ {e}")
+            failed = True
+        print()
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+XLSX Ingestion Test
+Checks that reading dv_tasks / allproject straight from .xlsx workbooks
+gives the same TO summary output as the converted JSON exports.
+"""
+
+import datetime
+import json
+import math
+import sys
+import tempfile
+from pathlib import Path
+
+DATA_GENERATION_DIR = Path(__file__).resolve().parent.parent / "data-generation"
+sys.path.insert(0, str(DATA_GENERATION_DIR))
+
+import generate_to_summary_from_domains as generator
+
+try:
+    from openpyxl import Workbook
+except ImportError:
+    Workbook = None
+
+def print_status(message):
+    print(f"\033[0;32m[INFO]\033[0m {message}")
+
+def print_warning(message):
+    print(f"\033[1;33m[WARNING]\033[0m {message}")
+
+def print_error(message):
+    print(f"\033[0;31m[ERROR]\033[0m {message}")
+
+def print_step(message):
+    print(f"\033[0;34m[STEP]\033[0m {message}")
+
+def excel_value(value):
+    """Turn a converted JSON value back into what the original workbook cell held"""
+    if value == "NaT" or (isinstance(value, float) and math.isnan(value)):
+        return None
+    if isinstance(value, str):
+        try:
+            return datetime.datetime.strptime(value, "%Y-%m-%d %H:%M:%S")
+        except ValueError:
+            return value
+    return value
+
+def write_workbook(records, path, sheet):
+    """Write converted JSON records back into a single-sheet workbook"""
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet(sheet)
+    header = list(dict.fromkeys(key for record in records for key in record['data']))
+    worksheet.append(header)
+    for record in records:
+        worksheet.append([excel_value(record['data'].get(key)) for key in header])
+        # Blank rows in the middle of a sheet must be skipped
+        worksheet.append([None] * len(header))
+    workbook.save(path)
+
+def fixture_paths():
+    return (DATA_GENERATION_DIR / generator.IT_ALLPROJECT_PATH, DATA_GENERATION_DIR / generator.IT_DV_TASKS_PATH)
+
+def load(slim, allproject_path, dv_tasks_path):
+    """load_domain_data with the remaining fixtures resolved from the generator directory"""
+    return (
+        list(generator.iter_domain_records(allproject_path, generator.IT_ALLPROJECT_FIELDS if slim else None, generator.IT_ALLPROJECT_SHEET)),
+        list(generator.iter_domain_records(dv_tasks_path, generator.IT_DV_TASKS_FIELDS if slim else None, generator.IT_DV_TASKS_SHEET)),
+        list(generator.iter_domain_records(DATA_GENERATION_DIR / generator.IT_SUPPLEMENTAL_PATH)),
+        list(generator.iter_domain_records(DATA_GENERATION_DIR / generator.NX_EXAMPLES_PATH, generator.NX_EXAMPLES_FIELDS if slim else None)),
+        list(generator.iter_domain_records(DATA_GENERATION_DIR / generator.NX_SUPPLEMENTAL_PATH)),
+    )
+
+def test_xlsx_matches_json_exports():
+    """TO summary fields and the field mapping match for JSON and XLSX inputs"""
+    print_step("Comparing XLSX ingestion with converted JSON exports")
+    if Workbook is None:
+        print_warning("openpyxl not installed, skipping")
+        return
+
+    allproject_json, dv_tasks_json = fixture_paths()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        allproject_xlsx = Path(tmpdir) / "allproject-2025-06-23-09-32-12.xlsx"
+        dv_tasks_xlsx = Path(tmpdir) / "dv_tasks.xlsx"
+        json_data = load(False, allproject_json, dv_tasks_json)
+        write_workbook(json_data[0], allproject_xlsx, generator.IT_ALLPROJECT_SHEET)
+        write_workbook(json_data[1], dv_tasks_xlsx, generator.IT_DV_TASKS_SHEET)
+
+        for slim in (False, True):
+            json_records, json_rows = generator.create_to_summary_records(*load(slim, allproject_json, dv_tasks_json))
+            xlsx_records, xlsx_rows = generator.create_to_summary_records(*load(slim, allproject_xlsx, dv_tasks_xlsx))
+
+            json_summaries = json.dumps([record['to_summary'] for record in json_records], ensure_ascii=False, default=str)
+            xlsx_summaries = json.dumps([record['to_summary'] for record in xlsx_records], ensure_ascii=False, default=str)
+            assert json_summaries == xlsx_summaries, f"slim={slim}: to_summary differs between JSON and XLSX input"
+            assert json.dumps(json_rows, default=str) == json.dumps(xlsx_rows, default=str), f"slim={slim}: field mapping differs"
+            print_status(f"✅ slim={slim}: {len(xlsx_records)} records identical")
+
+def test_xlsx_slim_reads_only_used_columns():
+    """slim ingestion keeps only the columns the resolution rules use"""
+    print_step("Checking slim XLSX ingestion column pruning")
+    if Workbook is None:
+        print_warning("openpyxl not installed, skipping")
+        return
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        dv_tasks_xlsx = Path(tmpdir) / "dv_tasks.xlsx"
+        write_workbook(load(False, *fixture_paths())[1], dv_tasks_xlsx, generator.IT_DV_TASKS_SHEET)
+        records = list(generator.iter_domain_records(dv_tasks_xlsx, generator.IT_DV_TASKS_FIELDS, generator.IT_DV_TASKS_SHEET))
+
+    assert records, "no records read from workbook"
+    for record in records:
+        assert record['source'] == "dv_tasks.xlsx" and record['sheet'] == generator.IT_DV_TASKS_SHEET
+        assert set(record['data']) <= set(generator.IT_DV_TASKS_FIELDS), f"unexpected columns: {set(record['data']) - set(generator.IT_DV_TASKS_FIELDS)}"
+    print_status(f"✅ {len(records)} records, only used columns loaded")
+
+def main():
+    """Main test function"""
+    print("=" * 60)
+    print("XLSX Ingestion Test")
+    print("=" * 60)
+
+    failed = False
+    for test in (test_xlsx_matches_json_exports, test_xlsx_slim_reads_only_used_columns):
+        try:
+            test()
+        except AssertionError as e:
+            print_error(f"❌ {e}")
+            failed = True
+        print()
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -6,9 +6,16 @@ without requiring Docker or MySQL to be installed.
 """
 
 import os
-import re
 import sys
+import time
 from datetime import datetime
+from pathlib import Path
+
+from schema_model import load_schema
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+SCHEMA_DIR = REPO_ROOT / "app" / "database" / "schemas"
+TO_SUMMARY_FIELDS = 33
 
 def print_status(message):
     print(f"\033[0;32m[INFO]\033[0m {message}")
@@ -28,58 +35,73 @@ def validate_sql_file(filepath):
         return False, f"File not found: {filepath}"
     
     try:
-        with open(filepath, 'r') as f:
-            content = f.read()
-        
-        # Check for basic SQL syntax
-        if not content.strip():
-            return False, "Empty file"
-        
-        # Check for common SQL keywords
-        keywords = ['CREATE', 'INSERT', 'SELECT', 'DROP', 'ALTER']
-        if not any(keyword in content.upper() for keyword in keywords):
-            return False, "No SQL keywords found"
-        
-        # Check for balanced parentheses
-        if content.count('(') != content.count(')'):
-            return False, "Unbalanced parentheses"
-        
-        return True, "SQL file syntax appears valid"
-    
+        schema = load_schema(filepath)
     except Exception as e:
         return False, f"Error reading file: {str(e)}"
+    
+    statements = sum(schema.statement_counts.values())
+    if not statements:
+        return False, "No SQL statements found"
+    
+    if schema.errors:
+        return False, f"{len(schema.errors)} statement(s) could not be parsed: {schema.errors[0]}"
+    
+    return True, (f"{statements} statements parsed ({len(schema.tables())} tables, "
+                  f"{len(schema.views())} views, {len(schema.indexes())} indexes)")
 
-def parse_create_table_statements(content):
-    """Parse CREATE TABLE statements from SQL content"""
-    tables = {}
-    
-    # Find all CREATE TABLE statements
-    create_table_pattern = r'CREATE TABLE\s+(\w+)\s*\((.*?)\);'
-    matches = re.findall(create_table_pattern, content, re.DOTALL | re.IGNORECASE)
-    
-    for table_name, table_def in matches:
-        # Parse column definitions
-        columns = []
-        for line in table_def.split('\n'):
-            line = line.strip()
-            if line and not line.startswith('--') and not line.startswith('CONSTRAINT'):
-                # Extract column name and type
-                if line.endswith(','):
-                    line = line[:-1]
-                if ' ' in line:
-                    col_name = line.split()[0]
-                    columns.append(col_name)
-        
-        tables[table_name] = columns
+def check_references(schema):
+    """Problems with indexes, constraints and views that name unknown columns or tables"""
+    problems = []
+    for table in schema.tables():
+        if table.as_select is not None:
+            continue
+        for index in table.indexes:
+            missing = [column for column in index.columns if column not in table.columns]
+            if missing:
+                problems.append(f"index {index.name or '(unnamed)'} on {table.name} names unknown columns {missing}")
+        for constraint in table.constraints:
+            missing = [column for column in constraint.columns if column not in table.columns]
+            if missing:
+                problems.append(f"{constraint.kind} {constraint.name or '(unnamed)'} on {table.name} "
+                                f"names unknown columns {missing}")
+    for database in schema.databases.values():
+        for view in database.views.values():
+            missing = [table for table in view.tables if table not in database.tables and table not in database.views]
+            if missing:
+                problems.append(f"view {view.name} reads unknown tables {missing}")
+            if len(set(view.branch_sizes)) > 1:
+                problems.append(f"view {view.name} UNION branches select {view.branch_sizes} columns")
+    return problems
+
+def validate_all_schema_files():
+    """Parse every schema file once and cross-check the resulting models"""
+    print_step("Parsing All Schema Files")
     
-    return tables
+    results = {}
+    started = time.perf_counter()
+    for filepath in sorted(SCHEMA_DIR.glob("*.sql")):
+        valid, message = validate_sql_file(filepath)
+        problems = check_references(load_schema(filepath)) if valid else []
+        results[filepath.name] = {'valid': valid and not problems, 'message': message, 'problems': problems}
+        
+        if valid:
+            print_status(f"{filepath.name}: {message}")
+        else:
+            print_error(f"{filepath.name}: {message}")
+        for problem in problems:
+            print_error(f"{filepath.name}: {problem}")
+    
+    if not results:
+        print_error(f"No schema files found in {SCHEMA_DIR}")
+    print_status(f"Parsed {len(results)} files in {time.perf_counter() - started:.2f}s")
+    return results
 
 def validate_it_domain_schema():
     """Validate IT Domain schema files"""
     print_step("Validating IT Domain Schema Files")
     
-    old_schema_file = "/workspace/dv_website/database/it-domain-schema.sql"
-    new_schema_file = "/workspace/dv_website/database/it-domain-schema-new.sql"
+    old_schema_file = SCHEMA_DIR / "it-domain-schema.sql"
+    new_schema_file = SCHEMA_DIR / "it-domain-schema-new.sql"
     
     results = {}
     
@@ -103,37 +125,34 @@ def validate_it_domain_schema():
     
     # Compare schemas
     if results['old_schema']['valid'] and results['new_schema']['valid']:
-        try:
-            with open(old_schema_file, 'r') as f:
-                old_content = f.read()
-            with open(new_schema_file, 'r') as f:
-                new_content = f.read()
-            
-            old_tables = parse_create_table_statements(old_content)
-            new_tables = parse_create_table_statements(new_content)
+        old_schema = load_schema(old_schema_file)
+        new_schema = load_schema(new_schema_file)
+        
+        print_status(f"Old schema tables: {[table.name for table in old_schema.tables()]}")
+        print_status(f"New schema tables: {[table.name for table in new_schema.tables()]}")
+        
+        # Check for unified table structure
+        table = new_schema.table('it_domain_projects')
+        if table is not None:
+            print_status("✅ New unified table 'it_domain_projects' found")
+            print_status(f"Unified table has {len(table.columns)} columns, "
+                         f"{len(table.indexes)} indexes and {len(table.checks())} CHECK constraints")
             
-            print_status(f"Old schema tables: {list(old_tables.keys())}")
-            print_status(f"New schema tables: {list(new_tables.keys())}")
+            # Check for key fields
+            expected_fields = ['task_index', 'project_name', 'dv_engineer', 'digital_designer']
+            missing_fields = [field for field in expected_fields if field not in table.columns]
             
-            # Check for unified table structure
-            if 'it_domain_projects' in new_tables:
-                print_status("✅ New unified table 'it_domain_projects' found")
-                columns = new_tables['it_domain_projects']
-                print_status(f"Unified table has {len(columns)} columns")
-                
-                # Check for key fields
-                expected_fields = ['task_index', 'project_name', 'dv_engineer', 'digital_designer']
-                missing_fields = [field for field in expected_fields if field not in columns]
-                
-                if not missing_fields:
-                    print_status("✅ All expected fields found in unified table")
-                else:
-                    print_warning(f"Missing expected fields: {missing_fields}")
+            if not missing_fields:
+                print_status("✅ All expected fields found in unified table")
             else:
-                print_error("❌ New unified table 'it_domain_projects' not found")
-        
-        except Exception as e:
-            print_error(f"Error comparing schemas: {str(e)}")
+                print_warning(f"Missing expected fields: {missing_fields}")
+            
+            project_name = table.columns.get('project_name')
+            if project_name is not None and not (project_name.unique and not project_name.nullable):
+                print_warning("project_name should be NOT NULL UNIQUE")
+        else:
+            print_error("❌ New unified table 'it_domain_projects' not found")
+            results['new_schema']['valid'] = False
     
     return results
 
@@ -141,8 +160,8 @@ def validate_nx_domain_schema():
     """Validate NX Domain schema files"""
     print_step("Validating NX Domain Schema Files")
     
-    old_schema_file = "/workspace/dv_website/database/nx-domain-schema.sql"
-    new_schema_file = "/workspace/dv_website/database/nx-domain-schema-new.sql"
+    old_schema_file = SCHEMA_DIR / "nx-domain-schema.sql"
+    new_schema_file = SCHEMA_DIR / "nx-domain-schema-new.sql"
     
     results = {}
     
@@ -166,31 +185,32 @@ def validate_nx_domain_schema():
     
     # Check for TO summary view
     if results['new_schema']['valid']:
-        try:
-            with open(new_schema_file, 'r') as f:
-                new_content = f.read()
+        schema = load_schema(new_schema_file)
+        view = schema.view('to_summary_view')
+        
+        if view is not None:
+            print_status("✅ TO Summary view found in new schema")
+            print_status(f"TO Summary view selects {len(view.columns)} fields "
+                         f"from {', '.join(view.tables)}")
             
-            if 'to_summary_view' in new_content:
-                print_status("✅ TO Summary view found in new schema")
-                
-                # Count fields in the view
-                view_pattern = r'CREATE VIEW\s+to_summary_view\s+AS\s+SELECT\s+(.*?)\s+FROM'
-                match = re.search(view_pattern, new_content, re.DOTALL | re.IGNORECASE)
-                if match:
-                    select_clause = match.group(1)
-                    # Count fields (rough estimate)
-                    fields = [field.strip() for field in select_clause.split(',') if field.strip()]
-                    print_status(f"TO Summary view contains approximately {len(fields)} fields")
-                    
-                    if len(fields) >= 30:
-                        print_status("✅ TO Summary view appears to have all expected fields")
-                    else:
-                        print_warning(f"TO Summary view may be missing fields (found {len(fields)}, expected 33)")
+            if len(view.columns) == TO_SUMMARY_FIELDS:
+                print_status(f"✅ TO Summary view has all {TO_SUMMARY_FIELDS} fields")
             else:
-                print_error("❌ TO Summary view not found in new schema")
-        
-        except Exception as e:
-            print_error(f"Error analyzing NX schema: {str(e)}")
+                print_warning(f"TO Summary view has {len(view.columns)} fields, expected {TO_SUMMARY_FIELDS}")
+                results['new_schema']['valid'] = False
+            
+            # The refresh job copies the view into the materialized table column by column
+            materialized = schema.table('to_summary_materialized')
+            if materialized is not None:
+                missing = [column for column in view.columns if column not in materialized.columns]
+                if missing:
+                    print_error(f"❌ to_summary_materialized is missing view fields: {missing}")
+                    results['new_schema']['valid'] = False
+                else:
+                    print_status("✅ to_summary_materialized has every TO Summary field")
+        else:
+            print_error("❌ TO Summary view not found in new schema")
+            results['new_schema']['valid'] = False
     
     return results
 
@@ -198,37 +218,44 @@ def validate_migration_script():
     """Validate the migration script"""
     print_step("Validating Migration Script")
     
-    migration_file = "/workspace/dv_website/database/migration-script.sql"
+    migration_file = SCHEMA_DIR / "migration-script.sql"
     
     valid, message = validate_sql_file(migration_file)
     
     if valid:
         print_status(f"Migration script: {message}")
+        schema = load_schema(migration_file)
         
-        try:
-            with open(migration_file, 'r') as f:
-                content = f.read()
-            
-            # Check for backup creation
-            if 'backup' in content.lower():
-                print_status("✅ Migration script includes backup creation")
-            else:
-                print_warning("Migration script may not include backup creation")
-            
-            # Check for both domains
-            if 'it_domain_db' in content and 'nx_domain_db' in content:
-                print_status("✅ Migration script handles both domains")
-            else:
-                print_warning("Migration script may not handle both domains")
-            
-            # Check for constraint validation
-            if 'CONSTRAINT' in content:
-                print_status("✅ Migration script includes constraint validation")
-            else:
-                print_warning("Migration script may not include constraint validation")
-                
-        except Exception as e:
-            print_error(f"Error analyzing migration script: {str(e)}")
+        # Check for backup creation
+        backups = [table.name for table in schema.tables() if table.as_select is not None]
+        if backups:
+            print_status(f"✅ Migration script includes backup creation: {', '.join(backups)}")
+        else:
+            print_warning("Migration script may not include backup creation")
+        
+        # Check for both domains
+        domains = [name for name in ('it_domain_db', 'nx_domain_db')
+                   if name in schema.databases and schema.databases[name].tables]
+        if len(domains) == 2:
+            print_status("✅ Migration script handles both domains")
+        else:
+            print_warning(f"Migration script may not handle both domains (only {domains})")
+        
+        # Check for constraint validation
+        checks = sum(len(table.checks()) for table in schema.tables())
+        if checks:
+            print_status(f"✅ Migration script includes constraint validation ({checks} CHECK constraints)")
+        else:
+            print_warning("Migration script may not include constraint validation")
+        
+        # The migrated tables must end up like the new schemas
+        for new_schema_file in (SCHEMA_DIR / "it-domain-schema-new.sql", SCHEMA_DIR / "nx-domain-schema-new.sql"):
+            if not new_schema_file.exists():
+                continue
+            for table in load_schema(new_schema_file).tables():
+                migrated = schema.table(table.name)
+                if migrated is not None and list(migrated.columns) != list(table.columns):
+                    print_warning(f"Migrated table {table.name} columns differ from {new_schema_file.name}")
     
     else:
         print_error(f"Migration script: {message}")
@@ -239,7 +266,7 @@ def validate_deployment_script():
     """Validate the deployment script"""
     print_step("Validating Deployment Script")
     
-    deploy_script = "/workspace/dv_website/deploy-fixes.sh"
+    deploy_script = REPO_ROOT / "tools" / "deployment" / "deploy-fixes.sh"
     
     if not os.path.exists(deploy_script):
         print_error("Deployment script not found")
@@ -280,6 +307,10 @@ def main():
     print(f"Validation started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print()
     
+    # Parse every schema file once; the checks below reuse the cached models
+    file_results = validate_all_schema_files()
+    print()
+    
     # Validate IT Domain schemas
     it_results = validate_it_domain_schema()
     print()
@@ -300,7 +331,8 @@ def main():
     print_step("Validation Summary")
     print()
     
-    if (it_results['old_schema']['valid'] and it_results['new_schema']['valid'] and
+    if (file_results and all(result['valid'] for result in file_results.values()) and
+        it_results['old_schema']['valid'] and it_results['new_schema']['valid'] and
         nx_results['old_schema']['valid'] and nx_results['new_schema']['valid'] and
         migration_valid and deployment_valid):
         print_status("✅ All validation checks passed!")